@@ -1,10 +1,22 @@
 import streamlit as st
+import json
 import os
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Dict, Any, Optional, Tuple, Callable, Iterable
 
 import data_processing as dp
 import visualization as viz
+from event_store import event_store_path_for, load_or_build_corpus
+from interval_index import EventIntervalIndex
+from occupancy import OccupancyGrid
+from person_index import PersonIndex
+import profiling
+import transitions
+from search_index import SearchIndex, load_or_build_search_index, search_index_path_for
+from similarity import TrajectoryIndex
+from sidecar_index import DiskDataset, file_key
+from validation import ISSUE_DESCRIPTIONS, ValidationReport, load_or_build_validation, validation_path_for
+from view_cache import DerivedDataCache, cached_person_view, content_hash
 
 # Set page configuration
 st.set_page_config(
@@ -21,8 +33,12 @@ def main():
     # Initialize session state for storing dataset
     if 'dataset' not in st.session_state:
         st.session_state.dataset = None
-    if 'temp_file_path' not in st.session_state:
-        st.session_state.temp_file_path = None
+    if 'person_index' not in st.session_state:
+        st.session_state.person_index = None
+    if 'upload_id' not in st.session_state:
+        st.session_state.upload_id = None
+    if 'dataset_hash' not in st.session_state:
+        st.session_state.dataset_hash = None
     
     # Hide sidebar hamburger menu and footer
     hide_menu_style = """
@@ -36,35 +52,35 @@ def main():
     # File uploader
     uploaded_file = st.file_uploader("Upload career trajectory JSON file", type=["json"])
     
+    # Large datasets can be opened in place through a sidecar index instead of uploading
+    dataset_path = st.sidebar.text_input(
+        "Open dataset from server path",
+        help="Reads people on demand from a JSON file on the server without loading it into memory."
+    )
+    
     if uploaded_file is not None:
         try:
-            # Process uploaded file
-            process_uploaded_file(uploaded_file)
+            # Process uploaded file (only when a new file is uploaded)
+            upload_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+            if st.session_state.dataset is None or st.session_state.upload_id != upload_id:
+                process_uploaded_file(uploaded_file)
+                st.session_state.upload_id = upload_id
             
-            # If data is loaded, extract person names
+            # If data is loaded, show the person and corpus views
             if st.session_state.dataset is not None:
-                person_names = dp._extract_names_from_data(st.session_state.dataset)
-                
-                if not person_names:
-                    st.error("No valid person data found in the uploaded file.")
-                else:
-                    # Person selector (dropdown)
-                    selected_person = st.selectbox(
-                        "Select person to visualize",
-                        person_names
-                    )
-                    
-                    # Get data for selected person
-                    if selected_person:
-                        person_data = dp.get_person_data(st.session_state.dataset, selected_person)
-                        
-                        if person_data and dp.validate_career_data(person_data):
-                            display_visualizations(person_data)
-                        else:
-                            st.error(f"Invalid or missing data for {selected_person}")
+                dataset = st.session_state.dataset
+                display_dataset(dataset, st.session_state.person_index, st.session_state.dataset_hash,
+                                lambda: dp._get_record_container(dataset))
             
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
+    elif dataset_path:
+        try:
+            disk_dataset = open_disk_dataset(dataset_path, file_key(dataset_path))
+            display_dataset(None, disk_dataset, disk_dataset.source["content_hash"],
+                            lambda: dp.iter_person_records(dataset_path), dataset_path=dataset_path)
+        except Exception as e:
+            st.error(f"Error opening dataset: {str(e)}")
     else:
         # Show instructions when no file is uploaded
         st.info("Please upload a JSON file with career trajectory data.")
@@ -80,56 +96,456 @@ def main():
                     st.error("Example data is not in the correct format.")
 
 
-def process_uploaded_file(uploaded_file) -> None:
-    """Process the uploaded JSON file and store in session state."""
+def display_dataset(dataset: Any, person_index: Any, dataset_hash: str,
+                    records: Callable[[], Iterable[Dict[str, Any]]],
+                    dataset_path: Optional[str] = None) -> None:
+    """Show the per-person view and the corpus-wide views for a loaded dataset.
+    
+    Datasets opened from a server path keep their prepared event table,
+    search index and validation report in files next to the dataset so they
+    are not rebuilt.
+    """
+    # Load the corpus first so every corpus-wide view shares the cached tables
+    events, people = get_corpus(dataset_hash, records,
+                                event_store_path_for(dataset_path) if dataset_path else None)
+    report = get_validation_report(dataset_hash, records,
+                                   validation_path_for(dataset_path) if dataset_path else None)
+    
+    person_tab, corpus_tab, search_tab, quality_tab = st.tabs(["Person", "Corpus", "Search", "Data Quality"])
+    
+    with person_tab:
+        person_id = select_and_display_person(dataset, person_index, dataset_hash, report)
+        if person_id is not None:
+            display_similar_careers(get_similarity_index(dataset_hash, records), person_id)
+    
+    with corpus_tab:
+        display_cohort_comparison(events, people)
+        display_occupancy(dataset_hash, records)
+        display_transitions(events, people)
+        display_role_queries(get_event_index(dataset_hash, records))
+    
+    with search_tab:
+        display_search(get_search_index(dataset_hash, records,
+                                        search_index_path_for(dataset_path) if dataset_path else None))
+    
+    with quality_tab:
+        display_data_quality(report, people)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Preparing career events...")
+def get_corpus(dataset_hash: str, _records: Callable[[], Iterable[Dict[str, Any]]],
+               _cache_path: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Prepare the corpus event and people tables once per dataset.
+    
+    With a cache path (and pyarrow installed) they are loaded from, or saved
+    to, a columnar event store keyed by the dataset's content hash.
+    """
+    return load_or_build_corpus(_cache_path, {"content_hash": dataset_hash}, _records)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing career events...")
+def get_event_index(dataset_hash: str, _records: Callable[[], Iterable[Dict[str, Any]]]) -> EventIntervalIndex:
+    """Build the corpus-wide interval index once per dataset."""
+    events, _ = get_corpus(dataset_hash, _records)
+    return EventIntervalIndex(events)
+
+
+@st.cache_resource(max_entries=8, show_spinner="Counting role occupancy...")
+def get_occupancy(dataset_hash: str, relative: bool,
+                  _records: Callable[[], Iterable[Dict[str, Any]]]) -> OccupancyGrid:
+    """Build the year x metatype occupancy grid once per dataset and alignment."""
+    events, people = get_corpus(dataset_hash, _records)
+    return OccupancyGrid.from_events(events, people, relative=relative)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing careers...")
+def get_similarity_index(dataset_hash: str, _records: Callable[[], Iterable[Dict[str, Any]]]) -> TrajectoryIndex:
+    """Build the career similarity index once per dataset."""
+    events, people = get_corpus(dataset_hash, _records)
+    return TrajectoryIndex.from_corpus(events, people)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Validating dataset...")
+def get_validation_report(dataset_hash: str, _records: Callable[[], Iterable[Dict[str, Any]]],
+                          cache_path: Optional[str] = None) -> ValidationReport:
+    """Load the persisted validation report of a dataset, or validate every record once per dataset.
+    
+    Validation runs in the server process; forking a process pool from it
+    would copy the whole server and take every core. Large datasets can be
+    validated ahead of time in parallel with `python -m validation DATASET -o
+    DATASET.validation.json`, which writes the report this function reuses.
+    """
+    return load_or_build_validation(cache_path, {"content_hash": dataset_hash}, _records, workers=1)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Building search index...")
+def get_search_index(dataset_hash: str, _records: Callable[[], Iterable[Dict[str, Any]]],
+                     cache_path: Optional[str] = None) -> SearchIndex:
+    """Load the persisted search index of a dataset, or build it once per dataset."""
+    return load_or_build_search_index(cache_path, {"content_hash": dataset_hash},
+                                      lambda: get_corpus(dataset_hash, _records)[0])
+
+
+def display_search(search_index: SearchIndex) -> None:
+    """Search career events by text, tags, types and years."""
+    st.subheader("Search Career Events")
+    
+    query = st.text_input(
+        "Query",
+        key="search_query",
+        placeholder="tag:field_economics AND metatype:io AND year:1990..2000",
+        help=("Words search role, organization, description, source text and name. "
+              "Fields: tag:, metatype:, type:, role:, org:, description:, source:, person:, year:1990..2000. "
+              "Combine with AND, OR, NOT and parentheses; a trailing * matches by prefix and "
+              "quoted words match as a phrase.")
+    )
+    if not query:
+        st.caption("Example: `minist* AND year:1990..2000 NOT metatype:honor`")
+        return
+    
     try:
-        # Save uploaded file to a temporary file
-        temp_file_path = "temp_upload.json"
-        with open(temp_file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        matches = search_index.events(query)
+    except ValueError as e:
+        st.error(f"Invalid query: {str(e)}")
+        return
+    
+    st.markdown(f"**{matches['person_name'].nunique()}** people, **{len(matches)}** matching events")
+    st.dataframe(
+        matches[["person_name", "metatype", "type", "role", "organization", "start_date", "end_date"]].rename(
+            columns={
+                "person_name": "Person",
+                "metatype": "Type",
+                "type": "Role Type",
+                "role": "Role",
+                "organization": "Organization",
+                "start_date": "Start",
+                "end_date": "End"
+            }
+        ),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def display_data_quality(report: ValidationReport, people: pd.DataFrame) -> None:
+    """Summarize the issues found when validating every person and career event."""
+    st.subheader("Data Quality")
+    
+    summary = report.summary()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("People", summary["people"])
+    col2.metric("Career events", summary["events"])
+    col3.metric("People with issues", summary["people_with_issues"])
+    col4.metric("Invalid people", summary["invalid_people"])
+    
+    if report.issues.empty:
+        st.success("No issues found.")
+        return
+    
+    counts = pd.DataFrame({"Code": list(summary["counts"]), "Issues": list(summary["counts"].values())})
+    counts.insert(1, "Description", counts["Code"].map(ISSUE_DESCRIPTIONS))
+    st.dataframe(counts, use_container_width=True, hide_index=True)
+    
+    # Issue list, optionally limited to one kind of issue
+    code = st.selectbox("Show issues", ["All"] + list(summary["counts"]), key="quality_code")
+    issues = report.issues if code == "All" else report.issues[report.issues["code"] == code]
+    names = people.set_index("person_id")["name"]
+    st.dataframe(
+        pd.DataFrame({
+            "Person": issues["person_id"].map(names).fillna(""),
+            "Event": issues["event_index"].where(issues["event_index"] >= 0),
+            "Code": issues["code"],
+            "Field": issues["field"]
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def display_similar_careers(similarity_index: TrajectoryIndex, person_id: int) -> None:
+    """Show the careers most similar to the selected person's."""
+    if person_id not in similarity_index or len(similarity_index) < 2:
+        return
+    
+    st.subheader("Similar Careers")
+    k = st.slider("Number of people", 1, min(20, len(similarity_index) - 1), min(5, len(similarity_index) - 1),
+                  key="similar_count")
+    
+    neighbors = similarity_index.neighbors(person_id, k)
+    st.dataframe(
+        neighbors[["name", "score", "timing", "sequence", "shared"]].rename(columns={
+            "name": "Person",
+            "score": "Similarity",
+            "timing": "Timing",
+            "sequence": "Career moves",
+            "shared": "Shared organizations/tags"
+        }).round(2),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("Timing compares when people held each type of role relative to their HLP appointment; "
+               "career moves compare transitions between types of roles.")
+
+
+def display_occupancy(dataset_hash: str, records: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+    """Show how many people held each type of role in each year."""
+    st.subheader("Role Occupancy by Year")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        relative = st.checkbox("Years relative to HLP appointment", key="occupancy_relative")
+    with col2:
+        share = st.checkbox("Show share of each year", key="occupancy_share")
+    
+    occupancy = get_occupancy(dataset_hash, relative, records).to_frame()
+    if occupancy.empty:
+        st.info("No dated career events to count.")
+        return
+    
+    fig = viz.plot_metatype_occupancy_heatmap(occupancy, relative=relative, share=share)
+    with profiling.span("st.plotly_chart", chart="occupancy"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def display_transitions(events: pd.DataFrame, people: pd.DataFrame) -> None:
+    """Show how careers move between types of roles, for the corpus or one HLP panel."""
+    st.subheader("Career Transitions")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        scope = st.selectbox("People", ["All people"] + dp.hlp_panels(people), key="transitions_scope")
+    with col2:
+        column = st.radio("Between", ["metatype", "type"], horizontal=True, key="transitions_column",
+                          format_func=lambda c: "Types" if c == "metatype" else "Role types")
+    with col3:
+        chart = st.radio("Chart", ["Sankey", "Heatmap"], horizontal=True, key="transitions_chart")
+    
+    if scope != "All people":
+        events = events[events["person_id"].isin(dp.panel_people(people, scope)["person_id"])]
+    
+    # Role types are too many to show individually; keep the most frequent ones
+    max_categories = 15 if column == "type" else None
+    counts, categories, _ = transitions.transition_counts(events, column, max_categories=max_categories)
+    if counts.sum() == 0:
+        st.info("No career transitions to show.")
+        return
+    
+    if chart == "Sankey":
+        fig = viz.plot_transition_sankey(counts[0], categories)
+    else:
+        fig = viz.plot_transition_heatmap(counts[0], categories)
+    with profiling.span("st.plotly_chart", chart="transitions"):
+        st.plotly_chart(fig, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Time spent before moving on (years)**")
+        dwell = transitions.dwell_times(events, column, max_categories=max_categories)
+        st.dataframe(
+            dwell[[column, "runs", "mean_years", "median_years", "max_years"]].rename(columns={
+                column: "Type",
+                "runs": "Stints",
+                "mean_years": "Mean",
+                "median_years": "Median",
+                "max_years": "Longest"
+            }).round(1),
+            use_container_width=True,
+            hide_index=True
+        )
+    with col2:
+        st.markdown("**First international organization role**")
+        passage = transitions.first_passage(events)
+        summary = transitions.first_passage_summary(passage).iloc[0]
+        st.metric("People reaching an IO role", f"{int(summary['reached'])} of {int(summary['people'])}")
+        if summary["reached"]:
+            st.metric("Median years from first event", f"{summary['median_years']:.1f}")
+            st.metric("Median career steps before it", f"{summary['median_steps']:.0f}")
+
+
+def display_cohort_comparison(events: pd.DataFrame, people: pd.DataFrame) -> None:
+    """Overlay the careers of a High-Level Panel or of selected people."""
+    st.subheader("Compare Careers")
+    
+    panels = dp.hlp_panels(people)
+    modes = ["High-Level Panel", "Selected people"] if panels else ["Selected people"]
+    mode = st.radio("Compare", modes, horizontal=True)
+    
+    if mode == "High-Level Panel":
+        panel = st.selectbox("Panel", panels)
+        # Members of several panels are aligned on the selected one
+        people = dp.panel_people(people, panel)
+        person_ids = people["person_id"].tolist()
+    else:
+        names = people.set_index("person_id")["name"]
+        person_ids = st.multiselect("People", names.index.tolist(), format_func=lambda pid: names[pid])
+    
+    align = st.checkbox("Align on HLP appointment year", value=people["hlp_year"].notna().any())
+    
+    if not person_ids:
+        st.info("Select people to compare.")
+        return
+    
+    selected = events[events["person_id"].isin(person_ids)]
+    if align:
+        selected = dp.align_to_hlp(selected, people)
+        missing = len(person_ids) - selected["person_id"].nunique()
+        if missing:
+            st.caption(f"{missing} selected people without an HLP year or dated events are not shown.")
+    
+    fig = viz.plot_cohort_comparison_plotly(selected, people, relative=align)
+    with profiling.span("st.plotly_chart", chart="cohort"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def display_role_queries(event_index: EventIntervalIndex) -> None:
+    """Show who held which kind of role in a given year or range of years."""
+    st.subheader("Who Held Which Role")
+    
+    if len(event_index) == 0:
+        st.info("No dated career events in this dataset.")
+        return
+    
+    first_year, last_year = event_index.year_range
+    first_year, last_year = int(first_year), int(last_year)
+    default_year = min(max(2000, first_year), last_year)
+    years = st.slider("Years", first_year, last_year, (default_year, default_year))
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metatypes = st.multiselect("Type", event_index.metatypes)
+    with col2:
+        types = st.multiselect("Role type", event_index.types)
+    with col3:
+        tags = st.multiselect("Tags (all required)", event_index.tags)
+    
+    # Calendar years, as in the search and the occupancy heatmap
+    rows = event_index.active_in_years(years[0], years[1], metatype=metatypes or None, type=types or None,
+                                       tags=tags or None)
+    matches = event_index.events.iloc[rows]
+    st.markdown(f"**{matches['person_name'].nunique()}** people, **{len(matches)}** matching events")
+    
+    st.dataframe(
+        matches[["person_name", "metatype", "type", "role", "organization", "start_date", "end_date"]].rename(
+            columns={
+                "person_name": "Person",
+                "metatype": "Type",
+                "type": "Role Type",
+                "role": "Role",
+                "organization": "Organization",
+                "start_date": "Start",
+                "end_date": "End"
+            }
+        ),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def select_and_display_person(dataset: Any, person_index: Any, dataset_hash: Optional[str] = None,
+                              report: Optional[ValidationReport] = None) -> Optional[int]:
+    """Show the person selector and the visualizations for the selected person.
+    
+    With a validation report, invalid records are rejected without
+    re-checking them. Returns the record position of the displayed person,
+    or None.
+    """
+    person_names = person_index.names()
+    
+    if not person_names:
+        st.error("No valid person data found in the uploaded file.")
+        return None
+    
+    # Person selector (dropdown)
+    selected_person = st.selectbox(
+        "Select person to visualize",
+        person_names
+    )
+    
+    # Get data for selected person
+    if selected_person:
+        position = person_index.position(selected_person)
+        if report is not None and not report.is_valid(position):
+            codes = report.person_issues(position)["code"].unique()
+            st.error(f"Invalid data for {selected_person}: "
+                     + ", ".join(ISSUE_DESCRIPTIONS[code].lower() for code in codes))
+            return None
         
-        # Store the temp file path in session state
-        st.session_state.temp_file_path = temp_file_path
+        person_data = dp.get_person_data(dataset, selected_person, index=person_index)
         
-        # Load the data
-        data = dp.load_json_file(temp_file_path)
+        if person_data and (report is not None or dp.validate_career_data(person_data)):
+            display_visualizations(person_data, dataset_hash)
+            return position
+        else:
+            st.error(f"Invalid or missing data for {selected_person}")
+    
+    return None
+
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing dataset...")
+def open_disk_dataset(path: str, key: str) -> DiskDataset:
+    """Open an on-disk dataset, shared across sessions until the file changes.
+
+    `key` (from `sidecar_index.file_key`) changes with any edit to the file;
+    the sidecar is re-verified on open, so the `content_hash` keying the
+    other caches matches the current content.
+    """
+    return DiskDataset(path)
+
+
+def process_uploaded_file(uploaded_file) -> None:
+    """Process the uploaded JSON file and store in session state."""
+    try:
+        # Parse straight from the upload buffer; identical uploads are parsed once per server
+        buffer = uploaded_file.getbuffer()
+        dataset_hash = content_hash(buffer)
+        data, person_index = load_uploaded_dataset(dataset_hash, buffer)
         
-        # Store the dataset in session state
+        # Store the dataset and its name index in session state
         st.session_state.dataset = data
+        st.session_state.person_index = person_index
+        st.session_state.dataset_hash = dataset_hash
         
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
         raise e
 
 
-def cleanup_temp_file():
-    """Clean up temporary file."""
-    if st.session_state.temp_file_path and os.path.exists(st.session_state.temp_file_path):
-        os.remove(st.session_state.temp_file_path)
-        st.session_state.temp_file_path = None
+@st.cache_resource(max_entries=8, show_spinner="Parsing dataset...")
+def load_uploaded_dataset(dataset_hash: str, _buffer: memoryview) -> Tuple[Any, PersonIndex]:
+    """Parse an upload and index it, shared by every session uploading the same content.
+    
+    The returned dataset is shared between sessions and must not be modified.
+    """
+    data = dp.load_json_buffer(_buffer)
+    with profiling.span("person_index.build"):
+        return data, PersonIndex.from_data(data)
+
 
+@st.cache_resource
+def get_view_cache() -> DerivedDataCache:
+    """Return the derived-data cache shared by all sessions of this server process."""
+    return DerivedDataCache()
 
-def display_visualizations(data: Dict[str, Any]):
+
+def display_visualizations(data: Dict[str, Any], dataset_hash: Optional[str] = None):
     """Display visualizations for the provided data."""
-    # Prepare timeline data
-    df_sorted, metatype_to_y = dp.prepare_timeline_data(data)
+    # Prepared data, stats and figures are cached per dataset and person across reruns
+    if dataset_hash is None:
+        dataset_hash = content_hash(data)
+    view = cached_person_view(get_view_cache(), dataset_hash, data)
+    filtered_df = view["df"]
     
-    if len(df_sorted) < 2:
+    if len(filtered_df) < 2:
         st.warning("Insufficient data points for visualization. Need at least 2 career events.")
         return
     
-    # No filtering - always use the full dataset
-    filtered_df = df_sorted
-    
     # Create enhanced header with person metadata
     person_name = data['person']['name']
     
     # Extract metadata if available
     metadata = data.get('person', {}).get('metadata', {})
     nationality = metadata.get('nationality', '')
-    hlp_name = metadata.get('hlp', '')
+    panels = dp.hlp_memberships(metadata)
     
     # Create the main header
     st.subheader(f"Career Timeline: {person_name}")
@@ -138,20 +554,21 @@ def display_visualizations(data: Dict[str, Any]):
     metadata_parts = []
     if nationality:
         metadata_parts.append(f"🌍 {nationality}")
-    if hlp_name:
-        metadata_parts.append(f"📋 High-Level Panel: {hlp_name}")
+    if panels:
+        panel_names = ", ".join(f"{m['hlp']} ({m['hlp_year']})" if m["hlp_year"] else m["hlp"] for m in panels)
+        metadata_parts.append(f"📋 High-Level Panel{'s' if len(panels) > 1 else ''}: {panel_names}")
     
     if metadata_parts:
         metadata_text = " | ".join(metadata_parts)
         st.markdown(f"<div style='color: #666; font-size: 1.1em; margin-bottom: 1rem;'>{metadata_text}</div>", 
                    unsafe_allow_html=True)
     
-    # Create and display career timeline visualization with HLP year line
-    fig = viz.plot_career_timeline_plotly(filtered_df, metatype_to_y, data)
-    st.plotly_chart(fig, use_container_width=True)
+    # Display career timeline visualization with HLP year line
+    with profiling.span("st.plotly_chart", chart="timeline"):
+        st.plotly_chart(json.loads(view["timeline_figure"]), use_container_width=True)
     
-    # Find longest role
-    longest_role, longest_duration = viz.find_longest_role(filtered_df)
+    # Longest role
+    longest_role, longest_duration = view["longest_role"], view["longest_duration"]
     
     # Display key career insights
     st.subheader("Key Career Insights")
@@ -162,15 +579,12 @@ def display_visualizations(data: Dict[str, Any]):
         # Display career statistics
         st.markdown("**Career Timeline Statistics**")
         
-        # Calculate statistics
-        event_count = len(filtered_df)
-        career_span = filtered_df["timeline_date"].max() - filtered_df["timeline_date"].min()
-        metatype_counts = filtered_df["metatype"].value_counts()
+        stats = view["stats"]
         
         # Display metrics
-        st.metric("Total Career Events", event_count)
-        st.metric("Career Span (Years)", f"{career_span:.1f}")
-        st.metric("Most Common Type", metatype_counts.index[0] if not metatype_counts.empty else "N/A")
+        st.metric("Total Career Events", stats["event_count"])
+        st.metric("Career Span (Years)", f"{stats['career_span']:.1f}")
+        st.metric("Most Common Type", stats["most_common_type"])
         
         # Display longest role information
         if longest_role and longest_duration > 0:
@@ -188,91 +602,59 @@ def display_visualizations(data: Dict[str, Any]):
     with col2:
         # Display year-based distribution
         st.markdown("**Distribution by Years in Each Type**")
-        fig, _ = viz.plot_metatype_distribution_by_years(filtered_df)
-        st.pyplot(fig)
+        with profiling.span("st.image", chart="years_distribution"):
+            st.image(view["years_distribution_png"])
     
     # Display interactive table of career events
     st.subheader("Career Events")
-    
-    # Create a clean table for display
-    display_df = filtered_df.copy()
-    display_df["year"] = display_df["timeline_date"].astype(int)
-    
-    # Calculate duration for each role
-    def calculate_duration(row):
-        # First check if this is an open-ended position
-        if "is_open_ended" in row and row["is_open_ended"]:
-            return "Ongoing/No End Date"
-            
-        # Use numeric_start and numeric_end if available (from the updated prepare_timeline_data)
-        if "numeric_start" in row and "numeric_end" in row:
-            duration = row["numeric_end"] - row["numeric_start"]
-            return f"{duration:.1f}"
-        
-        # Otherwise, fall back to original calculation
-        start = row["start_date"] if row["start_date"] else row["timeline_date"]
-        end = row["end_date"] if row["end_date"] else row["timeline_date"]
-        
-        try:
-            start = float(start)
-            end = float(end)
-            duration = max(end - start, 1)  # Minimum duration of 1 year for events with same start/end
-            return f"{duration:.1f}"
-        except (ValueError, TypeError):
-            return "1.0"  # Default to 1 year if calculation fails
-    
-    display_df["duration"] = display_df.apply(calculate_duration, axis=1)
-    
-    # Add status column to indicate open-ended positions
-    display_df["status"] = "Completed"
-    if "is_open_ended" in filtered_df.columns:
-        display_df["status"] = filtered_df["is_open_ended"].apply(
-            lambda x: "Ongoing/No End Date" if x else "Completed")
-    
-    # Sort by year
-    display_df = display_df.sort_values("year")
-    
-    # Display the table with better column names
-    display_columns = ["year", "metatype", "role", "organization", "duration", "status"]
-    
-    st.dataframe(
-        display_df[display_columns].rename(
-            columns={
-                "year": "Year",
-                "metatype": "Type",
-                "role": "Role",
-                "organization": "Organization",
-                "duration": "Duration (Years)",
-                "status": "Status"
-            }
-        ),
-        use_container_width=True
-    )
+    st.dataframe(view["events_table"], use_container_width=True)
     
     # Show distribution by event count in expandable section
     with st.expander("View Distribution by Event Count"):
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # Create and display metatype distribution
+            # Display metatype distribution
             st.markdown("**Distribution by Number of Events**")
-            fig, _ = viz.plot_metatype_distribution(filtered_df)
-            st.pyplot(fig)
+            with profiling.span("st.image", chart="count_distribution"):
+                st.image(view["count_distribution_png"])
         
         with col2:
             # Display metatype counts as a table
             st.markdown("**Event Counts by Type**")
-            metatype_counts = filtered_df["metatype"].value_counts().reset_index()
-            metatype_counts.columns = ["Type", "Count"]
-            st.dataframe(metatype_counts, use_container_width=True)
+            st.dataframe(view["metatype_counts"], use_container_width=True)
     
     # Display raw data table
     with st.expander("View Raw Data"):
         st.dataframe(filtered_df, use_container_width=True)
 
 
+def display_profile(trace: profiling.Trace) -> None:
+    """Show the stage timings and counters of the last rerun in a sidebar panel."""
+    with st.sidebar.expander("Profiling"):
+        st.metric("Rerun", f"{trace.elapsed_seconds * 1000:.0f} ms")
+        if trace.peak_rss_mb is not None:
+            st.metric("Peak memory", f"{trace.peak_rss_mb:.0f} MiB")
+        
+        summary = pd.DataFrame(trace.summary(), columns=["name", "calls", "total_ms", "mean_ms", "max_ms"])
+        st.dataframe(summary.round(1), use_container_width=True, hide_index=True)
+        if trace.counters:
+            st.json(trace.counters)
+        
+        st.download_button(
+            "Download Chrome trace",
+            json.dumps(profiling.merge_traces([trace.to_dict()]), default=str),
+            file_name="prosopography_trace.json",
+            mime="application/json",
+            help="Open in chrome://tracing or https://ui.perfetto.dev"
+        )
+
+
 if __name__ == "__main__":
-    try:
-        main()
-    finally:
-        cleanup_temp_file()
\ No newline at end of file
+    # Set PROSOPOGRAPHY_PROFILE=1 to time each rerun
+    if profiling.is_enabled():
+        with profiling.recording("rerun") as trace:
+            main()
+        display_profile(trace)
+    else:
+        main()
\ No newline at end of file
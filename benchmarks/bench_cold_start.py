@@ -0,0 +1,136 @@
+"""Benchmark the cold start of the app: module import times and `streamlit run app.py` to first paint.
+
+Run from the repository root:
+
+    python benchmarks/bench_cold_start.py [--repeat 3] [--port 8599] [--skip-server]
+
+The server measurement starts `streamlit run app.py` headless, waits for the
+health endpoint, opens a session over the app's websocket the way a browser
+does and records when the first element and the end of the first script run
+arrive. It needs the `websockets` package, which uvicorn installs alongside
+Streamlit.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATASET = "data/career_trajectories_03_dates_normalized_with_hlp.json"
+
+# Modules imported by app.py, plus the rendering backends they may pull in
+MODULES = ["streamlit", "pandas", "data_processing", "visualization", "view_cache", "event_store",
+           "similarity", "search_index", "validation", "matplotlib.pyplot", "plotly.graph_objects",
+           "plotly.express"]
+BACKENDS = ["matplotlib", "matplotlib.pyplot", "plotly.graph_objects", "plotly.express", "plotly.subplots"]
+
+# Time until the first person view is rendered in a fresh process
+COLD_VIEW = """
+import time
+start = time.perf_counter()
+import data_processing as dp
+import view_cache
+record = next(dp.iter_person_records({dataset!r}))
+view_cache.compute_person_view(record)
+print(time.perf_counter() - start)
+"""
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter from the repository root and return its output."""
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def import_time(module: str, repeat: int) -> float:
+    """Best time to import a module in a fresh interpreter, beyond the interpreter start itself."""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return min(float(run_python(code)) for _ in range(repeat))
+
+
+def loaded_backends(module: str) -> List[str]:
+    """Rendering backends that importing a module loads."""
+    code = f"import sys, {module}; print(','.join(m for m in {BACKENDS!r} if m in sys.modules))"
+    return [m for m in run_python(code).split(",") if m]
+
+
+def _free_port(port: int) -> bool:
+    """Check that nothing listens on a local port."""
+    with socket.socket() as sock:
+        return sock.connect_ex(("127.0.0.1", port)) != 0
+
+
+def server_first_paint(port: int, timeout: float = 120.0) -> Dict[str, float]:
+    """Start the app and time server readiness, the first element and the end of the first run."""
+    from websockets.sync.client import connect
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    if not _free_port(port):
+        raise RuntimeError(f"Port {port} is in use")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("The app did not start")
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.02)
+        timings = {"server_ready": time.perf_counter() - started}
+
+        with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+            message = BackMsg()
+            message.rerun_script.query_string = ""
+            ws.send(message.SerializeToString())
+            while True:
+                forward = ForwardMsg()
+                forward.ParseFromString(ws.recv(timeout=timeout))
+                kind = forward.WhichOneof("type")
+                if kind == "delta" and "first_paint" not in timings:
+                    timings["first_paint"] = time.perf_counter() - started
+                elif kind == "script_finished":
+                    timings["script_finished"] = time.perf_counter() - started
+                    return timings
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure imports and the first view")
+    args = parser.parse_args()
+
+    print(f"{'module':<22} {'import (s)':>10}  backends loaded")
+    for module in MODULES:
+        print(f"{module:<22} {import_time(module, args.repeat):>10.3f}  {', '.join(loaded_backends(module)) or '-'}")
+
+    cold_view = min(float(run_python(COLD_VIEW.format(dataset=args.dataset))) for _ in range(args.repeat))
+    print(f"\nfirst person view in a fresh process: {cold_view:.3f}s")
+
+    if args.skip_server:
+        return
+
+    runs = [server_first_paint(args.port) for _ in range(args.repeat)]
+    print(f"\n{'streamlit run app.py':<22} {'best (s)':>10} {'median (s)':>10}")
+    for stage in ["server_ready", "first_paint", "script_finished"]:
+        values = sorted(run[stage] for run in runs)
+        print(f"{stage:<22} {values[0]:>10.3f} {values[len(values) // 2]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
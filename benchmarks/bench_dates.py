@@ -0,0 +1,72 @@
+"""Benchmark date parsing against the previous per-event float() conversion.
+
+Run from the repository root:
+
+    python benchmarks/bench_dates.py [--events 100000 1000000 3000000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_processing as dp  # noqa: E402
+import dates  # noqa: E402
+
+
+DEFAULT_DATASET = "data/career_trajectories_03_dates_normalized_with_hlp.json"
+
+
+def legacy_parse(values: pd.Series) -> np.ndarray:
+    """The per-event try/except conversion that dropped ISO dates and "present"."""
+    result = np.full(len(values), np.nan)
+    for i, value in enumerate(values):
+        if value:
+            try:
+                result[i] = float(value)
+            except (ValueError, TypeError):
+                pass
+    return result
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the best wall-clock time of several runs."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--events", type=int, nargs="+", default=[100000, 1000000, 3000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Sample date values with the distribution of the bundled dataset
+    table = dp.build_event_table(dp.iter_person_records(args.dataset))
+    pool = pd.concat([table["start_date"], table["end_date"]], ignore_index=True)
+    rng = np.random.default_rng(0)
+
+    print(f"{'values':>10} {'legacy (s)':>12} {'parser (s)':>12} {'speedup':>8} {'legacy dated':>13} {'parser dated':>13}")
+    for n in args.events:
+        values = pool.iloc[rng.integers(0, len(pool), n)].reset_index(drop=True)
+        legacy = best_time(lambda: legacy_parse(values), args.repeat)
+        parser_time = best_time(lambda: dates.parse_date_column(values, "end"), args.repeat)
+
+        legacy_dated = int(np.isfinite(legacy_parse(values)).sum())
+        years, precision = dates.parse_date_column(values, "end")
+        parser_dated = int((np.isfinite(years) | (precision == dates.PRECISION_PRESENT)).sum())
+        print(f"{n:>10} {legacy:>12.4f} {parser_time:>12.4f} {legacy / parser_time:>7.1f}x "
+              f"{legacy_dated:>13} {parser_dated:>13}")
+
+
+if __name__ == "__main__":
+    main()
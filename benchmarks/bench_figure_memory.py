@@ -0,0 +1,88 @@
+"""Benchmark memory use of repeated Matplotlib renders with and without figure reuse.
+
+Run from the repository root:
+
+    python benchmarks/bench_figure_memory.py [--renders 1000] [--report-every 250]
+
+Each mode renders the three Matplotlib charts of one person over and over in
+a fresh process and reports the peak RSS as it goes:
+
+- pyplot: figures created through pyplot and never closed, as the renderers used to
+- new: a new figure per render, dropped after encoding
+- reuse: one figure cleared and reused for every render
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_processing as dp  # noqa: E402
+import visualization as viz  # noqa: E402
+
+
+DEFAULT_DATASET = "data/career_trajectories_03_dates_normalized_with_hlp.json"
+MODES = ["pyplot", "new", "reuse"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode: str, dataset: str, renders: int, report_every: int, dpi: int) -> None:
+    """Render repeatedly in this process and print progress lines."""
+    record = next(dp.iter_person_records(dataset))
+    df, metatype_to_y = dp.prepare_timeline_data(record)
+    renderers = [
+        lambda fig: viz.plot_career_timeline_matplotlib(df, metatype_to_y, dpi=dpi, fig=fig),
+        lambda fig: viz.plot_metatype_distribution(df, dpi=dpi, fig=fig),
+        lambda fig: viz.plot_metatype_distribution_by_years(df, dpi=dpi, fig=fig)
+    ]
+    if mode == "pyplot":
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+    started = time.perf_counter()
+    fig = None
+    for i in range(1, renders + 1):
+        render = renderers[i % len(renderers)]
+        if mode == "pyplot":
+            render(plt.figure())
+        elif mode == "new":
+            render(None)
+        else:
+            fig, _ = render(fig)
+        if i % report_every == 0 or i == renders:
+            print(f"{mode:<8} {i:>8} {peak_rss_mb():>10.1f} {(time.perf_counter() - started) / i * 1000:>10.1f}",
+                  flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--renders", type=int, default=1000)
+    parser.add_argument("--report-every", type=int, default=250)
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--mode", choices=MODES, default=None, help="Run one mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.dataset, args.renders, args.report_every, args.dpi)
+        return
+
+    print(f"{'mode':<8} {'renders':>8} {'peak MiB':>10} {'ms/render':>10}")
+    for mode in MODES:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode, "--dataset", args.dataset,
+                        "--renders", str(args.renders), "--report-every", str(args.report_every),
+                        "--dpi", str(args.dpi)], check=True)
+
+
+if __name__ == "__main__":
+    main()
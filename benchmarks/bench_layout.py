@@ -0,0 +1,87 @@
+"""Benchmark the vectorized overlap layout against the previous iterrows version.
+
+Run from the repository root:
+
+    python benchmarks/bench_layout.py [--people 76 304 1216] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_processing as dp  # noqa: E402
+import visualization as viz  # noqa: E402
+
+
+DEFAULT_DATASET = "data/career_trajectories_03_dates_normalized_with_hlp.json"
+
+
+def legacy_prepare_visualization_data(df: pd.DataFrame) -> pd.DataFrame:
+    """The row-wise implementation that prepare_visualization_data replaced."""
+    df_sorted = df.copy()
+
+    metatypes = df_sorted["metatype"].unique()
+    color_map = viz.create_color_mapping(metatypes)
+    df_sorted["color"] = df_sorted["metatype"].map(color_map)
+
+    df_sorted["sub_index"] = 0
+    year_precision = 0.2
+
+    meta_year_tracker = {}
+    for idx, row in df_sorted.iterrows():
+        year_key = (row["metatype"], int(row["timeline_date"]))
+        if year_key not in meta_year_tracker:
+            meta_year_tracker[year_key] = 0
+        else:
+            meta_year_tracker[year_key] += 1
+        df_sorted.at[idx, "sub_index"] = meta_year_tracker[year_key]
+
+    df_sorted["y_adjusted"] = df_sorted["y_pos"] + df_sorted["sub_index"] * year_precision
+
+    return df_sorted
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the best wall-clock time of several runs."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--people", type=int, nargs="+", default=[76, 304, 1216])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = list(dp.iter_person_records(args.dataset))
+
+    # Single person: the legacy function must agree with the vectorized one
+    person_df, _ = dp.prepare_timeline_data(records[0])
+    pd.testing.assert_frame_equal(legacy_prepare_visualization_data(person_df),
+                                  viz.prepare_visualization_data(person_df))
+
+    print(f"{'people':>8} {'events':>8} {'legacy (s)':>12} {'year (s)':>10} {'lanes (s)':>10} {'speedup':>8}")
+    for people in args.people:
+        corpus = [records[i % len(records)] for i in range(people)]
+        table = dp.prepare_timeline_table(corpus)
+
+        # The legacy version has no notion of people, so it runs once per person
+        per_person = [group for _, group in table.groupby("person_id", sort=False)]
+        legacy = best_time(lambda: [legacy_prepare_visualization_data(g) for g in per_person], args.repeat)
+        year = best_time(lambda: viz.prepare_visualization_data(table), args.repeat)
+        lanes = best_time(lambda: viz.prepare_visualization_data(table, layout="lanes"), args.repeat)
+
+        print(f"{people:>8} {len(table):>8} {legacy:>12.4f} {year:>10.4f} {lanes:>10.4f} {legacy / year:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Benchmark the core pipeline on synthetic corpora and compare against a stored baseline.
+
+Run from the repository root:
+
+    python benchmarks/bench_suite.py [--quick] [--filter prepare] [--save]
+
+Datasets come from `synthetic_corpus` with a fixed seed, so every run and
+every machine measures the same data. Corpus-wide cases (loading and
+person lookup) run on datasets of the given total sizes in the list and
+nested layouts; per-person cases (timeline preparation, layout, the
+Plotly and Matplotlib renderers and `find_longest_role`) run on a single
+person with the given number of events.
+
+Each case reports the best and median time per call, asv style. Results are
+compared against `benchmarks/baselines/bench_suite.json`; a case more than
+`--threshold` times slower than its baseline is a regression and makes the
+command exit with status 1. `--save` replaces the baseline with this run.
+Baselines are only comparable on the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_processing as dp  # noqa: E402
+import synthetic_corpus  # noqa: E402
+import visualization as viz  # noqa: E402
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "bench_suite.json")
+SEED = 0
+CORPUS_SIZES = [1_000, 10_000, 100_000]
+PERSON_SIZES = [20, 200, 2_000]
+QUICK_CORPUS_SIZES = [1_000]
+QUICK_PERSON_SIZES = [20]
+# Resolution of the Matplotlib renders, as in the app
+DPI = 100
+
+
+def _label(size: int) -> str:
+    """Short size label, e.g. 10k."""
+    return f"{size // 1_000_000}M" if size >= 1_000_000 else f"{size // 1_000}k" if size >= 1_000 else str(size)
+
+
+def _render(plot: Callable[..., Tuple[Any, Optional[bytes]]]) -> Callable[[], Any]:
+    """Render a Matplotlib chart to PNG and release the figure."""
+    def run():
+        fig, png = plot()
+        viz.close_figure(fig)
+        return png
+    return run
+
+
+def corpus_cases(data_dir: str, sizes: List[int]) -> Dict[str, Callable[[], Callable[[], Any]]]:
+    """Cases over whole datasets; each maps a name to a setup returning the timed function."""
+    cases: Dict[str, Callable[[], Callable[[], Any]]] = {}
+    for size in sizes:
+        people = max(1, size // synthetic_corpus.DEFAULT_EVENTS_PER_PERSON)
+        for layout in ["list", "nested"]:
+            path = os.path.join(data_dir, f"corpus-{layout}-{size}.json")
+
+            def load_setup(path=path, layout=layout, people=people):
+                if not os.path.exists(path):
+                    synthetic_corpus.write_corpus(path, people, layout, SEED)
+                return lambda: dp.load_json_file(path)
+
+            def lookup_setup(path=path, layout=layout, people=people):
+                if not os.path.exists(path):
+                    synthetic_corpus.write_corpus(path, people, layout, SEED)
+                data = dp.load_json_file(path)
+                # The last person is the worst case of the scan
+                name = synthetic_corpus.person_name(people - 1)
+                return lambda: dp.get_person_data(data, name)
+
+            cases[f"load_json_file[{layout}-{_label(size)}]"] = load_setup
+            cases[f"get_person_data[{layout}-{_label(size)}]"] = lookup_setup
+    return cases
+
+
+def person_cases(data_dir: str, sizes: List[int]) -> Dict[str, Callable[[], Callable[[], Any]]]:
+    """Cases over one person with a given number of events, stored in the single-person layout."""
+    cases: Dict[str, Callable[[], Callable[[], Any]]] = {}
+    for size in sizes:
+        path = os.path.join(data_dir, f"person-{size}.json")
+
+        def record(path=path, size=size) -> Dict[str, Any]:
+            if not os.path.exists(path):
+                synthetic_corpus.write_corpus(path, 1, "single", SEED, events_per_person=size)
+            return dp.load_json_file(path)
+
+        def prepared(path=path, size=size):
+            data = record(path, size)
+            df, metatype_to_y = dp.prepare_timeline_data(data)
+            return data, df, metatype_to_y
+
+        def timeline_setup(path=path, size=size):
+            data = record(path, size)
+            return lambda: dp.prepare_timeline_data(data)
+
+        def layout_setup(path=path, size=size):
+            _, df, _ = prepared(path, size)
+            return lambda: viz.prepare_visualization_data(df)
+
+        def plotly_setup(path=path, size=size):
+            data, df, metatype_to_y = prepared(path, size)
+            return lambda: viz.plot_career_timeline_plotly(df, metatype_to_y, data)
+
+        def matplotlib_setup(path=path, size=size):
+            _, df, metatype_to_y = prepared(path, size)
+            return _render(lambda: viz.plot_career_timeline_matplotlib(df, metatype_to_y, dpi=DPI))
+
+        def distribution_setup(path=path, size=size):
+            _, df, _ = prepared(path, size)
+            return _render(lambda: viz.plot_metatype_distribution(df, dpi=DPI))
+
+        def years_setup(path=path, size=size):
+            _, df, _ = prepared(path, size)
+            return _render(lambda: viz.plot_metatype_distribution_by_years(df, dpi=DPI))
+
+        def longest_setup(path=path, size=size):
+            _, df, _ = prepared(path, size)
+            return lambda: viz.find_longest_role(df)
+
+        label = _label(size)
+        cases.update({
+            f"prepare_timeline_data[{label}]": timeline_setup,
+            f"prepare_visualization_data[{label}]": layout_setup,
+            f"plot_career_timeline_plotly[{label}]": plotly_setup,
+            f"plot_career_timeline_matplotlib[{label}]": matplotlib_setup,
+            f"plot_metatype_distribution[{label}]": distribution_setup,
+            f"plot_metatype_distribution_by_years[{label}]": years_setup,
+            f"find_longest_role[{label}]": longest_setup
+        })
+    return cases
+
+
+def time_case(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Time a function: calls per sample are chosen so a sample takes at least `min_time`."""
+    func()  # warm-up
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    samples = [elapsed / number] + [t / number for t in timer.repeat(repeat - 1, number)]
+    return {"best": min(samples), "median": statistics.median(samples), "number": number, "repeat": repeat}
+
+
+def environment() -> Dict[str, Any]:
+    """Versions and machine details stored with the results."""
+    import matplotlib
+    import numpy
+    import pandas
+    import plotly
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "plotly": plotly.__version__,
+        "generator_version": synthetic_corpus.GENERATOR_VERSION,
+        "seed": SEED
+    }
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Load stored baseline results, or an empty baseline."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {"results": {}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=CORPUS_SIZES,
+                        help="Total career events of the corpus-wide cases")
+    parser.add_argument("--person-sizes", type=int, nargs="+", default=PERSON_SIZES,
+                        help="Career events of the person in the per-person cases")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest sizes")
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per sample")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="Slowdown against the baseline counted as a regression (default: 1.3)")
+    parser.add_argument("--save", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--data-dir", default=None, help="Keep generated datasets here instead of a temporary directory")
+    args = parser.parse_args()
+
+    corpus_sizes = QUICK_CORPUS_SIZES if args.quick else args.corpus_sizes
+    person_sizes = QUICK_PERSON_SIZES if args.quick else args.person_sizes
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="prosopography-bench-")
+    os.makedirs(data_dir, exist_ok=True)
+
+    baseline = load_baseline(args.baseline)
+    cases = {**corpus_cases(data_dir, corpus_sizes), **person_cases(data_dir, person_sizes)}
+    results: Dict[str, Dict[str, float]] = {}
+    regressions: List[str] = []
+
+    print(f"{'case':<50} {'best':>10} {'median':>10} {'baseline':>10} {'ratio':>7}")
+    try:
+        for name, setup in cases.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = time_case(setup(), args.repeat, args.min_time)
+            best = results[name]["best"]
+            previous = baseline["results"].get(name)
+            ratio = best / previous["best"] if previous else None
+            flag = ""
+            if ratio is not None and ratio > args.threshold:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            stored = f"{previous['best'] * 1000:>8.2f}ms {ratio:>7.2f}" if previous else f"{'-':>10} {'-':>7}"
+            print(f"{name:<50} {best * 1000:>8.2f}ms {results[name]['median'] * 1000:>8.2f}ms {stored}{flag}",
+                  flush=True)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.save:
+        # Cases not run this time keep their stored baseline
+        stored = {**baseline["results"], **results}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"recorded": time.strftime("%Y-%m-%d"), "environment": environment(),
+                       "results": dict(sorted(stored.items()))}, file, indent=2)
+            file.write("\n")
+        print(f"\nBaseline saved to {args.baseline}")
+    elif baseline["results"] and baseline.get("environment", {}).get("platform") != platform.platform():
+        print("\nNote: the baseline was recorded on a different machine; ratios are only indicative.")
+
+    if regressions and not args.save:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}x: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
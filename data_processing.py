@@ -1,8 +1,48 @@
 import json
+import re
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Any, Optional, Union
+from typing import Dict, List, Tuple, Any, Optional, Union, Iterator, Iterable, TextIO, BinaryIO
 
+import dates
+import profiling
 
+
+# Size of the text chunks read by the streaming loader
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Upper limit for open-ended positions
+CURRENT_YEAR = 2025
+
+# Standard order for metatypes to ensure consistency across visualizations
+STANDARD_METATYPES = [
+    'academic',
+    'govt',
+    'io',
+    'private',
+    'think_tank',
+    'ngo',
+    'foundation',
+    'honor',
+    'media',
+    'other'
+]
+
+# Columns of the people table returned by prepare_corpus
+PEOPLE_COLUMNS = ["person_id", "name", "nationality", "gender", "hlp", "hlp_year", "hlp_memberships"]
+
+# Raw fields of a career event kept in the event table
+EVENT_FIELDS = ["metatype", "type", "tags", "organization", "role", "start_date", "end_date",
+                "description", "source_text"]
+
+# Columns returned by prepare_timeline_data for a single person
+TIMELINE_COLUMNS = ["metatype", "organization", "role", "timeline_date", "start_date", "end_date",
+                    "numeric_start", "numeric_end", "is_open_ended", "start_precision", "end_precision", "y_pos"]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@profiling.profiled()
 def load_json_file(file_path: str) -> Dict[str, Any]:
     """Load JSON data from file."""
     try:
@@ -15,184 +55,482 @@ def load_json_file(file_path: str) -> Dict[str, Any]:
         raise IOError(f"Error reading file: {str(e)}")
 
 
+@profiling.profiled()
+def load_json_buffer(buffer: Union[bytes, bytearray, memoryview, BinaryIO]) -> Any:
+    """Load JSON data from an in-memory buffer or binary stream without touching disk.
+    
+    Objects exposing `getbuffer()` (e.g. Streamlit uploads, `io.BytesIO`) are
+    decoded straight from a memoryview of their contents, without an
+    intermediate bytes copy.
+    """
+    try:
+        if hasattr(buffer, "getbuffer"):
+            view = memoryview(buffer.getbuffer())
+        elif hasattr(buffer, "read"):
+            view = memoryview(buffer.read())
+        else:
+            view = memoryview(buffer)
+        return json.loads(str(view, 'utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ValueError("Invalid JSON file format")
+    except Exception as e:
+        raise IOError(f"Error reading buffer: {str(e)}")
+
+
+@profiling.profiled()
 def extract_people_names(file_path: str) -> List[str]:
     """Extract only the names of people from a JSON file efficiently."""
     try:
-        data = load_json_file(file_path)
-        return _extract_names_from_data(data)
+        return list(iter_people_names(file_path))
     except Exception as e:
         raise IOError(f"Error extracting people names: {str(e)}")
 
 
+def iter_person_records(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Stream person records from a JSON file one at a time in constant memory.
+
+    Supports the same layouts as `_extract_names_from_data`: a nested list
+    `[[person, ...]]`, a list of people `[person, ...]` and a single person.
+    Only one record is held in memory at a time.
+    """
+    for record, _, _ in _iter_record_spans(file_path, chunk_size):
+        yield record
+
+
+def iter_people_names(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Stream person names from a JSON file without keeping earlier records alive."""
+    for record, _, _ in _iter_record_spans(file_path, chunk_size):
+        yield record["person"]["name"]
+
+
+class _JsonStreamReader:
+    """Incremental reader that decodes one JSON value at a time from a text file.
+
+    Tracks the byte offset of the read position in the underlying file so that
+    callers can record where each decoded value lives on disk.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.offset = 0
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Drop consumed text and append the next chunk; return False at end of file."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(max(self._chunk_size, min_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of file."""
+        while True:
+            end = _WHITESPACE.match(self._buf, self._pos).end()
+            self.offset += end - self._pos
+            self._pos = end
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def consume(self, expected: str) -> None:
+        """Consume a single structural character."""
+        if self.peek() != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", self._buf, self._pos)
+        self._pos += 1
+        self.offset += 1
+
+    def decode_value(self) -> Any:
+        """Decode the next complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+                if end < len(self._buf) or self._eof:
+                    consumed = self._buf[self._pos:end]
+                    self.offset += len(consumed) if consumed.isascii() else len(consumed.encode("utf-8"))
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow geometrically so large records are not re-parsed too often
+            self._fill(len(self._buf) - self._pos)
+
+
+def _is_person_record(record: Any) -> bool:
+    """Check whether a value looks like a person record with a name."""
+    return (isinstance(record, dict) and "person" in record and
+            isinstance(record["person"], dict) and "name" in record["person"])
+
+
+def _iter_record_spans(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+    """Yield (record, start_byte, end_byte) for every person record in a JSON file."""
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            reader = _JsonStreamReader(file, chunk_size)
+            first = reader.peek()
+            
+            # Handle single person structure
+            if first != "[":
+                start = reader.offset
+                data = reader.decode_value()
+                if _is_person_record(data):
+                    yield data, start, reader.offset
+                return
+            
+            reader.consume("[")
+            
+            # Handle nested list structure: [[person1, person2, ...]] (first inner list only)
+            if reader.peek() == "[":
+                reader.consume("[")
+                yield from _iter_array_records(reader, check_layout=False)
+            # Handle list of people: [person1, person2, ...]
+            else:
+                yield from _iter_array_records(reader, check_layout=True)
+    except json.JSONDecodeError:
+        raise ValueError("Invalid JSON file format")
+    except OSError as e:
+        raise IOError(f"Error reading file: {str(e)}")
+
+
+def _iter_array_records(reader: _JsonStreamReader, check_layout: bool) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+    """Yield person records from the array the reader is positioned inside."""
+    if reader.peek() == "]":
+        return
+    
+    first = True
+    while True:
+        reader.peek()
+        start = reader.offset
+        item = reader.decode_value()
+        
+        # A flat list only counts as a list of people if its first element is one
+        if first and check_layout and not (isinstance(item, dict) and "person" in item):
+            return
+        first = False
+        
+        if _is_person_record(item):
+            yield item, start, reader.offset
+        
+        separator = reader.peek()
+        if separator == "]":
+            return
+        reader.consume(",")
+
+
 def _extract_names_from_data(data: Any) -> List[str]:
     """Helper function to extract person names from various data formats."""
-    names = []
-    
+    return [record["person"]["name"] for record in _get_record_container(data)
+            if _is_person_record(record)]
+
+
+def _get_record_container(data: Any) -> List[Any]:
+    """Return the list holding person records for any supported data layout."""
     # Handle nested list structure: [[person1, person2, ...]]
     if isinstance(data, list) and len(data) > 0:
-        # If first element is a list, we have a nested list
+        # If first element is a list, we have a nested list (first inner list holds the people)
         if isinstance(data[0], list):
-            for person in data[0]:  # Process first inner list
-                if isinstance(person, dict) and "person" in person and "name" in person["person"]:
-                    names.append(person["person"]["name"])
+            return data[0]
         # If first element is a dict with 'person', we have a list of people
         elif isinstance(data[0], dict) and "person" in data[0]:
-            for person in data:
-                if "name" in person["person"]:
-                    names.append(person["person"]["name"])
+            return data
     
     # Handle single person structure
-    elif isinstance(data, dict) and "person" in data and "name" in data["person"]:
-        names.append(data["person"]["name"])
+    elif _is_person_record(data):
+        return [data]
     
-    return names
+    return []
 
 
-def get_person_data(data: Any, person_name: str) -> Optional[Dict[str, Any]]:
-    """Extract data for a specific person from the dataset."""
-    # Handle nested list structure: [[person1, person2, ...]]
-    if isinstance(data, list) and len(data) > 0:
-        # If first element is a list, we have a nested list
-        if isinstance(data[0], list):
-            for person in data[0]:  # Process first inner list
-                if (isinstance(person, dict) and "person" in person and 
-                    "name" in person["person"] and person["person"]["name"] == person_name):
-                    return person
-        # If first element is a dict with 'person', we have a list of people
-        elif isinstance(data[0], dict) and "person" in data[0]:
-            for person in data:
-                if "name" in person["person"] and person["person"]["name"] == person_name:
-                    return person
+@profiling.profiled()
+def get_person_data(data: Any, person_name: str, index: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+    """Extract data for a specific person from the dataset.
     
-    # Handle single person structure
-    elif (isinstance(data, dict) and "person" in data and 
-          "name" in data["person"] and data["person"]["name"] == person_name):
-        return data
+    When a prebuilt index (e.g. `person_index.PersonIndex`) is given the lookup
+    goes through it instead of scanning the dataset.
+    """
+    if index is not None:
+        return index.get(person_name)
+    
+    for record in _get_record_container(data):
+        if _is_person_record(record) and record["person"]["name"] == person_name:
+            return record
     
     return None
 
 
 def validate_career_data(data: Dict[str, Any]) -> bool:
-    """Validate if data has expected structure for career visualization."""
-    try:
-        # Check if data contains necessary keys
-        if "person" not in data or "career_events" not in data:
-            return False
-        
-        # Check person data format
-        if "name" not in data["person"]:
-            return False
-        
-        # Check if career_events is a list with at least one event
-        if not isinstance(data["career_events"], list) or len(data["career_events"]) == 0:
-            return False
-        
-        # Check if first career event has expected keys
-        first_event = data["career_events"][0]
-        required_keys = ["metatype", "organization", "role", "start_date", "end_date"]
-        
-        if not all(key in first_event for key in required_keys):
-            return False
-            
-        return True
-    except Exception:
-        return False
+    """Validate if data has expected structure for career visualization.
+    
+    Every career event is checked by `validation.validate_records`; the
+    record is usable if it has a name, a list of event objects and at least
+    one event with a parseable date.
+    """
+    import validation
+    
+    return len(validation.validate_records([data])["invalid_people"]) == 0
 
 
-def prepare_timeline_data(data: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, float]]:
-    """Convert career events JSON to DataFrame format for timeline visualization."""
-    events = data["career_events"]
+@profiling.profiled()
+def build_event_table(records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Flatten the career events of many people into one columnar table.
     
-    # Process the events into a list of dictionaries
-    processed_events = []
-    current_year = 2025  # Upper limit for open-ended positions
+    Each row is a raw career event tagged with the position of its person
+    (`person_id`), the person's name and the event's position in their
+    `career_events` list (`event_index`). Entries that are not person records
+    and events that are not objects are skipped but keep their positions, so
+    ids match `PersonIndex` and the validation report.
+    """
+    columns: Dict[str, List[Any]] = {column: [] for column in ["person_id", "person_name", "event_index"] + EVENT_FIELDS}
     
-    for event in events:
-        # Skip events without dates
-        if not event["start_date"] and not event["end_date"]:
-            continue
-            
-        # Use the earliest date available for timeline positioning
-        timeline_date = event["start_date"] if event["start_date"] else event["end_date"]
-        
-        # Try to convert timeline_date to numeric
-        try:
-            timeline_date = float(timeline_date)
-        except ValueError:
-            # Skip events with non-numeric dates
+    for person_id, record in enumerate(records):
+        if not _is_person_record(record):
             continue
-        
-        # Handle end dates - set a reasonable end date for open-ended positions
-        start_date = event["start_date"]
-        end_date = event["end_date"]
-        
-        try:
-            # Convert start and end dates to float if they exist
-            numeric_start = float(start_date) if start_date else timeline_date
-            
-            # For missing end dates, estimate a reasonable duration
-            if not end_date:
-                # If this is current (open-ended), use current year
-                # For visualization purposes, limit to +5 years from start
-                numeric_end = min(numeric_start + 5, current_year)
-            else:
-                numeric_end = float(end_date)
-            
-            # Ensure end is not before start
-            if numeric_end < numeric_start:
-                numeric_end = numeric_start + 1
-        except ValueError:
-            # Handle any conversion errors
-            numeric_start = timeline_date
-            numeric_end = timeline_date + 3  # Default 3-year duration
-            
-        processed_events.append({
-            "metatype": event["metatype"],
-            "organization": event["organization"],
-            "role": event["role"],
-            "timeline_date": timeline_date,
-            "start_date": start_date,
-            "end_date": end_date,
-            "numeric_start": numeric_start,
-            "numeric_end": numeric_end,
-            "is_open_ended": not bool(end_date)
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(processed_events)
-    
-    # Set a standard order for metatypes to ensure consistency across visualizations
-    standard_metatypes = [
-        'academic',
-        'govt',
-        'io',
-        'private',
-        'think_tank',
-        'ngo',
-        'foundation',
-        'honor',
-        'media',
-        'other'
-    ]
-    
-    # Create a sorted list of metatypes in standard order
-    used_metatypes = df["metatype"].unique().tolist()
-    
-    # Sort metatypes according to the standard order
-    sorted_metatypes = [m for m in standard_metatypes if m in used_metatypes]
-    
-    # Add any metatypes not in the standard list at the end
-    for m in used_metatypes:
-        if m not in sorted_metatypes:
-            sorted_metatypes.append(m)
-    
-    # Map metatypes to y-positions based on the sorted list
-    metatype_to_y = {metatype: i for i, metatype in enumerate(sorted_metatypes)}
-    
-    # Add y-position column
-    df["y_pos"] = df["metatype"].map(metatype_to_y)
+        events = record.get("career_events")
+        indexed = [(i, event) for i, event in enumerate(events) if isinstance(event, dict)] if isinstance(events, list) else []
+        name = record["person"]["name"]
+        columns["person_id"].extend([person_id] * len(indexed))
+        columns["person_name"].extend([name] * len(indexed))
+        columns["event_index"].extend(i for i, _ in indexed)
+        for field in EVENT_FIELDS:
+            columns[field].extend([event.get(field) for _, event in indexed])
+    
+    table = pd.DataFrame(columns)
+    table["person_id"] = table["person_id"].astype("int64")
+    table["event_index"] = table["event_index"].astype("int64")
+    return table
+
+
+@profiling.profiled()
+def prepare_timeline_table(records: Union[pd.DataFrame, Iterable[Dict[str, Any]]],
+                           current_year: int = CURRENT_YEAR, sort: bool = True) -> pd.DataFrame:
+    """Prepare timeline positions for the career events of many people at once.
+    
+    Accepts person records or an event table from `build_event_table` and
+    applies the same rules as `prepare_timeline_data` with array operations.
+    Dates are parsed by `dates.parse_date_column` (years, YYYY-MM, YYYY-MM-DD,
+    ranges and "present") into fractional years. Events without any parseable
+    date are dropped. Without an end date, a range or "present" written in
+    the start date supplies the end; other positions without an end date end
+    at min(start + 5, current_year) and those ending "present" at
+    current_year; both are marked open-ended. Unparseable end dates get a 3-year duration
+    and ends before the start are moved to start + 1. `y_pos` follows the
+    standard metatype order computed per person.
+    """
+    table = records if isinstance(records, pd.DataFrame) else build_event_table(records)
+    
+    start_year, start_latest, start_precision = dates.parse_date_column_bounds(table["start_date"])
+    end_year, end_precision = dates.parse_date_column(table["end_date"], "end")
+    
+    # A range ("1990-2005") or "1990-present" in the start date ends the event when end_date is empty
+    ranged = ((end_precision == dates.PRECISION_MISSING) & ~np.isnan(start_year) &
+              ((start_precision == dates.PRECISION_PRESENT) | (start_latest > start_year)))
+    end_year = np.where(ranged, start_latest, end_year)
+    end_precision = np.where(ranged, start_precision, end_precision)
+    
+    # Use the earliest date available for timeline positioning; drop events without one
+    timeline_date = np.where(np.isnan(start_year), end_year, start_year)
+    keep = ~np.isnan(timeline_date)
+    
+    table = table[keep].reset_index(drop=True)
+    numeric_start = timeline_date[keep]
+    end_year, end_precision = end_year[keep], end_precision[keep]
+    no_end = end_precision == dates.PRECISION_MISSING
+    ongoing = end_precision == dates.PRECISION_PRESENT
+    
+    # Open-ended positions are limited to +5 years for visualization, then ends are clamped
+    numeric_end = np.where(no_end, np.minimum(numeric_start + 5, current_year), end_year)
+    numeric_end = np.where(ongoing, current_year, numeric_end)
+    numeric_end = np.where(numeric_end < numeric_start, numeric_start + 1, numeric_end)
+    # End dates that cannot be converted get a default 3-year duration
+    numeric_end = np.where(end_precision == dates.PRECISION_INVALID, numeric_start + 3, numeric_end)
+    
+    table["timeline_date"] = numeric_start
+    table["numeric_start"] = numeric_start
+    table["numeric_end"] = numeric_end
+    table["is_open_ended"] = no_end | ongoing
+    table["start_precision"] = start_precision[keep]
+    table["end_precision"] = end_precision
+    table["y_pos"] = _metatype_positions(table)
+    
+    if sort:
+        table = table.sort_values(by=["person_id", "timeline_date"], kind="stable").reset_index(drop=True)
+    
+    profiling.count("events_prepared", len(table))
+    profiling.count("events_dropped", int((~keep).sum()))
+    return table
+
+
+def _metatype_positions(table: pd.DataFrame) -> np.ndarray:
+    """Compute each event's y-position from the standard metatype order of its person.
+    
+    Metatypes outside the standard list come after it, in order of first appearance.
+    """
+    if len(table) == 0:
+        return np.zeros(0, dtype="int64")
+    
+    standard_rank = table["metatype"].map({metatype: i for i, metatype in enumerate(STANDARD_METATYPES)})
+    first_seen = pd.Series(np.arange(len(table)), index=table.index).groupby(
+        [table["person_id"], table["metatype"]], dropna=False, sort=False).transform("min")
+    order_key = standard_rank.fillna(len(STANDARD_METATYPES) + first_seen)
+    
+    positions = order_key.groupby(table["person_id"], sort=False).rank(method="dense") - 1
+    return positions.to_numpy(dtype="int64")
+
+
+def metatype_positions_for(df: pd.DataFrame) -> Dict[str, int]:
+    """Return the metatype-to-y mapping for the events of a single person."""
+    pairs = df[["y_pos", "metatype"]].drop_duplicates().sort_values("y_pos")
+    return {metatype: int(y_pos) for y_pos, metatype in zip(pairs["y_pos"], pairs["metatype"])}
+
+
+@profiling.profiled()
+def prepare_timeline_data(data: Dict[str, Any], current_year: int = CURRENT_YEAR) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """Convert career events JSON to DataFrame format for timeline visualization."""
+    table = prepare_timeline_table([data], current_year=current_year, sort=False)
+    
+    metatype_to_y = metatype_positions_for(table)
     
     # Sort by timeline date
-    df_sorted = df.sort_values(by="timeline_date").reset_index(drop=True)
+    df_sorted = table[TIMELINE_COLUMNS].sort_values(by="timeline_date").reset_index(drop=True)
+
+    return df_sorted, metatype_to_y
+
+
+def has_known_end(df: pd.DataFrame) -> np.ndarray:
+    """Return which events have a real end date (not open-ended, "present" or unparseable)."""
+    known = np.ones(len(df), dtype=bool)
+    if "is_open_ended" in df.columns:
+        known &= ~df["is_open_ended"].fillna(False).to_numpy(dtype=bool)
+    if "end_precision" in df.columns:
+        known &= (df["end_precision"] != dates.PRECISION_INVALID).to_numpy(dtype=bool)
+    return known
+
+
+def event_durations(df: pd.DataFrame, min_years: float = 1.0) -> np.ndarray:
+    """Compute the years spent in each event of a prepared timeline table.
+
+    Events with a known end last numeric_end - numeric_start, but at least
+    `min_years` (events starting and ending in the same year count as one
+    year by default). Events without a known end count as `min_years`. Works
+    on a single person's table or the whole corpus.
+    """
+    span = df["numeric_end"].to_numpy(dtype="float64") - df["numeric_start"].to_numpy(dtype="float64")
+    return np.where(has_known_end(df), np.maximum(span, min_years), min_years)
+
+
+def years_by_metatype(df: pd.DataFrame, by: Optional[str] = None) -> Union[pd.Series, pd.DataFrame]:
+    """Total years spent in each metatype, optionally per value of another column (e.g. person_id)."""
+    durations = pd.Series(event_durations(df), index=df.index)
+    if by is None:
+        return durations.groupby(df["metatype"]).sum()
+    return durations.groupby([df[by], df["metatype"]]).sum().unstack(fill_value=0.0)
+
+
+def hlp_memberships(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return a person's High-Level Panel memberships, earliest first.
+    
+    Uses the `hlp_memberships` list written by `hlp_enrichment`, or the single
+    `hlp`/`hlp_year` pair of older datasets.
+    """
+    memberships = metadata.get("hlp_memberships")
+    if memberships is None:
+        memberships = [{"hlp": metadata["hlp"], "hlp_year": metadata.get("hlp_year")}] if metadata.get("hlp") else []
+    return [{"hlp": m.get("hlp"), "hlp_year": m.get("hlp_year")} for m in memberships if isinstance(m, dict)]
+
+
+def _person_row(person_id: int, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a person record as one row of the people table."""
+    metadata = record["person"].get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = {}
+    return {
+        "person_id": person_id,
+        "name": record["person"]["name"],
+        "nationality": metadata.get("nationality"),
+        "gender": metadata.get("gender"),
+        "hlp": metadata.get("hlp"),
+        "hlp_year": metadata.get("hlp_year"),
+        "hlp_memberships": hlp_memberships(metadata)
+    }
+
+
+@profiling.profiled()
+def prepare_corpus(records: Iterable[Dict[str, Any]],
+                   current_year: int = CURRENT_YEAR) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Prepare the timeline table and the people table of a corpus in one pass over the records.
+    
+    Both tables share `person_id`, so streamed records never need to be read twice.
+    Entries that are not person records are left out of both tables.
+    """
+    people_rows: List[Dict[str, Any]] = []
+    
+    def collect_people() -> Iterator[Dict[str, Any]]:
+        for person_id, record in enumerate(records):
+            if _is_person_record(record):
+                people_rows.append(_person_row(person_id, record))
+            yield record
+    
+    events = prepare_timeline_table(collect_people(), current_year=current_year)
+    
+    people = pd.DataFrame(people_rows, columns=PEOPLE_COLUMNS)
+    people["hlp_year"] = pd.to_numeric(people["hlp_year"], errors="coerce")
+    
+    return events, people
+
+
+def panel_memberships(people: pd.DataFrame) -> pd.DataFrame:
+    """Return one row per (person_id, hlp, hlp_year) panel membership of the people table."""
+    rows = [(person_id, m["hlp"], m["hlp_year"])
+            for person_id, memberships in zip(people["person_id"], people["hlp_memberships"])
+            for m in memberships or [] if m.get("hlp")]
+    table = pd.DataFrame(rows, columns=["person_id", "hlp", "hlp_year"])
+    table["person_id"] = table["person_id"].astype("int64")
+    table["hlp_year"] = pd.to_numeric(table["hlp_year"], errors="coerce")
+    return table
+
+
+def hlp_panels(people: pd.DataFrame) -> List[str]:
+    """List the High-Level Panels anyone in the people table belonged to."""
+    return sorted(panel_memberships(people)["hlp"].unique())
+
+
+def panel_people(people: pd.DataFrame, panel: str) -> pd.DataFrame:
+    """Return the members of one panel, with `hlp` and `hlp_year` set to that membership.
+    
+    People on several panels are aligned on the year of the selected one.
+    """
+    memberships = panel_memberships(people)
+    members = memberships[memberships["hlp"] == panel].drop_duplicates("person_id")
+    return people.drop(columns=["hlp", "hlp_year"]).merge(members, on="person_id")[PEOPLE_COLUMNS]
+
+
+def align_to_hlp(events: pd.DataFrame, people: pd.DataFrame, drop_unaligned: bool = True) -> pd.DataFrame:
+    """Add event times relative to each person's HLP appointment year.
     
-    return df_sorted, metatype_to_y
\ No newline at end of file
+    Adds `hlp_year`, `rel_start`, `rel_end` and `rel_timeline` columns. Events of
+    people without a numeric `hlp_year` are dropped unless `drop_unaligned` is false.
+    """
+    hlp_year = events["person_id"].map(people.set_index("person_id")["hlp_year"])
+    aligned = events.assign(
+        hlp_year=hlp_year,
+        rel_start=events["numeric_start"] - hlp_year,
+        rel_end=events["numeric_end"] - hlp_year,
+        rel_timeline=events["timeline_date"] - hlp_year
+    )
+    if drop_unaligned:
+        aligned = aligned[hlp_year.notna().to_numpy()]
+    return aligned
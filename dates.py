@@ -0,0 +1,124 @@
+import calendar
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from typing import Tuple, Any
+
+
+# Precision flags of parsed dates
+PRECISION_DAY = "day"
+PRECISION_MONTH = "month"
+PRECISION_YEAR = "year"
+PRECISION_PRESENT = "present"
+PRECISION_MISSING = ""
+PRECISION_INVALID = "invalid"
+
+PRESENT_VALUES = {"present", "current", "ongoing", "now", "today", "to date", "to present"}
+
+_DATE = re.compile(r"^(\d{4})(?:[-/](\d{1,2})(?:[-/](\d{1,2}))?)?$")
+# Years written with fewer digits ("800") or as decimals ("1999.0", "1999.5"); nothing else passes as a bare number
+_NUMERIC_YEAR = re.compile(r"^\d{1,4}(?:\.\d+)?$")
+# Range separators: en/em dashes, "to", "..", or a hyphen before a four-digit year or a word
+_RANGE = re.compile(r"^(.+?)\s*(?:–|—|\.\.|\bto\b|\s-\s|-(?=\d{4}\b|[a-z]))\s*(.+)$", re.IGNORECASE)
+
+_MISSING = (np.nan, np.nan, PRECISION_MISSING)
+_INVALID = (np.nan, np.nan, PRECISION_INVALID)
+_PRESENT = (np.nan, np.nan, PRECISION_PRESENT)
+
+
+def _parse_point(text: str) -> Tuple[float, str]:
+    """Parse a single YYYY, YYYY-MM or YYYY-MM-DD date into a fractional year and precision."""
+    match = _DATE.match(text)
+    if match is None:
+        # "nan", "inf" or "1e3" must not become years
+        if _NUMERIC_YEAR.match(text):
+            return float(text), PRECISION_YEAR
+        return np.nan, PRECISION_INVALID
+
+    year, month, day = match.groups()
+    year = int(year)
+    if month is None:
+        return float(year), PRECISION_YEAR
+
+    month = int(month)
+    if not 1 <= month <= 12:
+        return np.nan, PRECISION_INVALID
+    if day is None:
+        return year + (month - 1) / 12, PRECISION_MONTH
+
+    day = int(day)
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return np.nan, PRECISION_INVALID
+    day_of_year = sum(calendar.monthrange(year, m)[1] for m in range(1, month)) + day - 1
+    return year + day_of_year / (366 if calendar.isleap(year) else 365), PRECISION_DAY
+
+
+@lru_cache(maxsize=65536)
+def parse_partial_date(value: str) -> Tuple[float, float, str]:
+    """Parse a date string into (earliest, latest, precision) in fractional years.
+
+    Accepts YYYY, YYYY-MM, YYYY-MM-DD, shorter or decimal years ("800",
+    "1999.0"), ranges of those ("1990-1995",
+    "2001 to 2003-06") and "present"-style values. A single date has equal
+    earliest and latest values; "present" parses to NaN with the "present"
+    precision. The precision of a range is that of its coarser bound.
+    Results are memoized, since the same dates recur across events.
+    """
+    text = value.strip()
+    if not text:
+        return _MISSING
+    if text.casefold() in PRESENT_VALUES:
+        return _PRESENT
+
+    point, precision = _parse_point(text)
+    if precision != PRECISION_INVALID:
+        return point, point, precision
+
+    match = _RANGE.match(text)
+    if match is None:
+        return _INVALID
+    first, first_precision = _parse_point(match.group(1))
+    if match.group(2).strip().casefold() in PRESENT_VALUES:
+        return (first, np.nan, PRECISION_PRESENT) if first_precision != PRECISION_INVALID else _INVALID
+    last, last_precision = _parse_point(match.group(2))
+    if PRECISION_INVALID in (first_precision, last_precision) or last < first:
+        return _INVALID
+    coarsest = max((first_precision, last_precision),
+                   key=[PRECISION_DAY, PRECISION_MONTH, PRECISION_YEAR].index)
+    return first, last, coarsest
+
+
+def _parse_value(value: Any) -> Tuple[float, float, str]:
+    """Parse a raw JSON date value, which may also be a number or null."""
+    if isinstance(value, str):
+        return parse_partial_date(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value):
+        return float(value), float(value), PRECISION_YEAR
+    return _MISSING
+
+
+def parse_date_column(values: pd.Series, bound: str = "start") -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a column of raw date values into fractional years and precision flags.
+
+    `bound` picks the earliest ("start") or latest ("end") year of ranges.
+    Each distinct value is parsed once and the results are broadcast back
+    with an integer take, so columns with millions of repeated dates parse
+    in time proportional to the number of distinct values.
+    """
+    if bound not in ("start", "end"):
+        raise ValueError(f"Unknown date bound: {bound}")
+    earliest, latest, precision = parse_date_column_bounds(values)
+    return (earliest if bound == "start" else latest), precision
+
+
+def parse_date_column_bounds(values: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a column of raw date values into earliest and latest fractional years and precision flags."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = [_parse_value(value) for value in uniques]
+
+    # The extra last slot holds the result for missing values (code -1)
+    earliest = np.array([p[0] for p in parsed] + [np.nan], dtype="float64")
+    latest = np.array([p[1] for p in parsed] + [np.nan], dtype="float64")
+    precision = np.array([p[2] for p in parsed] + [PRECISION_MISSING], dtype=object)
+    return earliest[codes], latest[codes], precision[codes]
@@ -0,0 +1,295 @@
+"""Columnar on-disk cache of the prepared people and event tables.
+
+Converts a career-trajectory JSON dataset into an Arrow IPC or Parquet file
+that later loads memory-map instead of re-parsing the JSON:
+
+    python -m event_store data/career_trajectories_03_dates_normalized_with_hlp.json
+
+The file is keyed by the content hash of the source JSON, so a stale cache is
+ignored. Requires the optional `pyarrow` package.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional, Callable, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+import data_processing as dp
+
+
+EVENT_STORE_VERSION = 2
+EVENT_STORE_SUFFIXES = {"arrow": ".events.arrow", "parquet": ".events.parquet"}
+METADATA_KEY = b"event_store"
+
+# Low-cardinality string columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = ["metatype", "type", "organization", "start_precision", "end_precision"]
+# Raw JSON fields that may mix strings and numbers (e.g. "end_date": 1992), stored as strings
+TEXT_COLUMNS = ["person_name"] + [field for field in dp.EVENT_FIELDS if field != "tags"]
+# People per record batch (Arrow) or row group (Parquet), the unit read for a single person
+PEOPLE_PER_BATCH = 256
+
+
+def pyarrow_available() -> bool:
+    """Return whether the optional pyarrow dependency is installed."""
+    return pa is not None
+
+
+def event_store_path_for(json_path: str, format: str = "arrow") -> str:
+    """Return the default event store path for a JSON dataset."""
+    return json_path + EVENT_STORE_SUFFIXES[format]
+
+
+def _format_of(path: str) -> str:
+    """Infer the store format from a file name."""
+    return "parquet" if path.endswith(".parquet") else "arrow"
+
+
+def _to_arrow(events: pd.DataFrame) -> "pa.Table":
+    """Convert the event table to Arrow with dictionary-encoded categories and list-typed tags.
+
+    Raw text columns are stored as strings (nulls stay null), since Arrow
+    needs one type per column.
+    """
+    events = events.assign(tags=[[str(tag) for tag in tags] if isinstance(tags, (list, tuple)) else []
+                                 for tags in events["tags"]])
+    for column in TEXT_COLUMNS:
+        if column in events.columns:
+            events[column] = events[column].astype("string")
+    # One chunk per column, so every written batch holds exactly the intended rows
+    table = pa.Table.from_pandas(events, preserve_index=False).combine_chunks()
+    for column in CATEGORICAL_COLUMNS:
+        if column in table.column_names:
+            i = table.column_names.index(column)
+            table = table.set_column(i, column, pc.dictionary_encode(table[column]))
+    return table
+
+
+def _batch_bounds(person_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split rows sorted by person into batches of PEOPLE_PER_BATCH people.
+
+    Returns the first row and first person id of every batch.
+    """
+    if len(person_ids) == 0:
+        return np.zeros(0, dtype="int64"), np.zeros(0, dtype="int64")
+    person_starts = np.flatnonzero(np.r_[True, person_ids[1:] != person_ids[:-1]])
+    batch_starts = person_starts[::PEOPLE_PER_BATCH]
+    return batch_starts, person_ids[batch_starts]
+
+
+def write_event_store(events: pd.DataFrame, people: pd.DataFrame, path: str,
+                      source: Optional[Dict[str, Any]] = None, format: Optional[str] = None) -> None:
+    """Write the prepared event and people tables to an Arrow IPC or Parquet file, atomically.
+
+    Events are stored sorted by person, in batches of whole people, so a
+    single person's events can be read without touching the rest. The
+    people table and the `source` key travel in the schema metadata.
+    """
+    if pa is None:
+        raise ImportError("Writing an event store requires pyarrow (pip install pyarrow)")
+    format = format or _format_of(path)
+
+    events = events.sort_values(["person_id", "timeline_date"], kind="stable").reset_index(drop=True)
+    table = _to_arrow(events)
+    batch_starts, batch_people = _batch_bounds(events["person_id"].to_numpy())
+
+    metadata = {
+        "version": EVENT_STORE_VERSION,
+        "source": source or {},
+        "batch_people": batch_people.tolist(),
+        "people": json.loads(people.to_json(orient="split", index=False))
+    }
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata, ensure_ascii=False)})
+    bounds = list(batch_starts) + [len(events)]
+
+    temp_path = f"{path}.tmp"
+    if format == "parquet":
+        with pq.ParquetWriter(temp_path, table.schema) as writer:
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                writer.write_table(table.slice(start, end - start), row_group_size=end - start)
+    else:
+        with pa.OSFile(temp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                writer.write_table(table.slice(start, end - start), max_chunksize=end - start)
+    os.replace(temp_path, path)
+
+
+class EventStore:
+    """Read access to an event store written by `write_event_store`.
+
+    The file is memory-mapped; `events` reads only the requested columns and
+    `person_events` only the batch holding that person.
+    """
+
+    def __init__(self, path: str):
+        if pa is None:
+            raise ImportError("Reading an event store requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.format = _format_of(path)
+        if self.format == "parquet":
+            self._file = pq.ParquetFile(path, memory_map=True)
+            schema = self._file.schema_arrow
+        else:
+            self._source = pa.memory_map(path, "r")
+            self._file = ipc.open_file(self._source)
+            schema = self._file.schema
+
+        metadata = json.loads(schema.metadata[METADATA_KEY])
+        self.version = metadata["version"]
+        self.source = metadata["source"]
+        self._batch_people = np.asarray(metadata["batch_people"], dtype="int64")
+        people = metadata["people"]
+        self.people = pd.DataFrame(people["data"], columns=people["columns"])
+        if "hlp_year" in self.people.columns:
+            self.people["hlp_year"] = pd.to_numeric(self.people["hlp_year"], errors="coerce")
+        self.columns = schema.names
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if self.format == "parquet":
+            self._file.close()
+        else:
+            self._source.close()
+
+    def _read(self, columns: Optional[List[str]], batch: Optional[int] = None) -> "pa.Table":
+        """Read all batches, or one, restricted to the given columns."""
+        if self.format == "parquet":
+            if batch is None:
+                return self._file.read(columns=columns)
+            return self._file.read_row_group(batch, columns=columns)
+
+        if batch is None:
+            table = self._file.read_all()
+        else:
+            table = pa.Table.from_batches([self._file.get_batch(batch)])
+        return table.select(columns) if columns is not None else table
+
+    def events(self, columns: Optional[List[str]] = None, categorical: bool = False) -> pd.DataFrame:
+        """Return the event table, or some of its columns.
+
+        Dictionary-encoded columns are returned as plain strings unless
+        `categorical` is set, in which case they become pandas categoricals.
+        """
+        return _to_pandas(self._read(columns), categorical)
+
+    def person_events(self, person_id: int, columns: Optional[List[str]] = None,
+                      categorical: bool = False) -> pd.DataFrame:
+        """Return the events of one person, reading only the batch that holds them."""
+        if len(self._batch_people) == 0:
+            return self.events(columns, categorical).iloc[0:0]
+        batch = max(int(np.searchsorted(self._batch_people, person_id, side="right")) - 1, 0)
+        read_columns = columns if columns is None or "person_id" in columns else columns + ["person_id"]
+        table = self._read(read_columns, batch)
+        table = table.filter(pc.equal(table["person_id"], person_id))
+        if columns is not None:
+            table = table.select(columns)
+        return _to_pandas(table, categorical)
+
+
+def _to_pandas(table: "pa.Table", categorical: bool) -> pd.DataFrame:
+    """Convert an Arrow table to the DataFrame layout of `data_processing.prepare_corpus`."""
+    if not categorical:
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(i, field.name, table[field.name].cast(field.type.value_type))
+    frame = table.to_pandas()
+    # List columns arrive as NumPy arrays; the rest of the code expects Python lists
+    if "tags" in table.column_names:
+        frame["tags"] = table["tags"].to_pylist()
+    return frame
+
+
+def open_event_store(path: str, source: Optional[Dict[str, Any]] = None) -> Optional[EventStore]:
+    """Open an event store if pyarrow is available and the file is current.
+
+    Returns None if pyarrow is missing, the file is missing or unreadable,
+    was written by another version, or does not match the expected `source`.
+    """
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        store = EventStore(path)
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+    if store.version != EVENT_STORE_VERSION or (source is not None and store.source != source):
+        store.close()
+        return None
+    return store
+
+
+def load_or_build_corpus(cache_path: Optional[str], source: Dict[str, Any],
+                         records: Callable[[], Iterable[Dict[str, Any]]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load the prepared corpus from a current event store, or prepare it and write the store.
+
+    Without pyarrow or a cache path this is `data_processing.prepare_corpus`.
+    """
+    store = open_event_store(cache_path, source) if cache_path else None
+    if store is not None:
+        with store:
+            return store.events(), store.people
+
+    events, people = dp.prepare_corpus(records())
+    if cache_path and pyarrow_available():
+        try:
+            write_event_store(events, people, cache_path, source)
+        except OSError:
+            # A read-only location only costs a rebuild next time
+            pass
+    return events, people
+
+
+def convert(json_path: str, output_path: Optional[str] = None, format: str = "arrow") -> Dict[str, Any]:
+    """Convert a JSON dataset to an event store and return a summary."""
+    from sidecar_index import content_hash
+
+    output_path = output_path or event_store_path_for(json_path, format)
+    started = time.perf_counter()
+    source = {"content_hash": content_hash(json_path)}
+    events, people = dp.prepare_corpus(dp.iter_person_records(json_path))
+    write_event_store(events, people, output_path, source, format)
+    return {
+        "path": output_path,
+        "people": len(people),
+        "events": len(events),
+        "bytes": os.path.getsize(output_path),
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Convert a career trajectory dataset to a columnar event store.")
+    parser.add_argument("dataset", help="Career trajectory JSON file")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output file (default: <dataset>.events.arrow or .events.parquet)")
+    parser.add_argument("-f", "--format", choices=sorted(EVENT_STORE_SUFFIXES), default="arrow",
+                        help="Arrow IPC (memory-mapped, default) or Parquet (smaller)")
+    args = parser.parse_args(argv)
+
+    if not pyarrow_available():
+        parser.error("pyarrow is required (pip install pyarrow)")
+
+    summary = convert(args.dataset, args.output, args.format)
+    print(f"{summary['people']} people, {summary['events']} events -> {summary['path']} "
+          f"({summary['bytes'] / 1024:.0f} KiB) in {summary['elapsed_seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
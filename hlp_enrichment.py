@@ -0,0 +1,223 @@
+"""Add High-Level Panel memberships to the people of a career-trajectory dataset.
+
+Joins every person against a panel table (CSV with the columns name, hlp,
+hlp_year and optionally aliases, separated by ";") through normalized names,
+so spelling, case and diacritic differences still match:
+
+    python -m hlp_enrichment data/career_trajectories_03_dates_normalized.json \\
+        data/career_trajectories_03_dates_normalized_with_hlp.json --panels data/hlp_panels.csv
+
+People are streamed from input to output one record at a time. Matched
+records get an `hlp_memberships` list in their metadata, with `hlp` and
+`hlp_year` set to the earliest membership; everything else in the file is
+copied byte for byte.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple, Any, Optional, BinaryIO
+
+import pandas as pd
+
+import data_processing as dp
+from person_index import DEFAULT_ALIASES, PersonIndex, normalize_name
+
+
+DEFAULT_PANELS_PATH = os.path.join("data", "hlp_panels.csv")
+
+# Names of unmatched people kept for the summary
+MAX_REPORTED_NAMES = 20
+
+
+def _year(value: Any) -> Optional[int]:
+    """Parse a panel year, or None if it is missing."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class PanelIndex:
+    """Panel memberships keyed by normalized name and alias.
+
+    Several rows for one person (e.g. Jean-Michel Severino on the 2007 and
+    2012 panels) become several memberships instead of overwriting each other.
+    """
+
+    def __init__(self, panels: pd.DataFrame, aliases: Optional[Dict[str, str]] = None):
+        aliases = dict(DEFAULT_ALIASES if aliases is None else aliases)
+        if "aliases" in panels.columns:
+            for name, extra in zip(panels["name"], panels["aliases"]):
+                for alias in str(extra or "").split(";"):
+                    if alias.strip():
+                        aliases[alias.strip()] = name
+        alias_groups = PersonIndex._build_alias_groups(aliases)
+
+        memberships: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._names: Dict[str, str] = {}
+        for name, hlp, hlp_year in zip(panels["name"], panels["hlp"], panels["hlp_year"]):
+            key = normalize_name(name)
+            membership = {"hlp": hlp, "hlp_year": _year(hlp_year)}
+            if membership not in memberships[key]:
+                memberships[key].append(membership)
+            self._names.setdefault(key, name)
+
+        # Every spelling of a person resolves to the memberships of all of them
+        self._memberships: Dict[str, List[Dict[str, Any]]] = {}
+        self._groups: Dict[str, int] = {}
+        group_id = 0
+        for key in list(memberships):
+            if key in self._groups:
+                continue
+            group = alias_groups.get(key, {key})
+            merged = [m for k in sorted(group) for m in memberships.get(k, [])]
+            merged = [m for i, m in enumerate(merged) if m not in merged[:i]]
+            merged.sort(key=lambda m: (m["hlp_year"] is None, m["hlp_year"] or 0, m["hlp"]))
+            for k in group:
+                self._memberships[k] = merged
+                self._groups[k] = group_id
+            group_id += 1
+        self._panel_keys = list(memberships)
+
+    @classmethod
+    def from_csv(cls, path: str, aliases: Optional[Dict[str, str]] = None) -> "PanelIndex":
+        """Load a panel table from a CSV file."""
+        panels = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8")
+        missing = {"name", "hlp", "hlp_year"} - set(panels.columns)
+        if missing:
+            raise ValueError(f"Panel table is missing column(s): {', '.join(sorted(missing))}")
+        return cls(panels, aliases)
+
+    def __len__(self) -> int:
+        return len(self._panel_keys)
+
+    def memberships(self, name: str) -> List[Dict[str, Any]]:
+        """Return the panel memberships of a person, earliest first."""
+        return [dict(m) for m in self._memberships.get(normalize_name(name), [])]
+
+    def group(self, name: str) -> Optional[int]:
+        """Return an id shared by all spellings of a person in the panel table, or None."""
+        return self._groups.get(normalize_name(name))
+
+    def unmatched(self, matched_groups: set) -> List[str]:
+        """Names in the panel table none of whose spellings were matched."""
+        return sorted(self._names[key] for key in self._panel_keys if self._groups[key] not in matched_groups)
+
+
+def enrich_record(record: Dict[str, Any], index: PanelIndex) -> Tuple[bool, bool]:
+    """Add panel memberships to a person record in place.
+
+    Returns (matched, changed). Unmatched records are left untouched.
+    """
+    memberships = index.memberships(record["person"]["name"])
+    if not memberships:
+        return False, False
+
+    metadata = record["person"].get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = record["person"]["metadata"] = {}
+    before = (metadata.get("hlp"), metadata.get("hlp_year"), metadata.get("hlp_memberships"))
+    metadata["hlp"] = memberships[0]["hlp"]
+    metadata["hlp_year"] = memberships[0]["hlp_year"]
+    metadata["hlp_memberships"] = memberships
+    return True, before != (metadata["hlp"], metadata["hlp_year"], metadata["hlp_memberships"])
+
+
+def _copy_bytes(source: BinaryIO, output: BinaryIO, start: int, end: int) -> None:
+    """Copy source[start:end] to the output in bounded chunks."""
+    source.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = source.read(min(remaining, dp.STREAM_CHUNK_SIZE))
+        if not chunk:
+            break
+        output.write(chunk)
+        remaining -= len(chunk)
+
+
+def _line_indent(source: BinaryIO, position: int) -> str:
+    """Return the whitespace between the start of the line and `position`."""
+    start = max(0, position - 256)
+    source.seek(start)
+    prefix = source.read(position - start)
+    line = prefix[prefix.rfind(b"\n") + 1:]
+    return line.decode("ascii") if line.isspace() else ""
+
+
+def enrich_dataset(input_path: str, output_path: str, index: PanelIndex,
+                   indent: Optional[int] = 2) -> Dict[str, Any]:
+    """Stream a dataset to `output_path`, adding panel memberships, and return a summary.
+
+    Only records whose metadata changes are re-serialized (with `indent`,
+    at the indentation of the original record); all other bytes are copied
+    unchanged, so memory use does not depend on the size of the dataset.
+    The output is written atomically and may be the input file itself.
+    """
+    started = time.perf_counter()
+    counts = {"people": 0, "matched": 0, "updated": 0}
+    unmatched_people: List[str] = []
+    matched_groups = set()
+
+    temp_path = f"{output_path}.tmp"
+    with open(input_path, "rb") as source, open(temp_path, "wb") as output:
+        position = 0
+        for record, start, end in dp._iter_record_spans(input_path):
+            counts["people"] += 1
+            matched, changed = enrich_record(record, index)
+            if matched:
+                counts["matched"] += 1
+                matched_groups.add(index.group(record["person"]["name"]))
+            elif len(unmatched_people) < MAX_REPORTED_NAMES:
+                unmatched_people.append(record["person"]["name"])
+
+            _copy_bytes(source, output, position, start)
+            if changed:
+                counts["updated"] += 1
+                text = json.dumps(record, indent=indent)
+                if indent is not None:
+                    text = text.replace("\n", "\n" + _line_indent(source, start))
+                output.write(text.encode("utf-8"))
+            else:
+                _copy_bytes(source, output, start, end)
+            position = end
+        _copy_bytes(source, output, position, os.path.getsize(input_path))
+    os.replace(temp_path, output_path)
+
+    return {
+        "output": output_path,
+        **counts,
+        "unmatched": counts["people"] - counts["matched"],
+        "unmatched_people": unmatched_people,
+        "unused_panel_members": index.unmatched(matched_groups),
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Add High-Level Panel memberships to a career trajectory dataset.")
+    parser.add_argument("dataset", help="Career trajectory JSON file")
+    parser.add_argument("output", help="Output JSON file (may be the dataset itself)")
+    parser.add_argument("-p", "--panels", default=DEFAULT_PANELS_PATH,
+                        help=f"Panel table CSV with name, hlp, hlp_year and aliases columns (default: {DEFAULT_PANELS_PATH})")
+    parser.add_argument("--indent", type=int, default=2,
+                        help="Indentation of rewritten records, 0 for compact (default: 2)")
+    args = parser.parse_args(argv)
+
+    index = PanelIndex.from_csv(args.panels)
+    summary = enrich_dataset(args.dataset, args.output, index, args.indent or None)
+
+    print(f"{summary['people']} people: {summary['matched']} matched, {summary['updated']} updated, "
+          f"{summary['unmatched']} unmatched in {summary['elapsed_seconds']:.2f}s -> {summary['output']}")
+    if summary["unmatched_people"]:
+        print("Not in the panel table: " + ", ".join(summary["unmatched_people"]))
+    if summary["unused_panel_members"]:
+        print("Not in the dataset: " + ", ".join(summary["unused_panel_members"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Union
+
+import data_processing as dp
+
+
+# Subtrees at or below this level (up to 255 events) are scanned with one array
+# operation instead of descended node by node
+_SCAN_LEVEL = 7
+
+
+def _build_max_ends(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Augment start-sorted intervals with subtree max-ends of an implicit binary tree.
+
+    Node i at level k sits at an index whose lowest k bits are set; its children
+    are at i - 2**(k-1) and i + 2**(k-1). Each level is computed in one array
+    operation. Returns the max-end array and the level of the root.
+    """
+    n = len(ends)
+    max_ends = ends.copy()
+    if n == 0:
+        return max_ends, 0
+
+    # Track the max-end of the last (possibly incomplete) subtree for missing right children
+    last_i = n - 1 if (n - 1) % 2 == 0 else n - 2
+    last = max_ends[last_i]
+
+    k = 1
+    while (1 << k) <= n:
+        x = 1 << (k - 1)
+        nodes = np.arange((x << 1) - 1, n, x << 2)
+        if len(nodes):
+            left = max_ends[nodes - x]
+            right_nodes = nodes + x
+            right = np.where(right_nodes < n, max_ends[np.minimum(right_nodes, n - 1)], last)
+            max_ends[nodes] = np.maximum(np.maximum(ends[nodes], left), right)
+        last_i = last_i if (last_i >> k) & 1 else last_i + x
+        if last_i < n and max_ends[last_i] > last:
+            last = max_ends[last_i]
+        k += 1
+
+    return max_ends, k - 1
+
+
+class EventIntervalIndex:
+    """Interval index over the `numeric_start`/`numeric_end` spans of a corpus of events.
+
+    Events are sorted by start and laid out as an implicit augmented interval
+    tree, so stabbing and overlap queries take O(log n + k) time for k
+    matches. Intervals are closed: an event is active in year X when
+    numeric_start <= X <= numeric_end; events missing either bound match
+    nothing. `active_in_years` answers calendar-year questions the way the
+    other views do. Results can be filtered by metatype, event `type` and tags.
+    """
+
+    def __init__(self, events: pd.DataFrame):
+        self.events = events.reset_index(drop=True)
+
+        starts = self.events["numeric_start"].to_numpy(dtype="float64")
+        ends = self.events["numeric_end"].to_numpy(dtype="float64")
+        # Undated events match no query; left in the tree, their NaN ends would poison the max-ends
+        dated = np.flatnonzero(~(np.isnan(starts) | np.isnan(ends)))
+        self._order = dated[np.argsort(starts[dated], kind="stable")]
+        self._starts = starts[self._order]
+        self._ends = ends[self._order]
+        self._max_ends, self._max_level = _build_max_ends(self._starts, self._ends)
+
+        # Filters work on integer codes aligned with the event rows
+        self._metatype_codes, metatypes = pd.factorize(self.events["metatype"])
+        self._metatype_lookup = {value: code for code, value in enumerate(metatypes)}
+        if "type" in self.events.columns:
+            self._type_codes, types = pd.factorize(self.events["type"])
+            self._type_lookup = {value: code for code, value in enumerate(types)}
+        else:
+            self._type_codes, self._type_lookup = np.full(len(self.events), -1), {}
+
+        tag_rows: Dict[str, List[int]] = {}
+        if "tags" in self.events.columns:
+            for row, tags in enumerate(self.events["tags"]):
+                for tag in tags if isinstance(tags, (list, tuple)) else ():
+                    tag_rows.setdefault(tag, []).append(row)
+        self._tag_rows = {tag: np.asarray(rows, dtype="int64") for tag, rows in tag_rows.items()}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "EventIntervalIndex":
+        """Build an index from person records."""
+        return cls(dp.prepare_timeline_table(records))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def metatypes(self) -> List[str]:
+        return list(self._metatype_lookup)
+
+    @property
+    def types(self) -> List[str]:
+        return [t for t in self._type_lookup if isinstance(t, str)]
+
+    @property
+    def tags(self) -> List[str]:
+        return sorted(self._tag_rows)
+
+    @property
+    def year_range(self) -> Tuple[float, float]:
+        """Return the earliest start and latest end in the index."""
+        if len(self._starts) == 0:
+            return (np.nan, np.nan)
+        return float(self._starts[0]), float(self._max_ends.max())
+
+    def _overlapping_positions(self, lo: float, hi: float) -> np.ndarray:
+        """Return sorted-order positions of intervals overlapping [lo, hi]."""
+        n = len(self._starts)
+        if n == 0 or hi < lo:
+            return np.zeros(0, dtype="int64")
+
+        starts, ends, max_ends = self._starts, self._ends, self._max_ends
+        found: List[np.ndarray] = []
+        # Stack of (level, node index, left subtree done)
+        stack = [(self._max_level, (1 << self._max_level) - 1, False)]
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= _SCAN_LEVEL:
+                # Small subtree: scan it in one vectorized step
+                i0 = x >> k << k
+                i1 = min(i0 + (1 << (k + 1)) - 1, n)
+                if i0 < i1:
+                    hits = np.nonzero((starts[i0:i1] <= hi) & (ends[i0:i1] >= lo))[0]
+                    if len(hits):
+                        found.append(hits + i0)
+            elif not left_done:
+                stack.append((k, x, True))
+                y = x - (1 << (k - 1))
+                # The left subtree can only match if something in it ends after lo
+                if y >= n or max_ends[y] >= lo:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] <= hi:
+                if ends[x] >= lo:
+                    found.append(np.array([x]))
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+
+        if not found:
+            return np.zeros(0, dtype="int64")
+        return np.sort(np.concatenate(found))
+
+    def overlap(self, start: float, end: float, metatype: Union[str, Iterable[str], None] = None,
+                type: Union[str, Iterable[str], None] = None,
+                tags: Union[str, Iterable[str], None] = None) -> np.ndarray:
+        """Return row ids of events whose span overlaps [start, end], after filters.
+
+        `metatype` and `type` accept one value or several (any may match);
+        `tags` requires every given tag to be present.
+        """
+        rows = self._order[self._overlapping_positions(start, end)]
+        rows = self._filter_codes(rows, self._metatype_codes, self._metatype_lookup, metatype)
+        rows = self._filter_codes(rows, self._type_codes, self._type_lookup, type)
+        for tag in _as_list(tags):
+            rows = rows[np.isin(rows, self._tag_rows.get(tag, np.zeros(0, dtype="int64")))]
+        return np.sort(rows)
+
+    def stab(self, year: float, **filters) -> np.ndarray:
+        """Return row ids of events active in a given year."""
+        return self.overlap(year, year, **filters)
+
+    def active_in_years(self, first: int, last: Optional[int] = None, **filters) -> np.ndarray:
+        """Return row ids of events active in any calendar year from `first` to `last`.
+
+        An event is active in every year from floor(numeric_start) to
+        floor(numeric_end), as in `SearchIndex` `year:` queries and
+        `OccupancyGrid`, so a role starting in November counts for that year.
+        """
+        last = first if last is None else last
+        # Calendar years first..last cover [first, last + 1)
+        return self.overlap(first, np.nextafter(last + 1, -np.inf), **filters)
+
+    @staticmethod
+    def _filter_codes(rows: np.ndarray, codes: np.ndarray, lookup: Dict[Any, int],
+                      wanted: Union[str, Iterable[str], None]) -> np.ndarray:
+        """Keep rows whose categorical code is one of the wanted values."""
+        if wanted is None:
+            return rows
+        wanted_codes = [lookup[value] for value in _as_list(wanted) if value in lookup]
+        return rows[np.isin(codes[rows], wanted_codes)]
+
+    def query(self, start: float, end: Optional[float] = None, **filters) -> pd.DataFrame:
+        """Return the matching events as a DataFrame (a stabbing query if `end` is omitted)."""
+        rows = self.overlap(start, start if end is None else end, **filters)
+        return self.events.iloc[rows]
+
+    def people(self, start: float, end: Optional[float] = None, **filters) -> List[str]:
+        """Return the names of people with at least one matching event."""
+        rows = self.overlap(start, start if end is None else end, **filters)
+        return self.events["person_name"].iloc[rows].drop_duplicates().tolist()
+
+
+def _as_list(value: Union[str, Iterable[str], None]) -> List[str]:
+    """Normalize a filter value that may be a single string or a collection."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
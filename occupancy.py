@@ -0,0 +1,136 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+import data_processing as dp
+
+
+def _year_segments(events: pd.DataFrame, relative: bool) -> pd.DataFrame:
+    """Turn event spans into merged inclusive integer-year segments per person and metatype.
+
+    An event is active in every calendar year from floor(start) to
+    floor(end). Overlapping or adjacent spans of the same person and metatype
+    are merged so that each person is counted at most once per year and
+    metatype.
+    """
+    start, end = events["numeric_start"], events["numeric_end"]
+    if relative:
+        start, end = start - events["hlp_year"], end - events["hlp_year"]
+
+    first = np.floor(start.to_numpy(dtype="float64"))
+    last = np.maximum(np.floor(end.to_numpy(dtype="float64")), first)
+    valid = np.isfinite(first) & np.isfinite(last)
+
+    spans = pd.DataFrame({
+        "person_id": events["person_id"].to_numpy()[valid],
+        "metatype": events["metatype"].to_numpy()[valid],
+        "first": first[valid].astype("int64"),
+        "last": last[valid].astype("int64")
+    }).sort_values(["person_id", "metatype", "first"], kind="stable")
+
+    # A span starts a new segment when it begins after everything before it in its group ended
+    groups = spans.groupby(["person_id", "metatype"], sort=False)
+    reach = groups["last"].cummax()
+    previous_reach = reach.groupby([spans["person_id"], spans["metatype"]], sort=False).shift()
+    new_segment = previous_reach.isna() | (spans["first"] > previous_reach + 1)
+    segment_id = new_segment.cumsum()
+
+    return spans.groupby(segment_id.to_numpy()).agg(
+        person_id=("person_id", "first"), metatype=("metatype", "first"),
+        first=("first", "min"), last=("last", "max"))
+
+
+class OccupancyGrid:
+    """Number of people active per year and metatype, stored as an int32 year x metatype grid.
+
+    Built by rasterizing merged spans with a difference array and a cumulative
+    sum. Years are calendar years, or years relative to each person's
+    `hlp_year` when `relative` is set. People can be added incrementally with
+    `add_events`; each call must cover people not already in the grid.
+    """
+
+    def __init__(self, relative: bool = False, metatypes: Optional[List[str]] = None):
+        self.relative = relative
+        self.metatypes: List[str] = list(metatypes or dp.STANDARD_METATYPES)
+        self.first_year = 0
+        self.counts = np.zeros((0, len(self.metatypes)), dtype="int32")
+
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, people: Optional[pd.DataFrame] = None,
+                    relative: bool = False) -> "OccupancyGrid":
+        """Build a grid from a prepared corpus event table."""
+        grid = cls(relative=relative)
+        grid.add_events(events, people)
+        return grid
+
+    @property
+    def years(self) -> np.ndarray:
+        return np.arange(self.first_year, self.first_year + len(self.counts))
+
+    def add_events(self, events: pd.DataFrame, people: Optional[pd.DataFrame] = None) -> None:
+        """Add the events of new people to the grid, growing its year range as needed."""
+        if self.relative:
+            if "hlp_year" not in events.columns:
+                events = dp.align_to_hlp(events, people)
+            events = events[events["hlp_year"].notna().to_numpy()]
+        if len(events) == 0:
+            return
+
+        segments = _year_segments(events, self.relative)
+        if len(segments) == 0:
+            return
+
+        # Metatypes outside the standard list get new columns in order of appearance
+        for metatype in segments["metatype"].unique():
+            if metatype not in self.metatypes:
+                self.metatypes.append(metatype)
+        if self.counts.shape[1] < len(self.metatypes):
+            extra = len(self.metatypes) - self.counts.shape[1]
+            self.counts = np.pad(self.counts, ((0, 0), (0, extra)))
+
+        self._extend_years(int(segments["first"].min()), int(segments["last"].max()))
+
+        column = segments["metatype"].map({m: i for i, m in enumerate(self.metatypes)}).to_numpy()
+        rows_first = segments["first"].to_numpy() - self.first_year
+        rows_last = segments["last"].to_numpy() - self.first_year
+
+        diff = np.zeros((len(self.counts) + 1, len(self.metatypes)), dtype="int32")
+        np.add.at(diff, (rows_first, column), 1)
+        np.add.at(diff, (rows_last + 1, column), -1)
+        self.counts += np.cumsum(diff, axis=0, dtype="int32")[:-1]
+
+    def _extend_years(self, first: int, last: int) -> None:
+        """Pad the grid so it covers the years first..last."""
+        if len(self.counts) == 0:
+            self.first_year = first
+            self.counts = np.zeros((last - first + 1, len(self.metatypes)), dtype="int32")
+            return
+        current_last = self.first_year + len(self.counts) - 1
+        before = max(self.first_year - first, 0)
+        after = max(last - current_last, 0)
+        if before or after:
+            self.counts = np.pad(self.counts, ((before, after), (0, 0)))
+            self.first_year -= before
+
+    def to_frame(self, drop_empty: bool = True) -> pd.DataFrame:
+        """Return the grid as a DataFrame indexed by year with one column per metatype."""
+        frame = pd.DataFrame(self.counts, index=pd.Index(self.years, name="year"), columns=self.metatypes)
+        if drop_empty:
+            frame = frame.loc[:, frame.sum(axis=0) > 0]
+        return frame
+
+    def save(self, path: str) -> None:
+        """Save the grid to a compressed .npz file."""
+        meta = {"relative": self.relative, "metatypes": self.metatypes, "first_year": self.first_year}
+        np.savez_compressed(path, counts=self.counts, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: str) -> "OccupancyGrid":
+        """Load a grid saved with `save`."""
+        with np.load(path) as stored:
+            meta = json.loads(str(stored["meta"]))
+            grid = cls(relative=meta["relative"], metatypes=meta["metatypes"])
+            grid.first_year = meta["first_year"]
+            grid.counts = stored["counts"].astype("int32")
+        return grid
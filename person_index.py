@@ -0,0 +1,170 @@
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple, Any, Optional, Set
+
+import data_processing as dp
+
+
+# Known alternative spellings of people in the HLP datasets (alias -> canonical form)
+DEFAULT_ALIASES = {
+    "Melinda French Gates": "Melinda Gates",
+    "Tawakkol Karman": "Tawakel Karman",
+    "V Isabel Guerrero Pulgar": "Isabel Guerrero Pulgar",
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for matching: strip diacritics, casefold and collapse punctuation."""
+    if name.isascii():
+        # ASCII has no diacritics to strip
+        return _NON_ALNUM.sub(" ", name.casefold()).strip()
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Character trigrams of a normalized key, padded so short names still match."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PersonIndex:
+    """Name index over the person records of a loaded dataset.
+
+    Maps exact names, normalized names and alias forms to the position of the
+    record in the dataset so lookups do not scan the whole list. Prefix search
+    uses a sorted key list with binary search and fuzzy search narrows
+    candidates through a trigram inverted index before scoring.
+    """
+
+    def __init__(self, records: List[Any], aliases: Optional[Dict[str, str]] = None):
+        self._records = records
+        self._names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._key_positions: Dict[str, List[int]] = defaultdict(list)
+        self._alias_groups = self._build_alias_groups(DEFAULT_ALIASES if aliases is None else aliases)
+
+        for position, record in enumerate(records):
+            if dp._is_person_record(record):
+                self._add(record["person"]["name"], position)
+
+        self._build_search_structures()
+
+    @classmethod
+    def from_data(cls, data: Any, aliases: Optional[Dict[str, str]] = None) -> "PersonIndex":
+        """Build an index for a dataset in any of the supported layouts."""
+        return cls(dp._get_record_container(data), aliases)
+
+    @staticmethod
+    def _build_alias_groups(aliases: Dict[str, str]) -> Dict[str, Set[str]]:
+        """Group alias and canonical forms so either spelling resolves to the other."""
+        groups: Dict[str, Set[str]] = {}
+        for alias, canonical in aliases.items():
+            group = {normalize_name(alias), normalize_name(canonical)}
+            for key in list(group):
+                group |= groups.get(key, set())
+            for key in group:
+                groups[key] = group
+        return groups
+
+    def _add(self, name: str, position: int) -> None:
+        """Register a name and all of its lookup keys."""
+        self._names.append(name)
+        # Keep the first occurrence, as a linear scan would
+        self._positions.setdefault(name, position)
+
+        key = normalize_name(name)
+        for lookup_key in self._alias_groups.get(key, {key}):
+            if position not in self._key_positions[lookup_key]:
+                self._key_positions[lookup_key].append(position)
+
+    def _build_search_structures(self) -> None:
+        """Build the sorted prefix list and the trigram index."""
+        # Every word suffix of a key is searchable by prefix ("gates" finds "melinda gates")
+        prefix_entries = set()
+        for key, positions in self._key_positions.items():
+            words = key.split()
+            for i in range(len(words)):
+                for position in positions:
+                    prefix_entries.add((" ".join(words[i:]), position))
+        self._prefix_entries: List[Tuple[str, int]] = sorted(prefix_entries)
+
+        self._keys: List[str] = list(self._key_positions)
+        self._trigram_index: Dict[str, List[int]] = defaultdict(list)
+        for key_id, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                self._trigram_index[gram].append(key_id)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.position(name) is not None
+
+    def names(self) -> List[str]:
+        """List person names in dataset order."""
+        return list(self._names)
+
+    def position(self, name: str) -> Optional[int]:
+        """Return the record position for an exact, normalized or alias name."""
+        if name in self._positions:
+            return self._positions[name]
+        positions = self._key_positions.get(normalize_name(name))
+        return positions[0] if positions else None
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the person record for a name, or None if it is unknown."""
+        position = self.position(name)
+        return self._records[position] if position is not None else None
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return names whose normalized form, or any trailing part of it, starts with the prefix."""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+
+        results: List[str] = []
+        seen = set()
+        start = bisect.bisect_left(self._prefix_entries, (key, -1))
+        for entry, position in self._prefix_entries[start:]:
+            if not entry.startswith(key) or len(results) >= limit:
+                break
+            if position not in seen:
+                seen.add(position)
+                results.append(self._records[position]["person"]["name"])
+        return results
+
+    def search_fuzzy(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[Tuple[str, float]]:
+        """Return (name, score) pairs for names similar to the query, best first."""
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        # Only score keys sharing enough trigrams with the query
+        query_grams = _trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for key_id in self._trigram_index.get(gram, ()):
+                shared[key_id] += 1
+        min_shared = max(1, int(len(query_grams) * cutoff / 2))
+
+        best: Dict[int, float] = {}
+        for key_id, count in shared.items():
+            if count < min_shared:
+                continue
+            candidate = self._keys[key_id]
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score < cutoff:
+                continue
+            for position in self._key_positions[candidate]:
+                best[position] = max(best.get(position, 0.0), score)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self._records[position]["person"]["name"], score) for position, score in ranked]
+
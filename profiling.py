@@ -0,0 +1,288 @@
+"""Lightweight stage timing, counters and peak-memory sampling.
+
+Instrumentation is off unless the PROSOPOGRAPHY_PROFILE environment variable
+is set (to anything but "", "0" or "false"), or `set_enabled(True)` is
+called, and costs one flag check per instrumented call when off:
+
+    with profiling.span("load"):
+        data = load(...)
+    profiling.count("events", len(df))
+
+    @profiling.profiled()
+    def prepare(...): ...
+
+Spans and counters go to the trace of the enclosing `recording()` block, or
+to a process-wide default trace that keeps only the most recent
+`DEFAULT_TRACE_SPANS` spans. Traces export as JSON or as Chrome trace
+files that open in chrome://tracing or https://ui.perfetto.dev.
+"""
+import collections
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Any, Optional, Callable, Iterable, Iterator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+ENV_VAR = "PROSOPOGRAPHY_PROFILE"
+# Spans kept by the process-wide trace, which lives as long as the process
+DEFAULT_TRACE_SPANS = 10_000
+
+_enabled = os.environ.get(ENV_VAR, "").strip().lower() not in ("", "0", "false")
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is recording."""
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn instrumentation on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process in MiB, or None where it is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Trace:
+    """Spans and counters recorded during one run.
+
+    Each span is a dict with name, start and duration (seconds, start
+    relative to the trace), thread id, nesting depth, the process peak RSS
+    when it ended and optional args. With `max_spans`, only the most recent
+    spans are kept; counters and the peak RSS still cover the whole run.
+    """
+
+    def __init__(self, name: str = "trace", max_spans: Optional[int] = None):
+        self.name = name
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        self.finished: Optional[float] = None
+        self.spans: Deque[Dict[str, Any]] = collections.deque(maxlen=max_spans)
+        self.counters: Dict[str, float] = {}
+        self.peak_rss_mb: Optional[float] = None
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds from the start of the trace to the end of its recording (or now)."""
+        return (self.finished or time.perf_counter()) - self.started
+
+    def _add_span(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(span)
+            if span["peak_rss_mb"] is not None:
+                self.peak_rss_mb = max(self.peak_rss_mb or 0.0, span["peak_rss_mb"])
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by name: calls, total, mean and max milliseconds, slowest first."""
+        return summarize(self.spans)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the trace as JSON-serializable data."""
+        return {
+            "name": self.name,
+            "pid": os.getpid(),
+            "wall_started": self.wall_started,
+            "elapsed_seconds": self.elapsed_seconds,
+            "peak_rss_mb": self.peak_rss_mb,
+            "counters": dict(self.counters),
+            "summary": self.summary(),
+            "spans": list(self.spans)
+        }
+
+    def chrome_events(self, pid: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the spans as Chrome trace "complete" events and the counters as one counter event."""
+        return _chrome_events(self.spans, self.counters, os.getpid() if pid is None else pid)
+
+    def save_json(self, path: str) -> None:
+        """Write the trace as JSON."""
+        write_json(path, self.to_dict())
+
+    def save_chrome_trace(self, path: str) -> None:
+        """Write the trace in the Chrome trace event format."""
+        write_json(path, merge_traces([self.to_dict()]))
+
+
+def summarize(spans: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate spans by name: calls, total, mean and max milliseconds, slowest first."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        stage = stages.setdefault(span["name"], {"name": span["name"], "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        duration_ms = span["duration"] * 1000
+        stage["calls"] += 1
+        stage["total_ms"] += duration_ms
+        stage["max_ms"] = max(stage["max_ms"], duration_ms)
+    for stage in stages.values():
+        stage["mean_ms"] = stage["total_ms"] / stage["calls"]
+    return sorted(stages.values(), key=lambda stage: stage["total_ms"], reverse=True)
+
+
+def _chrome_events(spans: List[Dict[str, Any]], counters: Dict[str, float], pid: int,
+                   offset: float = 0.0) -> List[Dict[str, Any]]:
+    """Convert spans and counters to Chrome trace events, shifted by `offset` seconds."""
+    events = [{
+        "name": span["name"],
+        "ph": "X",
+        "ts": (offset + span["start"]) * 1e6,
+        "dur": span["duration"] * 1e6,
+        "pid": pid,
+        "tid": span["thread"],
+        "args": span["args"]
+    } for span in spans]
+    if counters:
+        end = max((span["start"] + span["duration"] for span in spans), default=0.0)
+        events.append({"name": "counters", "ph": "C", "ts": (offset + end) * 1e6, "pid": pid, "tid": 0,
+                       "args": dict(counters)})
+    return events
+
+
+def merge_traces(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine traces exported with `Trace.to_dict()`, e.g. by worker processes, into one Chrome trace.
+
+    Events are placed on a shared wall-clock timeline, one row per process;
+    the metadata holds the summary over all spans, the summed counters and
+    the peak RSS of every process.
+    """
+    origin = min((trace["wall_started"] for trace in traces), default=0.0)
+    events: List[Dict[str, Any]] = []
+    spans: List[Dict[str, Any]] = []
+    counters: Dict[str, float] = {}
+    peak_rss: Dict[str, float] = {}
+    for trace in traces:
+        events.extend(_chrome_events(trace["spans"], trace["counters"], trace["pid"],
+                                     trace["wall_started"] - origin))
+        spans.extend(trace["spans"])
+        for name, value in trace["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+        if trace["peak_rss_mb"] is not None:
+            pid = str(trace["pid"])
+            peak_rss[pid] = max(peak_rss.get(pid, 0.0), trace["peak_rss_mb"])
+    return chrome_trace(events, {"summary": summarize(spans), "counters": counters, "peak_rss_mb": peak_rss})
+
+
+def chrome_trace(events: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Wrap Chrome trace events (possibly from several processes) into a trace file object."""
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata or {}}
+
+
+def write_json(path: str, data: Any) -> None:
+    """Write JSON atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, default=str)
+    os.replace(temp_path, path)
+
+
+_default_trace = Trace("process", max_spans=DEFAULT_TRACE_SPANS)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("profiling_trace", default=None)
+
+
+def current_trace() -> Trace:
+    """Return the trace of the enclosing `recording()` block, or the process-wide one."""
+    return _current_trace.get() or _default_trace
+
+
+@contextmanager
+def recording(name: str = "trace") -> Iterator[Trace]:
+    """Collect the spans and counters of a block (and the calls it makes) in a new trace."""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finished = time.perf_counter()
+        _current_trace.reset(token)
+
+
+class _Span:
+    """Context manager that times a block into the current trace."""
+
+    __slots__ = ("name", "args", "trace", "start", "depth")
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.trace = current_trace()
+        self.depth = getattr(self.trace._depth, "value", 0)
+        self.trace._depth.value = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        end = time.perf_counter()
+        self.trace._depth.value = self.depth
+        self.trace._add_span({
+            "name": self.name,
+            "start": self.start - self.trace.started,
+            "duration": end - self.start,
+            "thread": threading.get_ident(),
+            "depth": self.depth,
+            "peak_rss_mb": peak_rss_mb(),
+            "args": self.args
+        })
+
+
+class _NullSpan:
+    """Span used while instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args: Any) -> Any:
+    """Time a block: `with span("stage", person=name): ...`."""
+    return _Span(name, args) if _enabled else _NULL_SPAN
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add to a counter of the current trace."""
+    if _enabled:
+        current_trace().count(name, value)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorate a function so each call is recorded as a span named after it."""
+    def decorate(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
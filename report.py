@@ -0,0 +1,274 @@
+"""Headless batch report generator for a whole career-trajectory dataset.
+
+Renders every person's timeline, metatype distribution charts and a stats
+summary without Streamlit:
+
+    python -m report data/career_trajectories_03_dates_normalized_with_hlp.json -o reports
+
+People whose record and render settings are unchanged since the last run
+are skipped, based on the fingerprints stored in `<output>/manifest.json`.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import data_processing as dp
+import profiling
+from person_index import normalize_name
+from view_cache import content_hash
+
+
+REPORT_VERSION = 2
+FORMATS = ("png", "html", "json")
+MANIFEST_FILE = "manifest.json"
+SUMMARY_FILE = "summary.json"
+
+
+def person_slug(name: str) -> str:
+    """Turn a person's name into a filesystem-safe directory name."""
+    return re.sub(r"\s+", "-", normalize_name(name)) or "person"
+
+
+def report_fingerprint(record: Dict[str, Any], formats: Tuple[str, ...], dpi: int) -> str:
+    """Fingerprint a person's record together with the settings used to render it."""
+    return content_hash({"version": REPORT_VERSION, "formats": sorted(formats), "dpi": dpi, "record": record})
+
+
+def render_person_report(record: Dict[str, Any], person_dir: str, formats: Tuple[str, ...],
+                         dpi: int) -> Dict[str, Any]:
+    """Render all report files for one person and return their stats summary."""
+    import visualization as viz
+
+    os.makedirs(person_dir, exist_ok=True)
+    df, metatype_to_y = dp.prepare_timeline_data(record)
+    metadata = record["person"].get("metadata", {})
+
+    stats: Dict[str, Any] = {
+        "name": record["person"]["name"],
+        "metadata": metadata,
+        "event_count": int(len(df)),
+        "skipped_events": len(record.get("career_events", [])) - int(len(df))
+    }
+
+    if len(df) > 0:
+        longest_role, longest_duration = viz.find_longest_role(df)
+        metatype_counts = df["metatype"].value_counts()
+        stats.update({
+            "career_start": float(df["numeric_start"].min()),
+            "career_end": float(df["numeric_end"].max()),
+            "career_span": float(df["timeline_date"].max() - df["timeline_date"].min()),
+            "most_common_type": metatype_counts.index[0],
+            "events_by_metatype": {k: int(v) for k, v in metatype_counts.items()},
+            "longest_role": {
+                "role": longest_role.get("role"),
+                "organization": longest_role.get("organization"),
+                "metatype": longest_role.get("metatype"),
+                "duration": float(longest_duration),
+                "is_open_ended": bool(longest_role.get("is_open_ended", False))
+            }
+        })
+
+    # A timeline needs at least two events, as in the app
+    if len(df) >= 2:
+        if "html" in formats:
+            fig = viz.plot_career_timeline_plotly(df, metatype_to_y, record)
+            fig.update_layout(title=f"Career Trajectory Timeline: {stats['name']}")
+            fig.write_html(os.path.join(person_dir, "timeline.html"), include_plotlyjs="cdn")
+
+        if "png" in formats:
+            renders = [
+                ("timeline.png", lambda fig: viz.plot_career_timeline_matplotlib(df, metatype_to_y, encode=False, fig=fig)),
+                ("distribution_events.png", lambda fig: viz.plot_metatype_distribution(df, encode=False, fig=fig)),
+                ("distribution_years.png", lambda fig: viz.plot_metatype_distribution_by_years(df, encode=False, fig=fig))
+            ]
+            # One figure is reused for every chart of the person
+            fig = None
+            for file_name, render in renders:
+                fig, _ = render(fig)
+                with open(os.path.join(person_dir, file_name), "wb") as file:
+                    file.write(viz.figure_to_png(fig, dpi=dpi, bbox_inches="tight"))
+            viz.close_figure(fig)
+
+    if "json" in formats:
+        with open(os.path.join(person_dir, "stats.json"), "w", encoding="utf-8") as file:
+            json.dump(stats, file, ensure_ascii=False, indent=2)
+
+    return stats
+
+
+def _render_job(record: Dict[str, Any], person_dir: str, formats: Tuple[str, ...], dpi: int,
+                trace: bool) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Render one person's report, optionally recording a trace of it, in a worker process."""
+    if not trace:
+        return render_person_report(record, person_dir, formats, dpi), None
+    profiling.set_enabled(True)
+    name = record["person"]["name"]
+    with profiling.recording(name) as person_trace:
+        with profiling.span("report.person", person=name):
+            stats = render_person_report(record, person_dir, formats, dpi)
+    return stats, person_trace.to_dict()
+
+
+def _load_manifest(output_dir: str) -> Dict[str, Any]:
+    """Load the fingerprints of the previous run, if any."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {"people": {}}
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write JSON atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def _iter_jobs(dataset_path: str, output_dir: str, formats: Tuple[str, ...], dpi: int,
+               previous: Dict[str, Any], force: bool) -> Iterator[Tuple[str, Dict[str, Any], str, Optional[Dict[str, Any]]]]:
+    """Yield (slug, record, fingerprint, cached stats or None) for every person in the dataset."""
+    seen: Dict[str, int] = {}
+    for record in dp.iter_person_records(dataset_path):
+        slug = person_slug(record["person"]["name"])
+        # Disambiguate people that share a name
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1:
+            slug = f"{slug}-{seen[slug]}"
+
+        fingerprint = report_fingerprint(record, formats, dpi)
+        entry = previous.get(slug)
+        unchanged = (not force and entry is not None and entry.get("fingerprint") == fingerprint
+                     and os.path.isdir(os.path.join(output_dir, slug)))
+        yield slug, record, fingerprint, entry.get("stats") if unchanged else None
+
+
+def generate_reports(dataset_path: str, output_dir: str, formats: Tuple[str, ...] = FORMATS,
+                     workers: Optional[int] = None, dpi: int = 150, force: bool = False,
+                     progress: bool = True, trace_path: Optional[str] = None) -> Dict[str, Any]:
+    """Render reports for every person in a dataset across a process pool.
+
+    Records are streamed from the dataset and at most a few jobs per worker
+    are in flight, so memory does not grow with the size of the corpus.
+    Returns the corpus summary that is also written to `summary.json`.
+    With `trace_path`, the stages of every rendered person are also written
+    there as one Chrome trace, with a row per worker process.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous = _load_manifest(output_dir).get("people", {})
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    manifest: Dict[str, Any] = {}
+    counts = {"rendered": 0, "skipped": 0, "failed": 0}
+    failures: List[Dict[str, str]] = []
+    traces: List[Dict[str, Any]] = []
+
+    def record_result(slug: str, name: str, fingerprint: str, result: Optional[Tuple[Dict[str, Any], Any]],
+                      status: str, error: Optional[str] = None) -> None:
+        stats, person_trace = result or (None, None)
+        if person_trace is not None:
+            traces.append(person_trace)
+        counts[status] += 1
+        if status == "failed":
+            failures.append({"name": name, "error": error})
+        else:
+            manifest[slug] = {"name": name, "fingerprint": fingerprint, "stats": stats}
+        if progress:
+            done = sum(counts.values())
+            print(f"[{done}] {status:<8} {name}", file=sys.stderr)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending: List[Tuple[str, str, str, Future]] = []
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            slug, name, fingerprint, future = pending.pop(0)
+            try:
+                record_result(slug, name, fingerprint, future.result(), "rendered")
+            except Exception as e:
+                record_result(slug, name, fingerprint, None, "failed", str(e))
+
+    try:
+        for slug, record, fingerprint, cached_stats in _iter_jobs(dataset_path, output_dir, formats, dpi,
+                                                                   previous, force):
+            name = record["person"]["name"]
+            person_dir = os.path.join(output_dir, slug)
+
+            if cached_stats is not None:
+                record_result(slug, name, fingerprint, (cached_stats, None), "skipped")
+            elif executor is None:
+                try:
+                    record_result(slug, name, fingerprint,
+                                  _render_job(record, person_dir, formats, dpi, trace_path is not None),
+                                  "rendered")
+                except Exception as e:
+                    record_result(slug, name, fingerprint, None, "failed", str(e))
+            else:
+                pending.append((slug, name, fingerprint,
+                                executor.submit(_render_job, record, person_dir, formats, dpi,
+                                                trace_path is not None)))
+                drain(workers * 4)
+        drain(0)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    summary = {
+        "dataset": os.path.abspath(dataset_path),
+        "people": len(manifest) + counts["failed"],
+        **counts,
+        "failures": failures,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "stats": {slug: entry["stats"] for slug, entry in manifest.items()}
+    }
+    if trace_path is not None:
+        merged = profiling.merge_traces(traces)
+        profiling.write_json(trace_path, merged)
+        summary["stages"] = merged["otherData"]["summary"]
+    _write_json(os.path.join(output_dir, MANIFEST_FILE), {"version": REPORT_VERSION, "people": manifest})
+    _write_json(os.path.join(output_dir, SUMMARY_FILE), summary)
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render career trajectory reports for every person in a dataset.")
+    parser.add_argument("dataset", help="Career trajectory JSON file")
+    parser.add_argument("-o", "--output-dir", default="reports", help="Directory for the reports (default: reports)")
+    parser.add_argument("-f", "--formats", default=",".join(FORMATS),
+                        help="Comma-separated output formats out of png, html, json (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of PNG output (default: 150)")
+    parser.add_argument("--force", action="store_true", help="Re-render people even if unchanged")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print per-person progress")
+    parser.add_argument("--trace", metavar="PATH", default=None,
+                        help="Write a Chrome trace of the rendering stages (open in chrome://tracing or Perfetto)")
+    args = parser.parse_args(argv)
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"Unknown format(s): {', '.join(sorted(unknown))}")
+
+    summary = generate_reports(args.dataset, args.output_dir, formats, args.workers, args.dpi,
+                               args.force, progress=not args.quiet, trace_path=args.trace)
+    print(f"{summary['people']} people: {summary['rendered']} rendered, {summary['skipped']} skipped, "
+          f"{summary['failed']} failed in {summary['elapsed_seconds']:.1f}s -> {args.output_dir}")
+    if args.trace:
+        print(f"Slowest stages (trace: {args.trace}):")
+        for stage in summary["stages"][:5]:
+            print(f"  {stage['name']:<50} {stage['calls']:>6} calls {stage['total_ms'] / 1000:>8.2f}s")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
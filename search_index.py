@@ -0,0 +1,460 @@
+import bisect
+import json
+import os
+import re
+import zipfile
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional, Callable
+
+from person_index import normalize_name
+
+
+SEARCH_INDEX_VERSION = 3
+SEARCH_INDEX_SUFFIX = ".search.npz"
+
+# Free-text fields, searchable on their own (role:minister) or together without a field prefix
+TEXT_FIELDS = {
+    "role": "role",
+    "org": "organization",
+    "description": "description",
+    "source": "source_text",
+    "person": "person_name"
+}
+# Fields matched on their whole value (tag:field_economics)
+EXACT_FIELDS = {
+    "tag": "tags",
+    "metatype": "metatype",
+    "type": "type"
+}
+FIELD_ALIASES = {"organization": "org", "name": "person", "tags": "tag", "source_text": "source"}
+TEXT = "text"
+
+# Event columns kept with the index so results can be shown without the full corpus
+RESULT_COLUMNS = ["person_id", "person_name", "metatype", "type", "role", "organization",
+                  "start_date", "end_date"]
+
+# Word positions are packed with the row id into one int64 key (row << POSITION_BITS | position);
+# the columns of the combined text field are COLUMN_GAP positions apart so phrases never span two
+POSITION_BITS = 24
+COLUMN_GAP = 1 << 20
+
+_QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|((?:[A-Za-z_]+:)?"[^"]*")|([^\s()"]+))')
+_YEAR_RANGE = re.compile(r"^(-?\d+)?(?:\.\.(-?\d+)?)?$")
+_NO_ROWS = np.zeros(0, dtype="int32")
+
+
+def search_index_path_for(json_path: str) -> str:
+    """Return the default path of the persisted search index for a JSON dataset."""
+    return json_path + SEARCH_INDEX_SUFFIX
+
+
+class Postings:
+    """Posting lists of one field, stored as sorted terms over one concatenated row array.
+
+    The rows of term i are `rows[offsets[i]:offsets[i + 1]]`, sorted int32
+    row ids. Text fields also keep the word position of every occurrence,
+    so there a row repeats once per occurrence and phrases can be matched.
+    """
+
+    def __init__(self, terms: List[Any], offsets: np.ndarray, rows: np.ndarray,
+                 positions: Optional[np.ndarray] = None):
+        self.terms = terms
+        self.offsets = offsets
+        self.rows = rows
+        self.positions = positions
+
+    @classmethod
+    def build(cls, values: pd.Series, positions: Optional[np.ndarray] = None) -> "Postings":
+        """Index a series of terms whose index holds the row id of each term."""
+        rows = values.index.to_numpy(dtype="int64")
+        codes, terms = pd.factorize(values.to_numpy(), sort=True)
+        codes = codes.astype("int64")
+        if positions is None:
+            # One entry per distinct (term, row)
+            keys = np.sort((codes << 32) | rows)
+            keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+            codes, rows = keys >> 32, keys & 0xFFFFFFFF
+        else:
+            order = np.lexsort((positions, rows, codes))
+            codes, rows, positions = codes[order], rows[order], positions[order].astype("int32")
+        offsets = np.searchsorted(codes, np.arange(len(terms) + 1)).astype("int64")
+        return cls(list(np.asarray(terms).tolist()), offsets, rows.astype("int32"), positions)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _rows_between(self, first: int, last: int) -> np.ndarray:
+        """Sorted distinct rows of the terms first..last-1."""
+        rows = self.rows[self.offsets[first]:self.offsets[last]]
+        if last - first == 1 and self.positions is None:
+            return rows
+        return np.unique(rows)
+
+    def term_rows(self, term: Any) -> np.ndarray:
+        """Rows containing a term."""
+        i = bisect.bisect_left(self.terms, term)
+        if i == len(self.terms) or self.terms[i] != term:
+            return _NO_ROWS
+        return self._rows_between(i, i + 1)
+
+    def prefix_rows(self, prefix: str) -> np.ndarray:
+        """Rows containing any term that starts with a prefix."""
+        first = bisect.bisect_left(self.terms, prefix)
+        last = bisect.bisect_left(self.terms, prefix + "\U0010ffff", first)
+        return self._rows_between(first, last)
+
+    def range_rows(self, low: Any, high: Any) -> np.ndarray:
+        """Rows containing any term between low and high, inclusive."""
+        first = bisect.bisect_left(self.terms, low)
+        last = bisect.bisect_right(self.terms, high)
+        return self._rows_between(first, max(first, last))
+
+    def phrase_rows(self, words: List[str]) -> np.ndarray:
+        """Rows where the words occur next to each other, in order."""
+        keys = None
+        for shift, word in enumerate(words):
+            i = bisect.bisect_left(self.terms, word)
+            if i == len(self.terms) or self.terms[i] != word:
+                return _NO_ROWS
+            start, end = self.offsets[i], self.offsets[i + 1]
+            # Occurrences of the n-th word, moved back to where the phrase would start
+            occurrences = (self.rows[start:end].astype("int64") << POSITION_BITS) + self.positions[start:end] - shift
+            keys = occurrences if keys is None else np.intersect1d(keys, occurrences, assume_unique=True)
+        return np.unique(keys >> POSITION_BITS).astype("int32")
+
+    def arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """The arrays to save, keyed by `prefix`."""
+        arrays = {f"{prefix}.offsets": self.offsets, f"{prefix}.rows": self.rows}
+        if self.positions is not None:
+            arrays[f"{prefix}.positions"] = self.positions
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, terms: List[Any], stored: Any, prefix: str) -> "Postings":
+        """Rebuild postings saved with `arrays`."""
+        positions = stored[f"{prefix}.positions"] if f"{prefix}.positions" in stored else None
+        return cls(terms, stored[f"{prefix}.offsets"], stored[f"{prefix}.rows"], positions)
+
+
+def _normalized(values: pd.Series) -> pd.Series:
+    """Normalize text values, each distinct value once."""
+    codes, uniques = pd.factorize(values.astype(str))
+    normalized = np.array([normalize_name(value) for value in uniques], dtype=object)
+    return pd.Series(normalized[codes], index=values.index, dtype=object)
+
+
+def _words(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Split text into normalized words, indexed by row, with the position of each word in its row.
+
+    Each distinct value is normalized and split once.
+    """
+    codes, uniques = pd.factorize(values.fillna("").astype(str))
+    split = [normalize_name(value).split() for value in uniques]
+    counts = np.array([len(words) for words in split], dtype="int64")
+    flat = np.array([word for words in split for word in words], dtype=object)
+
+    row_counts = counts[codes]
+    positions = np.arange(row_counts.sum()) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+    words = flat[np.repeat((np.cumsum(counts) - counts)[codes], row_counts) + positions]
+    return pd.Series(words, index=np.repeat(values.index.to_numpy(), row_counts), dtype=object), positions
+
+
+def _encode_column(values: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode a column into int32 codes (-1 for missing) and its distinct values."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    return codes.astype("int32"), np.asarray(uniques, dtype=object).tolist()
+
+
+def _decode_column(codes: np.ndarray, uniques: List[Any]) -> np.ndarray:
+    """Invert `_encode_column`."""
+    values = np.array(uniques + [None], dtype=object)
+    return values[codes]
+
+
+class SearchIndex:
+    """Inverted index over career events with sorted row-array posting lists.
+
+    Text fields are tokenized after stripping diacritics and case, so
+    "dervis" matches "Derviş". Each term maps to the sorted ids of the event
+    rows containing it, so index size grows with the number of term
+    occurrences rather than with vocabulary times events, and AND/OR/NOT
+    are merges of sorted arrays. Queries look like
+
+        tag:field_economics AND metatype:io AND year:1990..2000
+        minister OR (role:governor NOT org:"central bank")
+
+    Terms without a field search role, organization, description, source
+    text and person name. Quoted words in a text field match as a phrase.
+    A trailing `*` matches by prefix. Adjacent terms are ANDed. `year:`
+    takes a year or an inclusive range (`1990..2000`, `..1980`, `2010..`)
+    and matches events active in it.
+    """
+
+    def __init__(self, events: Optional[pd.DataFrame] = None):
+        self.fields: Dict[str, Postings] = {}
+        self.years = Postings.build(pd.Series([], dtype="int64"))
+        self.results = pd.DataFrame(columns=RESULT_COLUMNS)
+        self.size = 0
+        if events is not None:
+            self._build(events.reset_index(drop=True))
+
+    def _build(self, events: pd.DataFrame) -> None:
+        """Index every event row of a prepared event table."""
+        self.size = len(events)
+        self.results = events.reindex(columns=RESULT_COLUMNS)
+
+        all_words: List[pd.Series] = []
+        all_positions: List[np.ndarray] = []
+        for i, (field, column) in enumerate(TEXT_FIELDS.items()):
+            if column not in events.columns:
+                continue
+            words, positions = _words(events[column])
+            self.fields[field] = Postings.build(words, positions)
+            all_words.append(words)
+            all_positions.append(positions + i * COLUMN_GAP)
+        if all_words:
+            self.fields[TEXT] = Postings.build(pd.concat(all_words), np.concatenate(all_positions))
+
+        for field, column in EXACT_FIELDS.items():
+            if column not in events.columns:
+                continue
+            values = events[column]
+            if field == "tag":
+                values = values.explode()
+            values = _normalized(values.dropna())
+            self.fields[field] = Postings.build(values[values.astype(bool)])
+
+        # Events are active in every calendar year from floor(start) to floor(end)
+        if "numeric_start" in events.columns:
+            first = np.floor(events["numeric_start"].to_numpy(dtype="float64"))
+            last = np.maximum(np.floor(events["numeric_end"].to_numpy(dtype="float64")), first)
+            dated = np.flatnonzero(np.isfinite(first) & np.isfinite(last))
+            spans = (last[dated] - first[dated]).astype("int64") + 1
+            rows = np.repeat(dated, spans)
+            offsets = np.arange(len(rows)) - np.repeat(np.cumsum(spans) - spans, spans)
+            years = np.repeat(first[dated].astype("int64"), spans) + offsets
+            self.years = Postings.build(pd.Series(years, index=rows))
+
+    @property
+    def all_events(self) -> np.ndarray:
+        """Every event row."""
+        return np.arange(self.size, dtype="int32")
+
+    def term(self, field: str, value: str) -> np.ndarray:
+        """Return the sorted rows matching a single field:value term."""
+        field = FIELD_ALIASES.get(field, field)
+        if field == "year":
+            return self._year_range(value)
+        if field != TEXT and field not in TEXT_FIELDS and field not in EXACT_FIELDS:
+            raise ValueError(f"Unknown search field: {field}")
+
+        postings = self.fields.get(field)
+        if postings is None:
+            return _NO_ROWS
+        key = normalize_name(value.rstrip("*"))
+        if value.endswith("*"):
+            return postings.prefix_rows(key)
+        words = key.split()
+        if field in EXACT_FIELDS or len(words) <= 1:
+            return postings.term_rows(key)
+        return postings.phrase_rows(words)
+
+    def _year_range(self, value: str) -> np.ndarray:
+        """Rows of events active in any year of an inclusive range like 1990..2000."""
+        match = _YEAR_RANGE.match(value.strip())
+        if not match or not value.strip() or value.strip() == "..":
+            raise ValueError(f"Invalid year range: {value}")
+        start, end = match.group(1), match.group(2)
+        if ".." not in value:
+            end = start
+        first = int(start) if start else -np.inf
+        last = int(end) if end else np.inf
+        return self.years.range_rows(first, last)
+
+    def search(self, query: str) -> np.ndarray:
+        """Evaluate a boolean query and return the sorted rows of matching events."""
+        return _QueryParser(self, query).parse()
+
+    def event_rows(self, query: str) -> np.ndarray:
+        """Return the row ids of events matching a query."""
+        return self.search(query)
+
+    def events(self, query: str) -> pd.DataFrame:
+        """Return the matching events."""
+        return self.results.iloc[self.event_rows(query)]
+
+    def people(self, query: str) -> List[str]:
+        """Return the names of people with at least one matching event."""
+        return self.events(query)["person_name"].drop_duplicates().tolist()
+
+    def save(self, path: str, source: Optional[Dict[str, Any]] = None) -> None:
+        """Write the index to a compressed .npz file, atomically.
+
+        Posting lists and result columns are stored as integer arrays; terms
+        and the distinct values of each result column go in a JSON header.
+        `source` identifies the dataset the index was built from (e.g. its
+        content hash) so a stale index can be detected when loading.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for field, postings in self.fields.items():
+            arrays.update(postings.arrays(f"field.{field}"))
+        arrays.update(self.years.arrays("years"))
+        result_values = {}
+        for column in RESULT_COLUMNS:
+            arrays[f"results.{column}"], result_values[column] = _encode_column(self.results[column])
+
+        meta = {
+            "version": SEARCH_INDEX_VERSION,
+            "source": source or {},
+            "size": self.size,
+            "terms": {field: postings.terms for field, postings in self.fields.items()},
+            "years": self.years.terms,
+            "results": result_values
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            np.savez_compressed(file, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source: Optional[Dict[str, Any]] = None) -> Optional["SearchIndex"]:
+        """Read an index written by `save`.
+
+        Returns None if the file is missing or unreadable, was written by
+        another version, or does not match the expected `source`.
+        """
+        try:
+            with np.load(path) as stored:
+                meta = json.loads(str(stored["meta"]))
+                if meta.get("version") != SEARCH_INDEX_VERSION:
+                    return None
+                if source is not None and meta.get("source") != source:
+                    return None
+
+                index = cls()
+                index.size = meta["size"]
+                index.fields = {field: Postings.from_arrays(terms, stored, f"field.{field}")
+                                for field, terms in meta["terms"].items()}
+                index.years = Postings.from_arrays(meta["years"], stored, "years")
+                index.results = pd.DataFrame({
+                    column: _decode_column(stored[f"results.{column}"], values)
+                    for column, values in meta["results"].items()
+                }, columns=RESULT_COLUMNS)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        return index
+
+
+def load_or_build_search_index(cache_path: Optional[str], source: Dict[str, Any],
+                               events: Callable[[], pd.DataFrame]) -> SearchIndex:
+    """Load a persisted index matching `source`, or build one from `events()` and persist it."""
+    if cache_path:
+        index = SearchIndex.load(cache_path, source)
+        if index is not None:
+            return index
+
+    index = SearchIndex(events())
+    if cache_path:
+        try:
+            index.save(cache_path, source)
+        except OSError:
+            # A read-only location only costs a rebuild next time
+            pass
+    return index
+
+
+class _QueryParser:
+    """Recursive-descent parser that evaluates a query directly to sorted row ids.
+
+    Grammar (NOT binds tightest, then AND, then OR):
+
+        query := and ("OR" and)*
+        and   := not (["AND"] not)*
+        not   := "NOT" not | atom
+        atom  := "(" query ")" | [field ":"] value
+        value := word | word "*" | '"' words '"'
+    """
+
+    def __init__(self, index: SearchIndex, query: str):
+        self.index = index
+        self.tokens = self._tokenize(query)
+        self.position = 0
+
+    @staticmethod
+    def _tokenize(query: str) -> List[Tuple[str, str]]:
+        """Split a query into ("(", ")", "op" or "term", text) tokens."""
+        tokens: List[Tuple[str, str]] = []
+        position = 0
+        query = query.strip()
+        while position < len(query):
+            match = _QUERY_TOKEN.match(query, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Unexpected character in query at position {position}")
+            position = match.end()
+            open_paren, close_paren, quoted, word = match.groups()
+            if open_paren:
+                tokens.append(("(", open_paren))
+            elif close_paren:
+                tokens.append((")", close_paren))
+            elif quoted:
+                tokens.append(("term", quoted))
+            elif word in ("AND", "OR", "NOT"):
+                tokens.append(("op", word))
+            else:
+                tokens.append(("term", word))
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self) -> np.ndarray:
+        if not self.tokens:
+            return _NO_ROWS
+        result = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()[1]}' in query")
+        return result
+
+    def _or(self) -> np.ndarray:
+        result = self._and()
+        while self._peek() == ("op", "OR"):
+            self.position += 1
+            result = np.union1d(result, self._and())
+        return result
+
+    def _and(self) -> np.ndarray:
+        result = self._not()
+        while True:
+            token = self._peek()
+            if token == ("op", "AND"):
+                self.position += 1
+            elif token is None or token[0] == ")" or token == ("op", "OR"):
+                return result
+            result = np.intersect1d(result, self._not(), assume_unique=True)
+
+    def _not(self) -> np.ndarray:
+        if self._peek() == ("op", "NOT"):
+            self.position += 1
+            return np.setdiff1d(self.index.all_events, self._not(), assume_unique=True)
+        return self._atom()
+
+    def _atom(self) -> np.ndarray:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ends unexpectedly")
+        self.position += 1
+
+        if token[0] == "(":
+            result = self._or()
+            if self._peek() != (")", ")"):
+                raise ValueError("Missing closing parenthesis in query")
+            self.position += 1
+            return result
+        if token[0] != "term":
+            raise ValueError(f"Unexpected '{token[1]}' in query")
+
+        field, separator, value = token[1].partition(":")
+        if not separator:
+            field, value = TEXT, token[1]
+        return self.index.term(field.lower(), value.strip('"'))
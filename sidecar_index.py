@@ -0,0 +1,218 @@
+import hashlib
+import json
+import mmap
+import os
+from typing import Dict, List, Any, Optional
+
+import data_processing as dp
+from person_index import PersonIndex
+
+
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".idx.json"
+
+# Sampling used by the quick fingerprint: number of probes and bytes per probe
+_SAMPLE_COUNT = 16
+_SAMPLE_SIZE = 64 * 1024
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def sidecar_path_for(json_path: str) -> str:
+    """Return the default sidecar index path for a JSON dataset."""
+    return json_path + SIDECAR_SUFFIX
+
+
+def quick_fingerprint(file_path: str) -> str:
+    """Hash the file size plus evenly spaced samples of the file.
+
+    Cheap enough to run on every open of a multi-GB file while still catching
+    appends, truncation and most in-place edits.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.blake2b(str(size).encode("ascii"), digest_size=16)
+    with open(file_path, "rb") as file:
+        step = max(size // _SAMPLE_COUNT, 1)
+        for offset in range(0, size, step):
+            file.seek(offset)
+            digest.update(file.read(_SAMPLE_SIZE))
+        # Always include the tail, where appended records end up
+        file.seek(max(size - _SAMPLE_SIZE, 0))
+        digest.update(file.read(_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+def file_key(file_path: str) -> str:
+    """Quick fingerprint plus modification time, for keying in-memory caches of a file.
+
+    Unlike the fingerprint alone, it changes with edits outside the sampled
+    blocks, since any write updates the modification time.
+    """
+    return f"{quick_fingerprint(file_path)}:{os.stat(file_path).st_mtime_ns}"
+
+
+def content_hash(file_path: str) -> str:
+    """Hash the full content of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_sidecar_index(json_path: str, sidecar_path: Optional[str] = None) -> Dict[str, Any]:
+    """Scan a JSON dataset once and write a sidecar index of person byte spans.
+
+    Each entry stores the person's name, metadata, number of career events and
+    the [start, end) byte span of the record in the source file.
+    """
+    people = []
+    for record, start, end in dp._iter_record_spans(json_path):
+        people.append({
+            "name": record["person"]["name"],
+            "metadata": record["person"].get("metadata", {}),
+            "event_count": len(record.get("career_events", [])),
+            "start": start,
+            "end": end
+        })
+
+    index = {
+        "version": SIDECAR_VERSION,
+        "source": {
+            "size": os.path.getsize(json_path),
+            "mtime_ns": os.stat(json_path).st_mtime_ns,
+            "fingerprint": quick_fingerprint(json_path),
+            "content_hash": content_hash(json_path)
+        },
+        "people": people
+    }
+    _write_sidecar(index, sidecar_path or sidecar_path_for(json_path))
+    return index
+
+
+def _write_sidecar(index: Dict[str, Any], sidecar_path: str) -> None:
+    """Write a sidecar index atomically so a concurrent reader never sees a partial index."""
+    temp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(index, file, ensure_ascii=False)
+    os.replace(temp_path, sidecar_path)
+
+
+def load_sidecar_index(json_path: str, sidecar_path: Optional[str] = None,
+                       verify: str = "fast") -> Optional[Dict[str, Any]]:
+    """Load a sidecar index, returning None if it is missing or out of date.
+
+    `verify` is "fast" (size, modification time and sampled fingerprint),
+    "full" (hash of the whole source file) or "none". A fast check that finds
+    a new modification time falls back to the full hash, so the stored
+    `content_hash` can key other caches of the file; if the content is
+    unchanged the new time is recorded.
+    """
+    sidecar_path = sidecar_path or sidecar_path_for(json_path)
+    if not os.path.exists(sidecar_path):
+        return None
+
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+    if index.get("version") != SIDECAR_VERSION:
+        return None
+
+    source = index.get("source", {})
+    if verify in ("fast", "full"):
+        if source.get("size") != os.path.getsize(json_path):
+            return None
+        if source.get("fingerprint") != quick_fingerprint(json_path):
+            return None
+    mtime_ns = os.stat(json_path).st_mtime_ns
+    # Edits outside the sampled blocks only show up in the modification time
+    if verify == "full" or (verify == "fast" and source.get("mtime_ns") != mtime_ns):
+        if source.get("content_hash") != content_hash(json_path):
+            return None
+        if source.get("mtime_ns") != mtime_ns:
+            source["mtime_ns"] = mtime_ns
+            try:
+                _write_sidecar(index, sidecar_path)
+            except OSError:
+                # A read-only location only costs a full hash next time
+                pass
+
+    return index
+
+
+class DiskDataset:
+    """Random-access view over an on-disk JSON dataset backed by a sidecar index.
+
+    Only the sidecar (names, metadata and byte spans) is loaded up front; a
+    person's record is parsed from a memory-mapped slice of the source file
+    when it is requested.
+    """
+
+    def __init__(self, json_path: str, sidecar_path: Optional[str] = None,
+                 rebuild: bool = True, verify: str = "fast"):
+        self.json_path = json_path
+        if os.path.getsize(json_path) == 0:
+            # An empty file cannot be memory-mapped and holds no records
+            raise ValueError(f"Dataset file {json_path} is empty")
+        index = load_sidecar_index(json_path, sidecar_path, verify)
+        if index is None:
+            if not rebuild:
+                raise ValueError(f"Sidecar index for {json_path} is missing or out of date")
+            index = build_sidecar_index(json_path, sidecar_path)
+
+        self.source = index["source"]
+        self._entries: List[Dict[str, Any]] = index["people"]
+
+        # Reuse the name index on lightweight stubs so lookups support aliases and search
+        stubs = [{"person": {"name": entry["name"], "metadata": entry["metadata"]}}
+                 for entry in self._entries]
+        self.index = PersonIndex(stubs)
+
+        self._file = open(json_path, "rb")
+        self._mmap: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "DiskDataset":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if not self._file.closed:
+            self._file.close()
+
+    def names(self) -> List[str]:
+        """List person names in file order."""
+        return self.index.names()
+
+    def metadata(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return a person's metadata from the sidecar without touching the source file."""
+        position = self.index.position(name)
+        return self._entries[position]["metadata"] if position is not None else None
+
+    def position(self, name: str) -> Optional[int]:
+        """Return the record position of a person, or None if unknown."""
+        return self.index.position(name)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Parse and return the full record for a person, or None if unknown."""
+        position = self.position(name)
+        if position is None:
+            return None
+        return self.record_at(position)
+
+    def record_at(self, position: int) -> Dict[str, Any]:
+        """Parse the record at a given position in the file."""
+        if self._mmap is None:
+            raise ValueError(f"Dataset {self.json_path} is closed")
+        entry = self._entries[position]
+        return json.loads(self._mmap[entry["start"]:entry["end"]])
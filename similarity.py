@@ -0,0 +1,251 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Optional
+
+import data_processing as dp
+import transitions
+from occupancy import _year_segments
+from person_index import normalize_name
+
+
+DEFAULT_WEIGHTS = {"timing": 0.4, "sequence": 0.3, "shared": 0.3}
+# People are vectorized in batches of this size to bound the memory of intermediate grids
+ADD_BATCH_SIZE = 4096
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_LOW_29_BITS = np.uint64((1 << 29) - 1)
+
+
+def _token_hash(token: str) -> int:
+    """Hash a token to a stable 32-bit integer."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def _mod_mersenne(values: np.ndarray) -> np.ndarray:
+    """Reduce uint64 values modulo the Mersenne prime 2**61 - 1."""
+    values = (values & _MERSENNE_PRIME) + (values >> np.uint64(61))
+    return np.where(values >= _MERSENNE_PRIME, values - _MERSENNE_PRIME, values)
+
+
+def _permute(hashes: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Universal hashes (a * h + b) mod 2**61 - 1 of 32-bit token hashes, one column per (a, b).
+
+    a and b are below 2**61, so a * h does not fit in 64 bits; it is split
+    into h * low 32 bits of a and h * high 29 bits of a, and the high part
+    is shifted by 2**32 using 2**61 = 1 (mod 2**61 - 1).
+    """
+    h = hashes[:, None]
+    low = _mod_mersenne(h * (a & _MAX_HASH))
+    high = h * (a >> np.uint64(32))
+    high = ((high & _LOW_29_BITS) << np.uint64(32)) + (high >> np.uint64(29))
+    return _mod_mersenne(_mod_mersenne(low + high) + b)
+
+
+def person_tokens(events: pd.DataFrame) -> pd.DataFrame:
+    """Return the distinct (person_id, token) pairs of organizations and tags in each career."""
+    orgs = events[["person_id", "organization"]].dropna()
+    orgs = orgs.assign(token="org:" + orgs["organization"].astype(str).map(normalize_name))
+    orgs = orgs[orgs["token"] != "org:"]
+
+    tags = events[["person_id", "tags"]].explode("tags").dropna()
+    tags = tags.assign(token="tag:" + tags["tags"].astype(str).str.strip().str.casefold())
+    tags = tags[tags["token"] != "tag:"]
+
+    return pd.concat([orgs[["person_id", "token"]], tags[["person_id", "token"]]]).drop_duplicates()
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class TrajectoryIndex:
+    """k-nearest-neighbour index over careers.
+
+    Each person is stored as three precomputed representations:
+
+    - timing: year x metatype occupancy relative to the HLP appointment year
+      (or, without one, to the start of the person's last role), binned into
+      `bin_years` periods within `window`
+    - sequence: metatype transition counts between consecutive events
+    - shared: a MinHash signature over the organizations and tags of the career
+
+    The first two are compared by cosine similarity and the signatures by
+    estimated Jaccard similarity. A query scores every indexed person in a
+    few array operations, and people can be added incrementally.
+    """
+
+    def __init__(self, num_perm: int = 64, window: Tuple[int, int] = (-40, 20), bin_years: int = 5,
+                 weights: Optional[Dict[str, float]] = None, seed: int = 1):
+        if (window[1] - window[0]) % bin_years:
+            raise ValueError("The window must be a whole number of bins")
+        self.window = window
+        self.bin_years = bin_years
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.metatypes: List[str] = list(dp.STANDARD_METATYPES)
+
+        rng = np.random.default_rng(seed)
+        self._hash_a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype="uint64")
+        self._hash_b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype="uint64")
+        self._token_hashes: Dict[str, int] = {}
+
+        self.person_ids: List[Any] = []
+        self.names: List[str] = []
+        self._positions: Dict[Any, int] = {}
+
+        bins = (window[1] - window[0]) // bin_years
+        m = len(self.metatypes)
+        self._timing = np.zeros((0, bins * m), dtype="float32")
+        self._sequence = np.zeros((0, m * m), dtype="float32")
+        self._signatures = np.zeros((0, num_perm), dtype="uint32")
+        self._has_tokens = np.zeros(0, dtype=bool)
+
+    @classmethod
+    def from_corpus(cls, events: pd.DataFrame, people: pd.DataFrame, **kwargs) -> "TrajectoryIndex":
+        """Build an index over a prepared corpus (see `data_processing.prepare_corpus`)."""
+        index = cls(**kwargs)
+        index.add(events, people)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.person_ids)
+
+    def __contains__(self, person_id: Any) -> bool:
+        return person_id in self._positions
+
+    def add(self, events: pd.DataFrame, people: pd.DataFrame) -> None:
+        """Add people and their events; people already in the index are skipped."""
+        new_people = people[~people["person_id"].isin(self._positions.keys())].drop_duplicates("person_id")
+        for start in range(0, len(new_people), ADD_BATCH_SIZE):
+            batch = new_people.iloc[start:start + ADD_BATCH_SIZE]
+            batch_events = events[events["person_id"].isin(batch["person_id"])]
+            self._add_batch(batch_events, batch)
+
+    def _add_batch(self, events: pd.DataFrame, people: pd.DataFrame) -> None:
+        """Vectorize one batch of new people and append them to the index."""
+        person_ids = people["person_id"].to_numpy()
+        rows = pd.Series(np.arange(len(people)), index=person_ids)
+
+        timing = self._timing_vectors(events, people, rows)
+        sequence = self._sequence_vectors(events, rows)
+        signatures, has_tokens = self._signatures_for(events, rows)
+
+        self._timing = np.concatenate([self._timing, timing])
+        self._sequence = np.concatenate([self._sequence, sequence])
+        self._signatures = np.concatenate([self._signatures, signatures])
+        self._has_tokens = np.concatenate([self._has_tokens, has_tokens])
+
+        for person_id, name in zip(person_ids, people["name"]):
+            self._positions[person_id] = len(self.person_ids)
+            self.person_ids.append(person_id)
+            self.names.append(name)
+
+    def _timing_vectors(self, events: pd.DataFrame, people: pd.DataFrame, rows: pd.Series) -> np.ndarray:
+        """Binned occupancy relative to each person's reference year, one row per person."""
+        lo, hi = self.window
+        years, m = hi - lo, len(self.metatypes)
+        grid = np.zeros((len(rows), years + 1, m), dtype="int32")
+
+        if len(events):
+            # Align on the HLP year, or on the start of the last role without one
+            last_start = events.groupby("person_id")["numeric_start"].max()
+            reference = people.set_index("person_id")["hlp_year"].fillna(last_start)
+            aligned = events.assign(hlp_year=events["person_id"].map(reference).to_numpy())
+            aligned = aligned[aligned["hlp_year"].notna().to_numpy()]
+
+            segments = _year_segments(aligned, relative=True)
+            first = np.clip(segments["first"].to_numpy(), lo, hi) - lo
+            last = np.clip(segments["last"].to_numpy() + 1, lo, hi) - lo
+            inside = first < last
+            row = rows.loc[segments["person_id"].to_numpy()[inside]].to_numpy()
+            column, _ = transitions.encode_categories(segments["metatype"][inside], categories=self.metatypes)
+
+            np.add.at(grid, (row, first[inside], column), 1)
+            np.add.at(grid, (row, last[inside], column), -1)
+
+        occupancy = np.cumsum(grid, axis=1)[:, :years]
+        binned = occupancy.reshape(len(rows), years // self.bin_years, self.bin_years, m).sum(axis=2)
+        return _normalize_rows(binned.reshape(len(rows), -1).astype("float32"))
+
+    def _sequence_vectors(self, events: pd.DataFrame, rows: pd.Series) -> np.ndarray:
+        """Flattened metatype transition counts, one row per person."""
+        m = len(self.metatypes)
+        vectors = np.zeros((len(rows), m * m), dtype="float32")
+        if len(events):
+            counts, _, groups = transitions.transition_counts(events, by="person", categories=self.metatypes)
+            vectors[rows.loc[groups].to_numpy()] = counts.reshape(len(groups), -1)
+        return _normalize_rows(vectors)
+
+    def _signatures_for(self, events: pd.DataFrame, rows: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """MinHash signatures over each person's organization and tag tokens."""
+        signatures = np.full((len(rows), len(self._hash_a)), _MAX_HASH, dtype="uint64")
+        has_tokens = np.zeros(len(rows), dtype=bool)
+
+        tokens = person_tokens(events) if len(events) else pd.DataFrame(columns=["person_id", "token"])
+        if len(tokens):
+            hashes = self._hash_tokens(tokens["token"])
+            token_rows = rows.loc[tokens["person_id"].to_numpy()].to_numpy()
+            order = np.argsort(token_rows, kind="stable")
+            token_rows, hashes = token_rows[order], hashes[order]
+
+            permuted = _permute(hashes, self._hash_a, self._hash_b) & _MAX_HASH
+            starts = np.flatnonzero(np.r_[True, token_rows[1:] != token_rows[:-1]])
+            signatures[token_rows[starts]] = np.minimum.reduceat(permuted, starts, axis=0)
+            has_tokens[token_rows[starts]] = True
+
+        return signatures.astype("uint32"), has_tokens
+
+    def _hash_tokens(self, tokens: pd.Series) -> np.ndarray:
+        """Hash tokens, memoized since the same organizations recur across careers."""
+        hashes = np.empty(len(tokens), dtype="uint64")
+        for i, token in enumerate(tokens):
+            value = self._token_hashes.get(token)
+            if value is None:
+                value = self._token_hashes[token] = _token_hash(token)
+            hashes[i] = value
+        return hashes
+
+    def _components(self, position: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compute the weighted score and its timing, sequence and shared components against one person."""
+        timing = self._timing @ self._timing[position]
+        sequence = self._sequence @ self._sequence[position]
+        shared = (self._signatures == self._signatures[position]).mean(axis=1)
+        shared[~self._has_tokens | ~self._has_tokens[position]] = 0.0
+
+        score = (self.weights["timing"] * timing + self.weights["sequence"] * sequence
+                 + self.weights["shared"] * shared) / sum(self.weights.values())
+        return score, timing, sequence, shared
+
+    def _frame(self, positions: np.ndarray, components: Tuple[np.ndarray, ...]) -> pd.DataFrame:
+        """Tabulate scores for the given index positions."""
+        score, timing, sequence, shared = (values[positions].astype("float64") for values in components)
+        return pd.DataFrame({
+            "person_id": [self.person_ids[p] for p in positions],
+            "name": [self.names[p] for p in positions],
+            "score": score,
+            "timing": timing,
+            "sequence": sequence,
+            "shared": shared
+        })
+
+    def scores(self, person_id: Any) -> pd.DataFrame:
+        """Return the similarity components and weighted score of every indexed person to one person."""
+        components = self._components(self._positions[person_id])
+        return self._frame(np.arange(len(self)), components)
+
+    def neighbors(self, person_id: Any, k: int = 5) -> pd.DataFrame:
+        """Return the k most similar other people, best first."""
+        position = self._positions[person_id]
+        components = self._components(position)
+        score = components[0].copy()
+        score[position] = -np.inf
+
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return self._frame(np.zeros(0, dtype="int64"), components)
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind="stable")]
+        return self._frame(top, components)
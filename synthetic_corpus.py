@@ -0,0 +1,310 @@
+"""Deterministic synthetic career-trajectory datasets for benchmarks.
+
+Generates people shaped like the bundled HLP dataset: the same metatype mix
+and role types, open-ended ("Present") roles, partial dates (YYYY-MM,
+YYYY-MM-DD, year ranges), events without usable dates and overlapping
+roles. The same seed always gives the same dataset, and each person only
+depends on the seed and its position, so corpora of any size are streamed
+to disk without being held in memory:
+
+    python -m synthetic_corpus corpus.json --events 1000000 --layout nested
+    python -m synthetic_corpus person.json --events 5000 --layout single
+
+Layouts are the three handled by `data_processing._extract_names_from_data`:
+a list of people, a nested list `[[person, ...]]` and a single person.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Any, Optional, Iterator
+
+from data_processing import CURRENT_YEAR
+
+
+GENERATOR_VERSION = 1
+LAYOUTS = ("list", "nested", "single")
+DEFAULT_EVENTS_PER_PERSON = 20
+
+# Metatype mix of the HLP dataset (events per metatype)
+METATYPE_WEIGHTS = {
+    "govt": 376,
+    "academic": 274,
+    "io": 260,
+    "ngo": 177,
+    "private": 141,
+    "honor": 110,
+    "foundation": 65,
+    "think_tank": 62,
+    "media": 23
+}
+
+ROLE_TYPES = {
+    "academic": ["education", "professor", "leadership", "student", "fellow", "researcher"],
+    "govt": ["civil_servant", "diplomat", "minister", "elected_official", "advisor", "leadership"],
+    "io": ["leadership", "panel_member", "advisor", "committee", "commissioner", "diplomat"],
+    "ngo": ["leadership", "member", "board_member", "advisor", "founder", "trustee"],
+    "private": ["board_member", "executive", "founder", "advisor", "leadership", "staff"],
+    "honor": ["award", "academic", "recognition", "fellowship", "title", "membership"],
+    "foundation": ["founder", "board_member", "trustee", "leadership", "chairman"],
+    "think_tank": ["fellow", "leadership", "advisor", "member", "founder", "board_member"],
+    "media": ["editor", "contributor", "author", "founder", "board_member"]
+}
+
+ORGANIZATIONS = {
+    "academic": ["University of {place}", "{place} School of Economics", "Institute of Technology, {place}"],
+    "govt": ["Ministry of Foreign Affairs, {place}", "Ministry of Finance, {place}", "Office of the President, {place}"],
+    "io": ["United Nations Development Programme", "World Bank", "International Monetary Fund",
+           "World Health Organization", "Permanent Mission of {place} to the United Nations"],
+    "ngo": ["{place} Red Cross", "Transparency International", "Oxfam {place}"],
+    "private": ["{place} Investment Bank", "{place} Telecom", "Global Consulting Group"],
+    "honor": ["Order of Merit, {place}", "Royal Academy of {place}", "Nobel Foundation"],
+    "foundation": ["{place} Foundation", "Gates Foundation", "Open Society Foundations"],
+    "think_tank": ["{place} Institute for Policy Studies", "Council on Foreign Relations", "Brookings Institution"],
+    "media": ["The {place} Times", "Project Syndicate", "{place} Broadcasting Corporation"]
+}
+
+PLACES = ["Ghana", "Norway", "Brazil", "India", "Japan", "Kenya", "Mexico", "Indonesia", "France",
+          "Egypt", "Chile", "Canada", "Thailand", "Nigeria", "Germany", "Peru"]
+
+NATIONALITIES = ["Ghanaian", "Norwegian", "Brazilian", "Indian", "Japanese", "Kenyan", "Mexican",
+                 "Indonesian", "French", "Egyptian", "Chilean", "Canadian", "Thai", "Nigerian", "German",
+                 "Peruvian"]
+
+TAGS = ["field_development", "field_economics", "field_technology", "global_north", "field_governance",
+        "field_finance", "field_international_relations", "global_south", "field_politics",
+        "field_diplomacy", "field_health", "global_governance", "field_education", "field_environment",
+        "field_law", "field_security"]
+
+# Panels with their year and their share of memberships in the HLP dataset
+PANELS = [
+    ("Post-2015 Development Agenda", 2012, 27),
+    ("Digital Cooperation", 2020, 22),
+    ("System-Wide Coherence", 2007, 15),
+    ("Threats, Challenges and Change", 2004, 15)
+]
+
+# Names include diacritics so name normalization is exercised
+FIRST_NAMES = ["Amina", "Kofi", "Ingrid", "José", "Yuki", "Wangari", "Rafael", "Siti", "Amélie", "Tarek",
+               "Michelle", "Raj", "Chiamaka", "Lars", "Zoë", "Mehmet", "Ngozi", "Hiroshi", "Łukasz", "Ana",
+               "Farida", "Gustavo", "Ellen", "Kwame", "Sun", "Helle", "Nomvula", "Ricardo", "Leila", "Erik"]
+LAST_NAMES = ["Mensah", "Brundtland", "Sánchez", "Tanaka", "Kamau", "Okonjo", "Silva", "Haddad", "Dupont",
+              "Sharma", "Müller", "Derviş", "Nakamura", "Bachelet", "Ngũgĩ", "Rahman", "Johansson", "Osei",
+              "Moreno", "Kim", "Al-Amin", "Petrov", "Sirleaf", "Cardoso", "Lagos", "Wu", "Okafor", "Berg",
+              "Pereira", "Diallo"]
+
+# Shares of events with each kind of date
+UNDATED_SHARE = 0.33        # no start and no end date, left out of the timeline
+END_ONLY_SHARE = 0.05       # only an end date, as for degrees
+OPEN_ENDED_SHARE = 0.2      # still held ("Present") before reaching the current year
+MONTH_SHARE = 0.05          # YYYY-MM
+DAY_SHARE = 0.03            # YYYY-MM-DD
+RANGE_SHARE = 0.02          # "1990-1995" in start_date with an empty end_date
+# Share of roles held alongside the previous one instead of after it
+OVERLAP_SHARE = 0.5
+# Years a typical career spans, spread over its events
+CAREER_YEARS = 60
+
+
+def person_name(person_id: int) -> str:
+    """Unique, deterministic name of a synthetic person."""
+    first = FIRST_NAMES[person_id % len(FIRST_NAMES)]
+    last = LAST_NAMES[(person_id // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    generation = person_id // (len(FIRST_NAMES) * len(LAST_NAMES))
+    return f"{first} {last}" if generation == 0 else f"{first} {last} {generation + 1}"
+
+
+def _point(rng: random.Random, year: int) -> str:
+    """Format a year as YYYY, or sometimes as YYYY-MM or YYYY-MM-DD."""
+    draw = rng.random()
+    if draw < DAY_SHARE:
+        return f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    if draw < DAY_SHARE + MONTH_SHARE:
+        return f"{year}-{rng.randint(1, 12):02d}"
+    return str(year)
+
+
+def _dates(rng: random.Random, start: int, end: Optional[int]) -> Dict[str, str]:
+    """Date fields of an event held from `start` to `end` (None while it is still held)."""
+    draw = rng.random()
+    if draw < UNDATED_SHARE:
+        return {"start_date": "", "end_date": ""}
+    if draw < UNDATED_SHARE + END_ONLY_SHARE:
+        return {"start_date": "", "end_date": str(end or start)}
+    if end is None:
+        return {"start_date": _point(rng, start), "end_date": rng.choice(["Present", "Present", "present"])}
+    if draw < UNDATED_SHARE + END_ONLY_SHARE + RANGE_SHARE and end > start:
+        return {"start_date": f"{start}-{end}", "end_date": ""}
+    start_date = _point(rng, start)
+    return {"start_date": start_date, "end_date": start_date if end == start else _point(rng, end)}
+
+
+def _event(rng: random.Random, metatype: str, role_type: str, start: int, end: Optional[int]) -> Dict[str, Any]:
+    """Build one career event."""
+    organization = rng.choice(ORGANIZATIONS[metatype]).format(place=rng.choice(PLACES))
+    role = role_type.replace("_", " ").title()
+    tags = rng.sample(TAGS, rng.randint(1, 3))
+    if role_type == "leadership":
+        tags.insert(0, "leadership")
+    dates = _dates(rng, start, end)
+    period = "-".join(d for d in (dates["start_date"], dates["end_date"]) if d)
+    return {
+        "metatype": metatype,
+        "type": f"{metatype}_{role_type}",
+        "tags": tags,
+        "organization": organization,
+        "role": role,
+        **dates,
+        "description": "",
+        "source_text": f"{role}, {organization}" + (f", {period}" if period else "")
+    }
+
+
+def generate_person(person_id: int, seed: int = 0,
+                    events_per_person: int = DEFAULT_EVENTS_PER_PERSON) -> Dict[str, Any]:
+    """Generate one person record; the same arguments always give the same record.
+
+    The number of events varies around `events_per_person` between half and
+    one and a half times it.
+    """
+    rng = random.Random(f"{seed}:{person_id}")
+    event_count = rng.randint(max(1, events_per_person // 2), max(1, events_per_person * 3 // 2))
+    metatypes = list(METATYPE_WEIGHTS)
+    weights = list(METATYPE_WEIGHTS.values())
+    mean_duration = max(1.0, CAREER_YEARS / event_count)
+
+    # Careers start with a degree and move on from there
+    year = rng.randint(1950, 1990)
+    events = [_event(rng, "academic", "student", year - 4, year)]
+    while len(events) < event_count:
+        metatype = rng.choices(metatypes, weights)[0]
+        role_type = rng.choice(ROLE_TYPES[metatype])
+        start = min(year + rng.randint(0, 1), CURRENT_YEAR)
+        if metatype == "honor":
+            end = start
+        else:
+            end = start + 1 + int(rng.expovariate(1 / mean_duration))
+            if end >= CURRENT_YEAR or rng.random() < OPEN_ENDED_SHARE:
+                end = None
+        events.append(_event(rng, metatype, role_type, start, end))
+        if rng.random() >= OVERLAP_SHARE:
+            year = start if end is None else end
+        # Long careers keep adding roles in their final years
+        if year >= CURRENT_YEAR:
+            year = CURRENT_YEAR - rng.randint(1, 10)
+
+    metadata: Dict[str, Any] = {"nationality": rng.choice(NATIONALITIES)}
+    if rng.random() < 0.85:
+        metadata["gender"] = rng.choice(["female", "male"])
+    panels = [(name, year) for name, year, _ in PANELS]
+    weights = [share for _, _, share in PANELS]
+    memberships = [rng.choices(panels, weights)[0]]
+    # A few people sat on two panels
+    if rng.random() < 0.05:
+        memberships.append(rng.choice([p for p in panels if p != memberships[0]]))
+    memberships.sort(key=lambda m: m[1])
+    metadata["hlp"], metadata["hlp_year"] = memberships[0]
+    metadata["hlp_memberships"] = [{"hlp": hlp, "hlp_year": hlp_year} for hlp, hlp_year in memberships]
+
+    return {"person": {"name": person_name(person_id), "metadata": metadata}, "career_events": events}
+
+
+def iter_people(people: int, seed: int = 0,
+                events_per_person: int = DEFAULT_EVENTS_PER_PERSON) -> Iterator[Dict[str, Any]]:
+    """Yield `people` generated person records in order."""
+    for person_id in range(people):
+        yield generate_person(person_id, seed, events_per_person)
+
+
+def generate_corpus(people: int, layout: str = "list", seed: int = 0,
+                    events_per_person: int = DEFAULT_EVENTS_PER_PERSON) -> Any:
+    """Generate a dataset in memory in one of the supported layouts."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    records = list(iter_people(1 if layout == "single" else people, seed, events_per_person))
+    if layout == "single":
+        return records[0]
+    return [records] if layout == "nested" else records
+
+
+def write_corpus(path: str, people: int, layout: str = "list", seed: int = 0,
+                 events_per_person: int = DEFAULT_EVENTS_PER_PERSON,
+                 indent: Optional[int] = 2) -> Dict[str, Any]:
+    """Stream a generated dataset to a JSON file and return a summary.
+
+    Records are written one at a time, so memory use does not depend on the
+    size of the dataset. The single layout holds one person with about
+    `events_per_person` events. The file is written atomically.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    if layout == "single":
+        people = 1
+    started = time.perf_counter()
+    depth = {"single": 0, "list": 1, "nested": 2}[layout]
+    separator = "\n" if indent is not None else ""
+    counts = {"people": 0, "events": 0}
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        for level in range(depth):
+            file.write(" " * (indent or 0) * level + "[" + separator)
+        prefix = " " * (indent or 0) * depth
+        for person_id, record in enumerate(iter_people(people, seed, events_per_person)):
+            text = json.dumps(record, ensure_ascii=False, indent=indent)
+            if indent is not None:
+                text = text.replace("\n", "\n" + prefix)
+            file.write(("," + separator if person_id else "") + prefix + text)
+            counts["people"] += 1
+            counts["events"] += len(record["career_events"])
+        for level in reversed(range(depth)):
+            file.write(separator + " " * (indent or 0) * level + "]")
+        file.write("\n")
+    os.replace(temp_path, path)
+
+    return {
+        "output": path,
+        "layout": layout,
+        "seed": seed,
+        "generator_version": GENERATOR_VERSION,
+        **counts,
+        "bytes": os.path.getsize(path),
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic career trajectory dataset.")
+    parser.add_argument("output", help="Output JSON file")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--people", type=int, default=None, help="Number of people (default: 100)")
+    size.add_argument("--events", type=int, default=None,
+                      help="Approximate number of career events; sets the number of people (or, for the "
+                           "single layout, the events of the one person)")
+    parser.add_argument("--events-per-person", type=int, default=DEFAULT_EVENTS_PER_PERSON,
+                        help=f"Average career events per person (default: {DEFAULT_EVENTS_PER_PERSON})")
+    parser.add_argument("--layout", choices=LAYOUTS, default="list", help="Dataset layout (default: list)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation, 0 for compact (default: 2)")
+    args = parser.parse_args(argv)
+
+    events_per_person = args.events_per_person
+    people = args.people or 100
+    if args.events is not None:
+        if args.layout == "single":
+            events_per_person = args.events
+        else:
+            people = max(1, math.ceil(args.events / events_per_person))
+
+    summary = write_corpus(args.output, people, args.layout, args.seed, events_per_person, args.indent or None)
+    print(f"{summary['people']} people, {summary['events']} events ({summary['bytes'] / 1e6:.1f} MB) "
+          f"in {summary['elapsed_seconds']:.2f}s -> {summary['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import pandas as pd
+
+import data_processing as dp
+import validation
+from person_index import PersonIndex
+
+
+def person(name, events, **metadata):
+    return {"person": {"name": name, "metadata": metadata}, "career_events": events}
+
+
+def event(role, start, end=None, metatype="government"):
+    return {"role": role, "metatype": metatype, "start_date": start, "end_date": end}
+
+
+GOOD = [
+    person("Anand Panyarachun", [event("Prime Minister", "1991", "1992")], hlp="HLP 2004", hlp_year=2004),
+    person("Kemal Derviş", [event("Minister", "2001-03", "2002"), event("Administrator", "2005", "2009", "io")]),
+    person("Graça Machel", [event("Minister of Education", "1975", "1989")]),
+]
+
+
+def test_bad_records_are_skipped_with_positions_kept():
+    records = [
+        GOOD[0],
+        "junk",
+        person("Kemal Derviş", GOOD[1]["career_events"][:1] + ["junk", 42] + GOOD[1]["career_events"][1:]),
+        {"person": "not an object"},
+        person("No Events", "junk"),
+        GOOD[2],
+    ]
+
+    events, people = dp.prepare_corpus(records)
+
+    index = PersonIndex(records)
+    assert people["person_id"].tolist() == [0, 2, 4, 5]
+    for person_id, name in zip(people["person_id"], people["name"]):
+        assert index.position(name) == person_id
+    assert sorted(set(events["person_id"])) == [0, 2, 5]
+    # Event positions still point into the original career_events lists
+    kemal = events[events["person_id"] == 2].sort_values("event_index")
+    assert kemal["event_index"].tolist() == [0, 3]
+    assert kemal["role"].tolist() == ["Minister", "Administrator"]
+
+    report = validation.validate_corpus(records, workers=1)
+    issues = report.issues
+    assert set(issues.loc[issues["code"] == validation.EVENT_NOT_OBJECT, "event_index"]) == {1, 2}
+    assert set(issues.loc[issues["code"] == validation.EVENT_NOT_OBJECT, "person_id"]) == {2}
+    assert report.invalid_people.tolist() == [1, 2, 3, 4]
+
+
+def test_bad_records_do_not_change_good_rows():
+    clean_events, clean_people = dp.prepare_corpus(GOOD)
+    events, people = dp.prepare_corpus([GOOD[0], "junk", GOOD[1], None, GOOD[2]])
+
+    # Same rows, with person ids shifted to the positions of the noisy list
+    shift = {0: 0, 1: 2, 2: 4}
+    clean_events["person_id"] = clean_events["person_id"].map(shift)
+    clean_people["person_id"] = clean_people["person_id"].map(shift)
+    pd.testing.assert_frame_equal(events, clean_events)
+    pd.testing.assert_frame_equal(people, clean_people)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processing as dp
+import dates
+import synthetic_corpus
+from dates import (PRECISION_DAY, PRECISION_INVALID, PRECISION_MISSING, PRECISION_MONTH, PRECISION_PRESENT,
+                   PRECISION_YEAR)
+
+
+def approx(value):
+    return pytest.approx(value, nan_ok=True)
+
+
+@pytest.mark.parametrize("text, earliest, latest, precision", [
+    ("1990", 1990, 1990, PRECISION_YEAR),
+    (" 1990 ", 1990, 1990, PRECISION_YEAR),
+    ("800", 800, 800, PRECISION_YEAR),
+    ("0", 0, 0, PRECISION_YEAR),
+    ("1999.0", 1999, 1999, PRECISION_YEAR),
+    ("1999.5", 1999.5, 1999.5, PRECISION_YEAR),
+    ("1990-01", 1990, 1990, PRECISION_MONTH),
+    ("1990-7", 1990.5, 1990.5, PRECISION_MONTH),
+    ("1990/07", 1990.5, 1990.5, PRECISION_MONTH),
+    ("1990-12", 1990 + 11 / 12, 1990 + 11 / 12, PRECISION_MONTH),
+    ("1990-01-01", 1990, 1990, PRECISION_DAY),
+    ("1990-07-02", 1990 + 182 / 365, 1990 + 182 / 365, PRECISION_DAY),
+    ("2000-12-31", 2000 + 365 / 366, 2000 + 365 / 366, PRECISION_DAY),
+    ("2000-02-29", 2000 + 59 / 366, 2000 + 59 / 366, PRECISION_DAY),
+    ("1990-1995", 1990, 1995, PRECISION_YEAR),
+    ("1990 - 1995", 1990, 1995, PRECISION_YEAR),
+    ("1990–1995", 1990, 1995, PRECISION_YEAR),
+    ("1990..1995", 1990, 1995, PRECISION_YEAR),
+    ("2001 to 2003-07", 2001, 2003.5, PRECISION_YEAR),
+    ("2001-07-01 to 2001-08", 2001 + 181 / 365, 2001 + 7 / 12, PRECISION_MONTH),
+    ("1990-present", 1990, np.nan, PRECISION_PRESENT),
+    ("2001-03 to present", 2001 + 2 / 12, np.nan, PRECISION_PRESENT),
+    ("present", np.nan, np.nan, PRECISION_PRESENT),
+    ("Ongoing", np.nan, np.nan, PRECISION_PRESENT),
+    ("", np.nan, np.nan, PRECISION_MISSING),
+    ("   ", np.nan, np.nan, PRECISION_MISSING),
+])
+def test_parse_partial_date(text, earliest, latest, precision):
+    assert dates.parse_partial_date(text) == (approx(earliest), approx(latest), precision)
+
+
+@pytest.mark.parametrize("text", [
+    "nan", "inf", "-inf", "1e3", "12345", "1999.", ".5", "-50", "1_999", "0x7C6",
+    "1990-13", "1990-00", "1990-02-30", "1990-1-1-1", "1995-1990", "present-1990",
+    "circa 1990", "1990s", "unknown", "1990-",
+])
+def test_invalid_dates(text):
+    assert dates.parse_partial_date(text) == (approx(np.nan), approx(np.nan), PRECISION_INVALID)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (1992, (1992, 1992, PRECISION_YEAR)),
+    (1992.5, (1992.5, 1992.5, PRECISION_YEAR)),
+    ("1992", (1992, 1992, PRECISION_YEAR)),
+    (None, (np.nan, np.nan, PRECISION_MISSING)),
+    (np.nan, (np.nan, np.nan, PRECISION_MISSING)),
+    (float("inf"), (np.nan, np.nan, PRECISION_MISSING)),
+    (True, (np.nan, np.nan, PRECISION_MISSING)),
+    ([1992], (np.nan, np.nan, PRECISION_MISSING)),
+])
+def test_parse_value(value, expected):
+    assert dates._parse_value(value) == tuple(approx(v) if not isinstance(v, str) else v for v in expected)
+
+
+def test_parse_date_column_bounds():
+    values = pd.Series(["1990-1995", 2001, None, "2001", "present", "junk", "1990-1995"], dtype=object)
+
+    start, start_precision = dates.parse_date_column(values, "start")
+    end, end_precision = dates.parse_date_column(values, "end")
+
+    np.testing.assert_array_equal(start, [1990, 2001, np.nan, 2001, np.nan, np.nan, 1990])
+    np.testing.assert_array_equal(end, [1995, 2001, np.nan, 2001, np.nan, np.nan, 1995])
+    assert start_precision.tolist() == end_precision.tolist() == [
+        PRECISION_YEAR, PRECISION_YEAR, PRECISION_MISSING, PRECISION_YEAR, PRECISION_PRESENT,
+        PRECISION_INVALID, PRECISION_YEAR]
+    with pytest.raises(ValueError):
+        dates.parse_date_column(values, "middle")
+
+
+def timeline(*events):
+    record = {"person": {"name": "A"}, "career_events": [
+        {"metatype": "government", "start_date": start, "end_date": end} for start, end in events]}
+    return dp.prepare_timeline_table([record], current_year=2025, sort=False)
+
+
+@pytest.mark.parametrize("start, end, numeric_start, numeric_end, open_ended", [
+    # A range or "present" in start_date supplies the missing end
+    ("1990-2005", "", 1990, 2005, False),
+    ("1990-2005", None, 1990, 2005, False),
+    ("1990-present", None, 1990, 2025, True),
+    ("2001-03 to 2003-07", "", 2001 + 2 / 12, 2003.5, False),
+    # An explicit end_date wins over the range
+    ("1990-1995", "2000", 1990, 2000, False),
+    # Single dates without an end still get the +5 default
+    ("1990", "", 1990, 1995, True),
+    ("2022", None, 2022, 2025, True),
+    ("2001-03", "present", 2001 + 2 / 12, 2025, True),
+    ("1999.0", "2001.5", 1999, 2001.5, False),
+    (1991, 1992, 1991, 1992, False),
+    ("1991", 1992, 1991, 1992, False),
+    ("1991", "junk", 1991, 1994, False),
+    ("1995", "1990", 1995, 1996, False),
+    ("", "1990", 1990, 1990, False),
+])
+def test_timeline_ends(start, end, numeric_start, numeric_end, open_ended):
+    row = timeline((start, end)).iloc[0]
+
+    assert row["numeric_start"] == pytest.approx(numeric_start)
+    assert row["numeric_end"] == pytest.approx(numeric_end)
+    assert row["is_open_ended"] == open_ended
+
+
+def test_synthetic_ranges_keep_their_end():
+    people = synthetic_corpus.generate_corpus(200, seed=0)
+    events = dp.prepare_timeline_table(people, sort=False)
+    ranges = events[events["end_date"].eq("") & events["start_date"].str.contains(r"^\d{4}-\d{4}$")]
+
+    assert len(ranges) > 0
+    np.testing.assert_array_equal(ranges["numeric_end"], ranges["start_date"].str[-4:].astype(float))
+    assert not ranges["is_open_ended"].any()
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_processing as dp
+
+pytest.importorskip("pyarrow")
+import event_store  # noqa: E402
+
+
+RECORDS = [
+    {"person": {"name": "Anand Panyarachun", "metadata": {"hlp": "HLP 2004", "hlp_year": 2004}},
+     "career_events": [
+         {"metatype": "government", "role": "Prime Minister", "start_date": 1991, "end_date": "1992",
+          "description": "Head of government"},
+         {"metatype": "private", "role": "Chairman", "organization": "Saha-Union", "start_date": "1991",
+          "end_date": None, "tags": ["field_business"]},
+     ]},
+    {"person": {"name": "Kemal Derviş", "metadata": {}},
+     "career_events": [
+         {"metatype": "government", "role": "Minister", "start_date": "2001-03", "end_date": 2002},
+         {"metatype": "io", "role": "Administrator", "start_date": 2005, "end_date": 2009.0,
+          "description": 12, "tags": ["field_economics", 7]},
+     ]},
+]
+
+
+@pytest.mark.parametrize("format", sorted(event_store.EVENT_STORE_SUFFIXES))
+def test_mixed_number_and_string_fields_round_trip(tmp_path, format):
+    dataset = tmp_path / "people.json"
+    dataset.write_text(json.dumps(RECORDS), encoding="utf-8")
+    path = event_store.event_store_path_for(str(dataset), format)
+    source = {"content_hash": "abc"}
+
+    built_events, built_people = event_store.load_or_build_corpus(path, source, lambda: RECORDS)
+    store = event_store.open_event_store(path, source)
+    assert store is not None
+    with store:
+        events, people = store.events(), store.people
+
+    built_events = built_events.sort_values(["person_id", "timeline_date"], kind="stable").reset_index(drop=True)
+    assert events["start_date"].tolist() == [str(v) for v in built_events["start_date"]]
+    assert events["end_date"].isna().tolist() == built_events["end_date"].isna().tolist()
+    assert events["end_date"].dropna().tolist() == [str(v) for v in built_events["end_date"].dropna()]
+    assert events["description"].dropna().tolist() == ["Head of government", "12"]
+    assert events["tags"].tolist() == [[], ["field_business"], [], ["field_economics", "7"]]
+    for column in ["person_id", "numeric_start", "numeric_end", "y_pos"]:
+        np.testing.assert_array_equal(events[column].to_numpy(), built_events[column].to_numpy())
+    assert people["name"].tolist() == built_people["name"].tolist()
+
+    # Dates read back as strings parse to the same years
+    reparsed = dp.prepare_timeline_table(events[["person_id", "person_name", "event_index"] + dp.EVENT_FIELDS])
+    np.testing.assert_array_equal(reparsed["numeric_start"].to_numpy(), built_events["numeric_start"].to_numpy())
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from interval_index import EventIntervalIndex
+
+
+METATYPES = ["government", "io", "private", "academic"]
+TYPES = ["Minister", "Director", "Professor", None]
+TAGS = ["field_economics", "gov_national", "region_africa"]
+
+
+def random_events(n, seed, undated_share=0.0):
+    rng = np.random.default_rng(seed)
+    # Whole and half years so many bounds coincide with query bounds
+    starts = rng.integers(1900, 2020, n) + rng.choice([0.0, 0.5], n)
+    ends = starts + rng.choice([0.0, 0.5, 1.0, 3.0, 10.0, 40.0], n)
+    undated = rng.random(n) < undated_share
+    starts[undated] = np.nan
+    ends[undated & (rng.random(n) < 0.5)] = np.nan
+    return pd.DataFrame({
+        "person_name": [f"Person {i % 37}" for i in range(n)],
+        "metatype": rng.choice(METATYPES, n),
+        "type": [TYPES[i] for i in rng.integers(0, len(TYPES), n)],
+        "tags": [sorted(set(rng.choice(TAGS, rng.integers(0, 3)))) for _ in range(n)],
+        "numeric_start": starts,
+        "numeric_end": ends
+    })
+
+
+def brute_force(events, start, end, metatype=None, type=None, tags=None):
+    mask = (events["numeric_start"] <= end) & (events["numeric_end"] >= start)
+    if metatype is not None:
+        mask &= events["metatype"].isin([metatype] if isinstance(metatype, str) else metatype)
+    if type is not None:
+        mask &= events["type"].isin([type] if isinstance(type, str) else type)
+    for tag in [tags] if isinstance(tags, str) else tags or []:
+        mask &= events["tags"].apply(lambda event_tags: tag in event_tags)
+    return np.flatnonzero(mask.to_numpy())
+
+
+# Sizes around the scan threshold (255) and the power-of-two tree levels
+SIZES = [0, 1, 2, 3, 7, 100, 255, 256, 257, 511, 1000, 4097]
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_stab_matches_brute_force(n):
+    events = random_events(n, seed=n)
+    index = EventIntervalIndex(events)
+
+    for year in [1850, 1900, 1900.5, 1950, 1987.25, 2000, 2019.5, 2059.5, 2100]:
+        assert index.stab(year).tolist() == brute_force(events, year, year).tolist()
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_overlap_matches_brute_force(n):
+    events = random_events(n, seed=n + 1)
+    index = EventIntervalIndex(events)
+    rng = np.random.default_rng(n)
+
+    for _ in range(30):
+        start = float(rng.integers(1880, 2080)) + rng.choice([0.0, 0.5])
+        end = start + float(rng.choice([0.0, 0.5, 1.0, 5.0, 30.0, 200.0]))
+        assert index.overlap(start, end).tolist() == brute_force(events, start, end).tolist()
+
+
+def test_empty_range_matches_nothing():
+    index = EventIntervalIndex(random_events(300, seed=1))
+
+    assert len(index.overlap(2000, 1990)) == 0
+
+
+@pytest.mark.parametrize("n, undated_share", [(10, 0.3), (300, 0.3), (2000, 0.3), (5, 1.0), (300, 1.0)])
+def test_undated_events_match_nothing(n, undated_share):
+    events = random_events(n, seed=n, undated_share=undated_share)
+    index = EventIntervalIndex(events)
+
+    for start, end in [(1900, 1900), (1950, 1960), (-np.inf, np.inf)]:
+        assert index.overlap(start, end).tolist() == brute_force(events, start, end).tolist()
+    dated = events.dropna(subset=["numeric_start", "numeric_end"])
+    assert index.year_range == pytest.approx((dated["numeric_start"].min(), dated["numeric_end"].max()), nan_ok=True)
+
+
+@pytest.mark.parametrize("filters", [
+    {"metatype": "io"},
+    {"metatype": ["government", "private"]},
+    {"metatype": "unknown"},
+    {"type": "Minister"},
+    {"type": ["Director", "Professor"]},
+    {"tags": "field_economics"},
+    {"tags": ["field_economics", "gov_national"]},
+    {"tags": "unknown"},
+    {"metatype": "government", "type": "Minister", "tags": "gov_national"},
+])
+def test_filters_match_brute_force(filters):
+    events = random_events(2000, seed=7)
+    index = EventIntervalIndex(events)
+
+    for start, end in [(1950, 1950), (1990, 2000), (1800, 2200)]:
+        assert index.overlap(start, end, **filters).tolist() == brute_force(events, start, end, **filters).tolist()
+
+
+def test_query_and_people():
+    events = random_events(500, seed=3)
+    index = EventIntervalIndex(events)
+    rows = brute_force(events, 1990, 1990, metatype="io")
+
+    pd.testing.assert_frame_equal(index.query(1990, metatype="io"), events.iloc[rows])
+    assert index.people(1990, metatype="io") == events["person_name"].iloc[rows].drop_duplicates().tolist()
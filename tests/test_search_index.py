@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from person_index import normalize_name
+from search_index import SearchIndex, _QueryParser, load_or_build_search_index
+
+
+EVENTS = pd.DataFrame([
+    {"person_id": 0, "person_name": "Kemal Derviş", "metatype": "io", "type": "Administrator",
+     "role": "Administrator", "organization": "United Nations Development Programme",
+     "tags": ["field_economics"], "start_date": "2005", "end_date": "2009",
+     "numeric_start": 2005.0, "numeric_end": 2009.0},
+    {"person_id": 0, "person_name": "Kemal Derviş", "metatype": "government", "type": "Minister",
+     "role": "Minister of Economic Affairs", "organization": "Government of Turkey",
+     "tags": ["field_economics", "gov_national"], "start_date": "2001-03", "end_date": "2002",
+     "numeric_start": 2001.17, "numeric_end": 2002.0},
+    {"person_id": 1, "person_name": "Anand Panyarachun", "metatype": "government", "type": "Prime Minister",
+     "role": "Prime Minister", "organization": "Government of Thailand",
+     "tags": ["gov_national"], "start_date": "1991", "end_date": "1992",
+     "numeric_start": 1991.0, "numeric_end": 1992.5},
+    {"person_id": 1, "person_name": "Anand Panyarachun", "metatype": "private", "type": "Chairman",
+     "role": "Chairman", "organization": "Saha-Union", "tags": [],
+     "start_date": "1991", "end_date": None, "numeric_start": 1991.0, "numeric_end": np.nan},
+    {"person_id": 2, "person_name": "Graça Machel", "metatype": "government", "type": "Minister",
+     "role": "Minister of Education", "organization": "Government of Mozambique",
+     "tags": ["field_education"], "start_date": "1975", "end_date": "1989",
+     "numeric_start": 1975.0, "numeric_end": 1989.0},
+    {"person_id": 2, "person_name": "Graça Machel", "metatype": "io", "type": "Board member",
+     "role": "Board member, Central Bank", "organization": "Bank of Mozambique",
+     "tags": [], "start_date": None, "end_date": None, "numeric_start": np.nan, "numeric_end": np.nan},
+    {"person_id": 3, "person_name": "Ngozi Okonjo-Iweala", "metatype": "io", "type": "Managing Director",
+     "role": "Managing Director", "organization": "Bank Central of Nigeria",
+     "tags": ["field_economics"], "start_date": "2007", "end_date": "2011",
+     "numeric_start": 2007.0, "numeric_end": 2011.0},
+])
+
+TEXT_COLUMNS = {"role": "role", "org": "organization", "person": "person_name"}
+
+
+def words(value):
+    return normalize_name(value or "").split()
+
+
+def rows(predicate):
+    return [row for row, event in EVENTS.iterrows() if predicate(event)]
+
+
+def has_word(word, *columns):
+    columns = columns or tuple(TEXT_COLUMNS.values())
+    return lambda event: any(word in words(event[column]) for column in columns)
+
+
+def active_in(first, last):
+    def predicate(event):
+        start, end = event["numeric_start"], event["numeric_end"]
+        if np.isnan(start) or np.isnan(end):
+            return False
+        return np.floor(start) <= last and max(np.floor(end), np.floor(start)) >= first
+    return predicate
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SearchIndex(EVENTS)
+
+
+def search(index, query):
+    result = index.search(query)
+    assert np.all(np.diff(result) > 0), "results must be sorted and unique"
+    return result.tolist()
+
+
+@pytest.mark.parametrize("query, predicate", [
+    ("minister", has_word("minister")),
+    ("role:minister", has_word("minister", "role")),
+    ("org:government", has_word("government", "organization")),
+    ("dervis", has_word("dervis")),
+    ("metatype:io", lambda e: e["metatype"] == "io"),
+    ("tag:field_economics", lambda e: "field_economics" in e["tags"]),
+    ("type:\"prime minister\"", lambda e: e["type"] == "Prime Minister"),
+    ("minister AND metatype:government", lambda e: has_word("minister")(e) and e["metatype"] == "government"),
+    ("minister metatype:government", lambda e: has_word("minister")(e) and e["metatype"] == "government"),
+    ("chairman OR administrator", lambda e: has_word("chairman")(e) or has_word("administrator")(e)),
+    ("NOT metatype:io", lambda e: e["metatype"] != "io"),
+    ("NOT NOT metatype:io", lambda e: e["metatype"] == "io"),
+    ("minister NOT prime", lambda e: has_word("minister")(e) and not has_word("prime")(e)),
+    ("metatype:io OR metatype:private AND tag:gov_national",
+     lambda e: e["metatype"] == "io" or (e["metatype"] == "private" and "gov_national" in e["tags"])),
+    ("(metatype:io OR metatype:private) AND bank",
+     lambda e: e["metatype"] in ("io", "private") and has_word("bank")(e)),
+    ("NOT (minister OR bank)", lambda e: not (has_word("minister")(e) or has_word("bank")(e))),
+    ("((minister) AND (NOT education))", lambda e: has_word("minister")(e) and not has_word("education")(e)),
+    ("govern*", lambda e: any(w.startswith("govern") for c in TEXT_COLUMNS.values() for w in words(e[c]))),
+    ("org:\"central bank\"", lambda e: "central bank" in " ".join(words(e["organization"]))),
+    ("\"central bank\"", lambda e: any("central bank" in " ".join(words(e[c])) for c in TEXT_COLUMNS.values())),
+    ("\"bank central\"", lambda e: any("bank central" in " ".join(words(e[c])) for c in TEXT_COLUMNS.values())),
+    ("year:1991", active_in(1991, 1991)),
+    ("year:1990..2000", active_in(1990, 2000)),
+    ("year:..1980", active_in(-np.inf, 1980)),
+    ("year:2008..", active_in(2008, np.inf)),
+    ("year:2002", active_in(2002, 2002)),
+    ("year:1990..2010 NOT metatype:government", lambda e: active_in(1990, 2010)(e) and e["metatype"] != "government"),
+    ("tag:field_economics AND year:2000..2006 OR person:machel",
+     lambda e: ("field_economics" in e["tags"] and active_in(2000, 2006)(e)) or has_word("machel", "person_name")(e)),
+])
+def test_query_matches_brute_force(index, query, predicate):
+    assert search(index, query) == rows(predicate)
+
+
+def test_phrase_does_not_span_columns(index):
+    # Row 4's organization ends with "Mozambique" and the person name that follows starts with "Graça"
+    assert search(index, "\"mozambique graca\"") == []
+    # Phrases are ordered
+    assert search(index, "\"minister prime\"") == []
+
+
+def test_empty_query_matches_nothing(index):
+    assert search(index, "") == []
+    assert search(index, "   ") == []
+
+
+@pytest.mark.parametrize("query", ["(minister", "minister)", "AND", "minister OR", "NOT", "year:abc",
+                                   "year:..", "unknown:value", "a \"unterminated"])
+def test_invalid_queries_raise_value_error(index, query):
+    with pytest.raises(ValueError):
+        index.search(query)
+
+
+def test_tokenizer():
+    assert _QueryParser._tokenize('(org:"central bank" OR dervis*) NOT year:1990..') == [
+        ("(", "("), ("term", 'org:"central bank"'), ("op", "OR"), ("term", "dervis*"), (")", ")"),
+        ("op", "NOT"), ("term", "year:1990..")
+    ]
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / "events.search.npz")
+    index.save(path, {"content_hash": "abc"})
+
+    loaded = SearchIndex.load(path, {"content_hash": "abc"})
+    assert loaded is not None
+    for query in ["minister", "\"central bank\"", "govern* AND year:1990..2000", "NOT tag:field_economics"]:
+        assert search(loaded, query) == search(index, query)
+    pd.testing.assert_frame_equal(loaded.events("minister").reset_index(drop=True),
+                                  index.events("minister").reset_index(drop=True), check_dtype=False)
+
+    assert SearchIndex.load(path, {"content_hash": "other"}) is None
+    assert SearchIndex.load(str(tmp_path / "missing.npz")) is None
+
+
+def test_load_or_build_rebuilds_stale_index(tmp_path):
+    path = str(tmp_path / "events.search.npz")
+    built = []
+
+    def events():
+        built.append(True)
+        return EVENTS
+
+    load_or_build_search_index(path, {"content_hash": "a"}, events)
+    load_or_build_search_index(path, {"content_hash": "a"}, events)
+    assert len(built) == 1
+    load_or_build_search_index(path, {"content_hash": "b"}, events)
+    assert len(built) == 2
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+import sidecar_index
+from sidecar_index import DiskDataset, content_hash, file_key, load_sidecar_index, sidecar_path_for
+
+
+def write_people(path, count=20000):
+    people = [{"person": {"name": f"Person {i:05d}", "metadata": {}},
+               "career_events": [{"metatype": "government", "role": "Minister", "start_date": "1990",
+                                  "end_date": "1995"}]} for i in range(count)]
+    path.write_text(json.dumps(people), encoding="utf-8")
+
+
+def unsampled_offset(path, text):
+    """Offset of `text` in a block the quick fingerprint does not read."""
+    data = path.read_bytes()
+    size = len(data)
+    step = max(size // sidecar_index._SAMPLE_COUNT, 1)
+    sampled = [(offset, offset + sidecar_index._SAMPLE_SIZE) for offset in range(0, size, step)]
+    sampled.append((max(size - sidecar_index._SAMPLE_SIZE, 0), size))
+    offset = data.find(text.encode("ascii"))
+    while offset != -1:
+        if not any(start <= offset < end for start, end in sampled):
+            return offset
+        offset = data.find(text.encode("ascii"), offset + 1)
+    pytest.skip("dataset too small to leave unsampled blocks")
+
+
+def test_same_size_edit_outside_samples_is_detected(tmp_path):
+    path = tmp_path / "people.json"
+    write_people(path)
+    with DiskDataset(str(path)) as dataset:
+        old_hash = dataset.source["content_hash"]
+    old_key = file_key(str(path))
+
+    offset = unsampled_offset(path, "Minister")
+    data = bytearray(path.read_bytes())
+    data[offset:offset + len("Minister")] = b"Ministre"
+    old_fingerprint = sidecar_index.quick_fingerprint(str(path))
+    path.write_bytes(bytes(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert sidecar_index.quick_fingerprint(str(path)) == old_fingerprint
+    assert file_key(str(path)) != old_key
+    assert load_sidecar_index(str(path)) is None
+    with DiskDataset(str(path)) as dataset:
+        assert dataset.source["content_hash"] == content_hash(str(path)) != old_hash
+
+
+def test_touched_file_keeps_its_sidecar(tmp_path):
+    path = tmp_path / "people.json"
+    write_people(path, 10)
+    index = DiskDataset(str(path))
+    index.close()
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    loaded = load_sidecar_index(str(path))
+    assert loaded is not None
+    assert loaded["source"]["mtime_ns"] == os.stat(path).st_mtime_ns
+    # The new time is recorded, so the next open skips the full hash
+    with open(sidecar_path_for(str(path)), encoding="utf-8") as file:
+        assert json.load(file)["source"]["mtime_ns"] == os.stat(path).st_mtime_ns
+
+
+def test_empty_file_raises_value_error(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError, match="empty"):
+        DiskDataset(str(path))
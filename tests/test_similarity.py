@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import similarity
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def test_permute_matches_exact_arithmetic():
+    rng = np.random.default_rng(0)
+    hashes = np.r_[rng.integers(0, 1 << 32, 500, dtype="uint64"), np.array([0, 1, (1 << 32) - 1], dtype="uint64")]
+    a = np.r_[rng.integers(1, MERSENNE_PRIME, 40, dtype="uint64"), np.array([1, MERSENNE_PRIME - 1], dtype="uint64")]
+    b = np.r_[rng.integers(0, MERSENNE_PRIME, 40, dtype="uint64"), np.array([0, MERSENNE_PRIME - 1], dtype="uint64")]
+
+    expected = np.array([[(int(h) * int(x) + int(y)) % MERSENNE_PRIME for x, y in zip(a, b)] for h in hashes],
+                        dtype="uint64")
+    np.testing.assert_array_equal(similarity._permute(hashes, a, b), expected)
+
+
+@pytest.mark.parametrize("shared", [0, 10, 50, 90, 100])
+def test_minhash_estimates_jaccard(shared):
+    # Two token sets of 100 with `shared` tokens in common
+    tokens = [f"tag:token{i}" for i in range(200 - shared)]
+    first, second = tokens[:100], tokens[100 - shared:]
+    index = similarity.TrajectoryIndex(num_perm=512, seed=3)
+
+    def signature(tokens):
+        hashes = np.array([similarity._token_hash(token) for token in tokens], dtype="uint64")
+        return (similarity._permute(hashes, index._hash_a, index._hash_b) & similarity._MAX_HASH).min(axis=0)
+
+    estimate = (signature(first) == signature(second)).mean()
+    assert estimate == pytest.approx(shared / (200 - shared), abs=0.07)
@@ -0,0 +1,99 @@
+import io
+import json
+
+import pytest
+
+import data_processing as dp
+
+
+PEOPLE = [
+    {"person": {"name": "Anand Panyarachun", "metadata": {"nationality": "Thailand"}},
+     "career": [{"title": "Prime Minister", "start_date": "1991", "end_date": 1992}]},
+    {"person": {"name": "Kemal Derviş", "metadata": {"nationality": "Türkiye"}},
+     "career": [{"title": "Ministre de l'Économie", "start_date": "2001-03", "end_date": None}]},
+    {"person": {"name": "Graça Machel", "metadata": {}}, "career": []},
+    {"person": {"name": "王毅", "metadata": {"notes": "é中 \\ \"quoted\""}},
+     "career": [{"title": "Minister", "start_date": 2013, "end_date": 12345678}]},
+]
+
+LAYOUTS = {
+    "list": PEOPLE,
+    "nested": [PEOPLE, [{"person": {"name": "Ignored"}, "career": []}]],
+    "single": PEOPLE[0],
+}
+
+# Chunk sizes small enough that records, strings and multi-byte characters straddle buffer edges
+CHUNK_SIZES = [1, 2, 3, 7, 64, dp.STREAM_CHUNK_SIZE]
+
+
+def write_dataset(path, data, indent):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        json.dump(data, file, ensure_ascii=False, indent=indent)
+
+
+def expected_records(layout):
+    return [PEOPLE[0]] if layout == "single" else PEOPLE
+
+
+@pytest.mark.parametrize("layout", sorted(LAYOUTS))
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_record_spans_point_at_record_bytes(tmp_path, layout, indent, chunk_size):
+    path = tmp_path / "people.json"
+    write_dataset(path, LAYOUTS[layout], indent)
+    content = path.read_bytes()
+
+    spans = list(dp._iter_record_spans(str(path), chunk_size))
+
+    assert [record for record, _, _ in spans] == expected_records(layout)
+    for record, start, end in spans:
+        assert json.loads(content[start:end].decode("utf-8")) == record
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_record_spans_with_crlf_and_padding(tmp_path, chunk_size):
+    path = tmp_path / "people.json"
+    text = "\r\n  [\r\n" + ",\r\n\t".join(json.dumps(p, ensure_ascii=False) for p in PEOPLE) + "\r\n]  \r\n"
+    path.write_bytes(text.encode("utf-8"))
+    content = path.read_bytes()
+
+    spans = list(dp._iter_record_spans(str(path), chunk_size))
+
+    assert len(spans) == len(PEOPLE)
+    for record, start, end in spans:
+        assert json.loads(content[start:end].decode("utf-8")) == record
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 8])
+def test_reader_offset_tracks_bytes(chunk_size):
+    text = '  "héllo wörld" 12345 [1, 2]  {"é": "中"} '
+    reader = dp._JsonStreamReader(io.StringIO(text), chunk_size)
+    raw = text.encode("utf-8")
+
+    values = []
+    while reader.peek():
+        start = reader.offset
+        values.append(reader.decode_value())
+        assert json.loads(raw[start:reader.offset].decode("utf-8")) == values[-1]
+
+    # A number at a buffer edge must not be cut short
+    assert values == ["héllo wörld", 12345, [1, 2], {"é": "中"}]
+    assert reader.offset == len(raw)
+
+
+def test_iter_person_records_matches_full_load(tmp_path):
+    path = tmp_path / "people.json"
+    write_dataset(path, LAYOUTS["nested"], 2)
+
+    assert list(dp.iter_person_records(str(path), chunk_size=16)) == PEOPLE
+    assert list(dp.iter_people_names(str(path), chunk_size=16)) == dp._extract_names_from_data(dp.load_json_file(str(path)))
+
+
+@pytest.mark.parametrize("text", ["", "[", '[{"person": {"name": "A"}}',
+                                  '[{"person": {"name": "A"}} {"person": {"name": "B"}}]'])
+def test_invalid_json_raises_value_error(tmp_path, text):
+    path = tmp_path / "broken.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(dp._iter_record_spans(str(path), chunk_size=4))
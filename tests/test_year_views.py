@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+import data_processing as dp
+import synthetic_corpus
+from interval_index import EventIntervalIndex
+from occupancy import OccupancyGrid
+from search_index import SearchIndex
+
+
+BUNDLED = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "data", "career_trajectories_03_dates_normalized_with_hlp.json")
+
+
+def bundled_records():
+    return dp._get_record_container(dp.load_json_file(BUNDLED))
+
+
+@pytest.fixture(scope="module", params=["bundled", "synthetic"])
+def views(request):
+    records = bundled_records() if request.param == "bundled" else synthetic_corpus.generate_corpus(300, seed=1)
+    events, people = dp.prepare_corpus(records)
+    return events, EventIntervalIndex(events), SearchIndex(events), OccupancyGrid.from_events(events, people)
+
+
+def test_calendar_years_agree_across_views(views):
+    events, interval_index, search_index, grid = views
+    occupancy = grid.to_frame(drop_empty=False)
+
+    for year in range(1950, 2026, 3):
+        rows = interval_index.active_in_years(year)
+        np.testing.assert_array_equal(rows, search_index.search(f"year:{year}"))
+
+        active = events.iloc[rows]
+        people = active.groupby("metatype")["person_id"].nunique()
+        expected = occupancy.loc[year] if year in occupancy.index else occupancy.iloc[0] * 0
+        assert people.reindex(occupancy.columns, fill_value=0).tolist() == expected.tolist()
+
+
+def test_year_ranges_agree_across_views(views):
+    _, interval_index, search_index, _ = views
+
+    for first, last in [(1960, 1969), (1990, 2000), (2015, 2015), (2018, 2024)]:
+        np.testing.assert_array_equal(interval_index.active_in_years(first, last),
+                                      search_index.search(f"year:{first}..{last}"))
+
+
+def test_roles_starting_late_in_the_year_count_for_it():
+    events, _ = dp.prepare_corpus(bundled_records())
+    index = EventIntervalIndex(events)
+
+    for name, start_date, year in [("Amina J. Mohammed", "2015-11", 2015),
+                                   ("Mary Chinery-Hesse", "2018-08-01", 2018)]:
+        matches = events.iloc[index.active_in_years(year)]
+        assert ((matches["person_name"] == name) & (matches["start_date"] == start_date)).any()
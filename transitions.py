@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple, Any, Optional
+
+import data_processing as dp
+
+
+# Label for values outside the most frequent categories and for missing values
+OTHER_LABEL = "other"
+CORPUS_LABEL = "All people"
+GROUPINGS = ("corpus", "hlp", "person")
+
+
+def _ordered(events: pd.DataFrame) -> pd.DataFrame:
+    """Return events in career order: by person, then by timeline date."""
+    return events.sort_values(["person_id", "timeline_date"], kind="stable")
+
+
+def encode_categories(values: pd.Series, max_categories: Optional[int] = None,
+                      categories: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
+    """Integer-code a categorical column.
+
+    With `max_categories` only the most frequent values keep their own code and
+    the rest share an "other" code. A fixed list of `categories` (which must
+    include "other") codes every value outside it as "other" instead. Missing
+    values are also coded as "other".
+    """
+    values = values.fillna(OTHER_LABEL).astype(str).replace("", OTHER_LABEL)
+    if categories is not None:
+        values = values.where(values.isin(categories), OTHER_LABEL)
+        return pd.Categorical(values, categories=categories).codes.astype("int64"), list(categories)
+    if max_categories is not None:
+        keep = values.value_counts().index[:max_categories]
+        values = values.where(values.isin(keep), OTHER_LABEL)
+
+    # Standard metatypes first in their usual order, then the rest alphabetically
+    present = set(values.unique())
+    categories = [m for m in dp.STANDARD_METATYPES if m in present and m != OTHER_LABEL]
+    categories += sorted(present - set(categories) - {OTHER_LABEL})
+    if OTHER_LABEL in present:
+        categories.append(OTHER_LABEL)
+
+    codes = pd.Categorical(values, categories=categories).codes.astype("int64")
+    return codes, categories
+
+
+def group_members(person_ids: np.ndarray, people: Optional[pd.DataFrame] = None,
+                  by: str = "corpus") -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+    """Assign each event's person to its groups for `by` in "corpus", "hlp" or "person".
+
+    Returns `(rows, codes, labels)`: position `rows[i]` of `person_ids` belongs
+    to group `codes[i]`. People on several HLP panels are in every one of
+    them; people without a panel are in none.
+    """
+    rows = np.arange(len(person_ids))
+    if by == "corpus":
+        return rows, np.zeros(len(person_ids), dtype="int64"), [CORPUS_LABEL]
+    if by == "person":
+        codes, uniques = pd.factorize(person_ids, sort=True)
+        if people is not None:
+            names = people.set_index("person_id")["name"]
+            return rows, codes.astype("int64"), [names.get(pid, pid) for pid in uniques]
+        return rows, codes.astype("int64"), list(uniques)
+    if by == "hlp":
+        if people is None:
+            raise ValueError("Grouping by HLP panel requires the people table")
+        memberships = dp.panel_memberships(people).drop_duplicates(["person_id", "hlp"])
+        labels = sorted(memberships["hlp"].unique())
+        groups = pd.DataFrame({
+            "person_id": memberships["person_id"].to_numpy(),
+            "group": pd.Categorical(memberships["hlp"], categories=labels).codes.astype("int64")
+        })
+        # An inner merge keeps the order of the events
+        members = pd.DataFrame({"row": rows, "person_id": person_ids}).merge(groups, on="person_id")
+        return members["row"].to_numpy(), members["group"].to_numpy(dtype="int64"), labels
+    raise ValueError(f"Unknown grouping: {by} (expected one of {', '.join(GROUPINGS)})")
+
+
+def transition_counts(events: pd.DataFrame, column: str = "metatype", people: Optional[pd.DataFrame] = None,
+                      by: str = "corpus", max_categories: Optional[int] = None,
+                      categories: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str], List[Any]]:
+    """Count transitions between consecutive events of each person.
+
+    Returns `(counts, categories, groups)` where `counts[g, i, j]` is the number
+    of times an event of category i was directly followed by one of category j
+    in the careers of group g. Self-transitions sit on the diagonal.
+    """
+    events = _ordered(events)
+    codes, categories = encode_categories(events[column], max_categories, categories)
+    person_ids = events["person_id"].to_numpy()
+    rows, groups, group_labels = group_members(person_ids, people, by)
+
+    # Transitions end at every event that follows one of the same person,
+    # and count once in every group of that person
+    follows = np.zeros(len(person_ids), dtype=bool)
+    follows[1:] = person_ids[1:] == person_ids[:-1]
+    keep = follows[rows]
+    rows, group = rows[keep], groups[keep]
+
+    k, g = len(categories), len(group_labels)
+    flat = (group * k + codes[rows - 1]) * k + codes[rows]
+    counts = np.bincount(flat, minlength=g * k * k).reshape(g, k, k)
+    return counts, categories, group_labels
+
+
+def transition_table(counts: np.ndarray, categories: List[str], groups: List[Any],
+                     include_self: bool = True) -> pd.DataFrame:
+    """Flatten transition counts into a long table of non-zero (group, source, target, count) rows."""
+    g, i, j = np.nonzero(counts)
+    table = pd.DataFrame({
+        "group": np.asarray(groups, dtype=object)[g],
+        "source": np.asarray(categories, dtype=object)[i],
+        "target": np.asarray(categories, dtype=object)[j],
+        "count": counts[g, i, j]
+    })
+    if not include_self:
+        table = table[table["source"] != table["target"]]
+    return table.sort_values(["group", "count"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+
+def career_runs(events: pd.DataFrame, column: str = "metatype",
+                max_categories: Optional[int] = None) -> pd.DataFrame:
+    """Collapse each career into runs of consecutive events with the same category.
+
+    A run's dwell time is the span from its earliest start to its latest end.
+    """
+    events = _ordered(events)
+    codes, categories = encode_categories(events[column], max_categories)
+    person_ids = events["person_id"].to_numpy()
+    if len(codes) == 0:
+        return pd.DataFrame(columns=["person_id", column, "start", "end", "dwell", "events"])
+
+    # A new run starts at every change of person or category
+    boundary = np.ones(len(codes), dtype=bool)
+    boundary[1:] = (person_ids[1:] != person_ids[:-1]) | (codes[1:] != codes[:-1])
+    run_starts = np.flatnonzero(boundary)
+
+    start = np.minimum.reduceat(events["numeric_start"].to_numpy(dtype="float64"), run_starts)
+    end = np.maximum.reduceat(events["numeric_end"].to_numpy(dtype="float64"), run_starts)
+    return pd.DataFrame({
+        "person_id": person_ids[run_starts],
+        column: np.asarray(categories, dtype=object)[codes[run_starts]],
+        "start": start,
+        "end": end,
+        "dwell": np.maximum(end - start, 0.0),
+        "events": np.diff(np.append(run_starts, len(codes)))
+    })
+
+
+def dwell_times(events: pd.DataFrame, column: str = "metatype", people: Optional[pd.DataFrame] = None,
+                by: str = "corpus", max_categories: Optional[int] = None) -> pd.DataFrame:
+    """Summarize how long people stay in each category before moving on, per group."""
+    runs = career_runs(events, column, max_categories)
+    rows, groups, group_labels = group_members(runs["person_id"].to_numpy(), people, by)
+    runs = runs.iloc[rows].assign(group=np.asarray(group_labels, dtype=object)[groups])
+
+    summary = runs.groupby(["group", column], sort=False)["dwell"].agg(
+        runs="size", mean_years="mean", median_years="median", max_years="max")
+    return summary.reset_index()
+
+
+def first_passage(events: pd.DataFrame, target: str = "io", column: str = "metatype") -> pd.DataFrame:
+    """Time and number of career steps from each person's first event to their first `target` event.
+
+    People who never reach the target have NaN years and steps.
+    """
+    events = _ordered(events)
+    person_ids = events["person_id"].to_numpy()
+    dates = events["timeline_date"].to_numpy(dtype="float64")
+
+    people_ids, first_rows = np.unique(person_ids, return_index=True)
+    hits = np.flatnonzero(events[column].to_numpy() == target)
+    hit_people, first_hits = np.unique(person_ids[hits], return_index=True)
+    hit_rows = hits[first_hits]
+
+    years = np.full(len(people_ids), np.nan)
+    steps = np.full(len(people_ids), np.nan)
+    slot = np.searchsorted(people_ids, hit_people)
+    years[slot] = dates[hit_rows] - dates[first_rows[slot]]
+    steps[slot] = hit_rows - first_rows[slot]
+
+    return pd.DataFrame({
+        "person_id": people_ids,
+        "person_name": events["person_name"].to_numpy()[first_rows],
+        "reached": ~np.isnan(years),
+        "years": years,
+        "steps": steps
+    })
+
+
+def first_passage_summary(passage: pd.DataFrame, people: Optional[pd.DataFrame] = None,
+                          by: str = "corpus") -> pd.DataFrame:
+    """Aggregate first-passage results per group: how many reached the target and how fast."""
+    rows, groups, group_labels = group_members(passage["person_id"].to_numpy(), people, by)
+    passage = passage.iloc[rows].assign(group=np.asarray(group_labels, dtype=object)[groups])
+    summary = passage.groupby("group", sort=False).agg(
+        people=("person_id", "size"),
+        reached=("reached", "sum"),
+        median_years=("years", "median"),
+        median_steps=("steps", "median"))
+    summary["share_reached"] = summary["reached"] / summary["people"]
+    return summary.reset_index()
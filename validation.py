@@ -0,0 +1,348 @@
+"""Validation of every person and career event in a career-trajectory dataset.
+
+Checks each record for the structure the app relies on and each event for
+required keys, parseable dates, end dates not before start dates and known
+metatypes. Large files are validated in chunks across a process pool:
+
+    python -m validation data/career_trajectories_03_dates_normalized_with_hlp.json
+
+The result is a `ValidationReport` holding one row per issue with its error
+code, which is small enough to persist next to the dataset.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, List, Tuple, Any, Optional, Iterable, Iterator, Callable
+
+import numpy as np
+import pandas as pd
+
+import dates
+import data_processing as dp
+
+
+VALIDATION_VERSION = 1
+VALIDATION_SUFFIX = ".validation.json"
+
+# People per chunk sent to a worker process
+CHUNK_SIZE = 1000
+
+# Keys every career event is expected to have
+REQUIRED_EVENT_KEYS = ["metatype", "organization", "role", "start_date", "end_date"]
+
+# Error codes. Person-level issues use event_index -1.
+NOT_A_PERSON = "not_a_person"          # record without a person object or name
+NO_EVENTS = "no_events"                # career_events missing, not a list or empty
+EVENT_NOT_OBJECT = "event_not_object"  # career event that is not a JSON object
+NO_DATE = "no_date"                    # neither start nor end date can be parsed; the event is dropped
+MISSING_KEY = "missing_key"            # required key absent (field names the key)
+INVALID_DATE = "invalid_date"          # date present but unparseable (field names the date)
+END_BEFORE_START = "end_before_start"  # end date earlier than the start date
+UNKNOWN_METATYPE = "unknown_metatype"  # metatype outside the standard list
+
+ISSUE_DESCRIPTIONS = {
+    NOT_A_PERSON: "Record has no person name",
+    NO_EVENTS: "No career events",
+    EVENT_NOT_OBJECT: "Career event is not an object",
+    NO_DATE: "No usable start or end date (event skipped)",
+    MISSING_KEY: "Required key missing",
+    INVALID_DATE: "Date cannot be parsed",
+    END_BEFORE_START: "End date before start date",
+    UNKNOWN_METATYPE: "Metatype outside the standard list"
+}
+
+# Issues that keep a person's record from being prepared at all. Events with
+# NO_DATE are dropped; every other issue is displayed with a fallback.
+PERSON_ERRORS = {NOT_A_PERSON, NO_EVENTS, EVENT_NOT_OBJECT}
+
+ISSUE_COLUMNS = ["person_id", "event_index", "code", "field"]
+ISSUE_DTYPES = {"person_id": "int64", "event_index": "int64", "code": "object", "field": "object"}
+
+
+def validation_path_for(json_path: str) -> str:
+    """Return the default path of the persisted validation report for a JSON dataset."""
+    return json_path + VALIDATION_SUFFIX
+
+
+def _person_issue(record: Any) -> Optional[str]:
+    """Return the person-level error code of a record, if any."""
+    if not dp._is_person_record(record):
+        return NOT_A_PERSON
+    events = record.get("career_events")
+    if not isinstance(events, list) or len(events) == 0:
+        return NO_EVENTS
+    return None
+
+
+def validate_records(records: Iterable[Any], first_person_id: int = 0) -> Dict[str, Any]:
+    """Validate a chunk of person records.
+
+    Structure is checked per record; dates and metatypes of all events in
+    the chunk are checked together with array operations. Returns the
+    issues as columns (see `ISSUE_COLUMNS`), the ids of invalid people and
+    the people and event counts.
+    """
+    issues: Dict[str, List[Any]] = {column: [] for column in ISSUE_COLUMNS}
+    event_columns: Dict[str, List[Any]] = {"person_id": [], "event_index": [], "metatype": [],
+                                           "start_date": [], "end_date": []}
+    people = 0
+
+    def add(person_id: int, event_index: int, code: str, field: str = "") -> None:
+        issues["person_id"].append(person_id)
+        issues["event_index"].append(event_index)
+        issues["code"].append(code)
+        issues["field"].append(field)
+
+    for person_id, record in enumerate(records, start=first_person_id):
+        people += 1
+        code = _person_issue(record)
+        if code is not None:
+            add(person_id, -1, code)
+            continue
+
+        for event_index, event in enumerate(record["career_events"]):
+            if not isinstance(event, dict):
+                add(person_id, event_index, EVENT_NOT_OBJECT)
+                continue
+            for key in REQUIRED_EVENT_KEYS:
+                if key not in event:
+                    add(person_id, event_index, MISSING_KEY, key)
+            event_columns["person_id"].append(person_id)
+            event_columns["event_index"].append(event_index)
+            for key in ["metatype", "start_date", "end_date"]:
+                event_columns[key].append(event.get(key))
+
+    events = pd.DataFrame(event_columns)
+    start, start_precision = dates.parse_date_column(events["start_date"], "start")
+    end, end_precision = dates.parse_date_column(events["end_date"], "end")
+    no_date = np.isnan(start) & np.isnan(end)
+
+    checks = [
+        (NO_DATE, "", no_date),
+        (INVALID_DATE, "start_date", start_precision == dates.PRECISION_INVALID),
+        (INVALID_DATE, "end_date", end_precision == dates.PRECISION_INVALID),
+        (END_BEFORE_START, "end_date", end < start),
+        (UNKNOWN_METATYPE, "metatype",
+         (events["metatype"].notna() & ~events["metatype"].isin(dp.STANDARD_METATYPES)).to_numpy())
+    ]
+    person_ids = events["person_id"].to_numpy(dtype="int64")
+    event_indices = events["event_index"].to_numpy(dtype="int64")
+    for code, field, mask in checks:
+        rows = np.flatnonzero(mask)
+        issues["person_id"].extend(person_ids[rows].tolist())
+        issues["event_index"].extend(event_indices[rows].tolist())
+        issues["code"].extend([code] * len(rows))
+        issues["field"].extend([field] * len(rows))
+
+    # People with a blocking issue, or none of whose events can be placed on a timeline
+    blocked = {person_id for person_id, code in zip(issues["person_id"], issues["code"]) if code in PERSON_ERRORS}
+    undated = pd.Series(no_date).groupby(person_ids).all()
+    invalid_people = sorted(blocked | set(undated.index[undated.to_numpy()].tolist()))
+
+    return {"people": people, "events": len(events) + issues["code"].count(EVENT_NOT_OBJECT),
+            "invalid_people": invalid_people, "issues": issues}
+
+
+def _chunks(records: Iterable[Any], chunk_size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Group records into lists of `chunk_size`, with the person id of each chunk's first record."""
+    chunk: List[Any] = []
+    first_person_id = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield first_person_id, chunk
+            first_person_id += len(chunk)
+            chunk = []
+    if chunk:
+        yield first_person_id, chunk
+
+
+class ValidationReport:
+    """Issues found in a dataset, one row per issue, with per-person verdicts.
+
+    `issues` has the columns person_id, event_index (-1 for person-level
+    issues), code and field. A person is invalid when their record cannot
+    be prepared or none of their events has a usable date.
+    """
+
+    def __init__(self, people: int = 0, events: int = 0, issues: Optional[pd.DataFrame] = None,
+                 invalid_people: Optional[Iterable[int]] = None):
+        self.people = people
+        self.events = events
+        if issues is None:
+            issues = pd.DataFrame({column: [] for column in ISSUE_COLUMNS})
+        self.issues = issues.astype(ISSUE_DTYPES).sort_values(
+            ["person_id", "event_index"], kind="stable").reset_index(drop=True)
+        self._invalid_people = np.unique(np.asarray(list(invalid_people or []), dtype="int64"))
+
+    @classmethod
+    def from_chunks(cls, results: Iterable[Dict[str, Any]]) -> "ValidationReport":
+        """Combine the results of `validate_records` calls into one report."""
+        people, events = 0, 0
+        invalid_people: List[int] = []
+        columns: Dict[str, List[Any]] = {column: [] for column in ISSUE_COLUMNS}
+        for result in results:
+            people += result["people"]
+            events += result["events"]
+            invalid_people.extend(result["invalid_people"])
+            for column in ISSUE_COLUMNS:
+                columns[column].extend(result["issues"][column])
+        return cls(people, events, pd.DataFrame(columns, columns=ISSUE_COLUMNS), invalid_people)
+
+    @property
+    def invalid_people(self) -> np.ndarray:
+        """Ids of people whose record cannot be displayed."""
+        return self._invalid_people
+
+    def is_valid(self, person_id: int) -> bool:
+        """Return whether a person's record can be displayed."""
+        i = np.searchsorted(self._invalid_people, person_id)
+        return not (i < len(self._invalid_people) and self._invalid_people[i] == person_id)
+
+    def person_issues(self, person_id: int) -> pd.DataFrame:
+        """Return the issues of one person."""
+        ids = self.issues["person_id"].to_numpy()
+        start, end = np.searchsorted(ids, person_id, side="left"), np.searchsorted(ids, person_id, side="right")
+        return self.issues.iloc[start:end]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of issues per error code."""
+        return {code: int(count) for code, count in self.issues["code"].value_counts().items()}
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the headline numbers of the report."""
+        return {
+            "people": self.people,
+            "events": self.events,
+            "invalid_people": int(len(self._invalid_people)),
+            "people_with_issues": int(self.issues["person_id"].nunique()),
+            "issues": int(len(self.issues)),
+            "counts": self.counts()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as compact, column-oriented JSON-serializable data."""
+        return {
+            "version": VALIDATION_VERSION,
+            "summary": self.summary(),
+            "invalid_people": self._invalid_people.tolist(),
+            "issues": {column: self.issues[column].tolist() for column in ISSUE_COLUMNS}
+        }
+
+    def save(self, path: str, source: Optional[Dict[str, Any]] = None) -> None:
+        """Write the report to a JSON file, atomically, tagged with the dataset `source`."""
+        payload = {**self.to_dict(), "source": source or {}}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(payload, file, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source: Optional[Dict[str, Any]] = None) -> Optional["ValidationReport"]:
+        """Read a report written by `save`.
+
+        Returns None if the file is missing or unreadable, was written by
+        another version, or does not match the expected `source`.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                payload = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if payload.get("version") != VALIDATION_VERSION:
+            return None
+        if source is not None and payload.get("source") != source:
+            return None
+
+        summary = payload["summary"]
+        return cls(summary["people"], summary["events"], pd.DataFrame(payload["issues"], columns=ISSUE_COLUMNS),
+                   payload["invalid_people"])
+
+
+def validate_corpus(records: Iterable[Any], workers: Optional[int] = None,
+                    chunk_size: int = CHUNK_SIZE) -> ValidationReport:
+    """Validate every record, in chunks spread over a process pool.
+
+    Records are consumed as a stream and at most a few chunks per worker
+    are in flight, so memory does not grow with the size of the corpus.
+    With one worker (the default) or a single chunk, records are validated
+    in this process.
+    """
+    workers = workers or 1
+    chunks = _chunks(records, chunk_size)
+    # A single chunk is not worth starting a pool for
+    head = list(itertools.islice(chunks, 2))
+    if workers <= 1 or len(head) < 2:
+        return ValidationReport.from_chunks(validate_records(chunk, first_person_id)
+                                            for first_person_id, chunk in itertools.chain(head, chunks))
+
+    results: List[Dict[str, Any]] = []
+    pending: List[Future] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for first_person_id, chunk in itertools.chain(head, chunks):
+            pending.append(executor.submit(validate_records, chunk, first_person_id))
+            while len(pending) > workers * 2:
+                results.append(pending.pop(0).result())
+        results.extend(future.result() for future in pending)
+    return ValidationReport.from_chunks(results)
+
+
+def validate_dataset(json_path: str, workers: Optional[int] = None,
+                     chunk_size: int = CHUNK_SIZE) -> ValidationReport:
+    """Stream a JSON dataset from disk and validate it across all CPUs."""
+    return validate_corpus(dp.iter_person_records(json_path), workers or os.cpu_count() or 1, chunk_size)
+
+
+def load_or_build_validation(cache_path: Optional[str], source: Dict[str, Any],
+                             records: Callable[[], Iterable[Any]],
+                             workers: Optional[int] = None) -> ValidationReport:
+    """Load a persisted report matching `source`, or validate `records()` and persist the report."""
+    if cache_path:
+        report = ValidationReport.load(cache_path, source)
+        if report is not None:
+            return report
+
+    report = validate_corpus(records(), workers)
+    if cache_path:
+        try:
+            report.save(cache_path, source)
+        except OSError:
+            # A read-only location only costs a re-validation next time
+            pass
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Validate every person and career event in a dataset.")
+    parser.add_argument("dataset", help="Career trajectory JSON file")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Write the full report as JSON (default: print the summary only)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"People per chunk (default: {CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = validate_dataset(args.dataset, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        from sidecar_index import content_hash
+        report.save(args.output, {"content_hash": content_hash(args.dataset)})
+
+    summary = report.summary()
+    print(f"{summary['people']} people, {summary['events']} events: {summary['issues']} issues, "
+          f"{summary['invalid_people']} invalid people in {elapsed:.2f}s")
+    for code, count in summary["counts"].items():
+        print(f"  {code:<18} {count}")
+    return 1 if summary["invalid_people"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple, Any, Optional, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+import data_processing as dp
+import profiling
+import visualization as viz
+
+
+# Default memory budget for cached per-person views
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def content_hash(content: Any) -> str:
+    """Hash raw bytes, or the canonical JSON form of already parsed data."""
+    if not isinstance(content, (bytes, bytearray, memoryview)):
+        content = json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """Roughly estimate the memory held by a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class DerivedDataCache:
+    """Thread-safe LRU cache with a memory budget for derived per-person data.
+
+    Entries are evicted least recently used first once the estimated size of
+    all entries exceeds `max_bytes`. Values larger than the budget are not
+    cached at all.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(dataset_hash: str, person_name: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        """Build a cache key from the dataset content hash, person and parameters."""
+        return (dataset_hash, person_name, tuple(sorted((params or {}).items())))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries to stay within budget."""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self._entries and (self.current_bytes > self.max_bytes or
+                                     (self.max_entries is not None and len(self._entries) > self.max_entries)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for a key, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            profiling.count("view_cache.misses")
+            value = compute()
+            self.put(key, value)
+        else:
+            profiling.count("view_cache.hits")
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry count, memory use and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+@profiling.profiled()
+def compute_person_view(data: Dict[str, Any], dpi: int = 200) -> Dict[str, Any]:
+    """Compute everything the person view displays: prepared data, stats and serialized figures."""
+    df_sorted, metatype_to_y = dp.prepare_timeline_data(data)
+    view: Dict[str, Any] = {"df": df_sorted, "metatype_to_y": metatype_to_y}
+
+    if len(df_sorted) < 2:
+        return view
+
+    # Serialize figures so cached entries do not hold live figure objects
+    timeline_fig = viz.plot_career_timeline_plotly(df_sorted, metatype_to_y, data)
+    with profiling.span("serialize.plotly_json"):
+        view["timeline_figure"] = timeline_fig.to_json()
+
+    longest_role, longest_duration = viz.find_longest_role(df_sorted)
+    view["longest_role"] = longest_role
+    view["longest_duration"] = longest_duration
+
+    metatype_counts = df_sorted["metatype"].value_counts()
+    view["stats"] = {
+        "event_count": len(df_sorted),
+        "career_span": df_sorted["timeline_date"].max() - df_sorted["timeline_date"].min(),
+        "most_common_type": metatype_counts.index[0] if not metatype_counts.empty else "N/A"
+    }
+
+    counts_table = metatype_counts.reset_index()
+    counts_table.columns = ["Type", "Count"]
+    view["metatype_counts"] = counts_table
+
+    # Both charts are drawn on one figure, which is released once encoded
+    fig = None
+    for name, plot in (("years_distribution_png", viz.plot_metatype_distribution_by_years),
+                       ("count_distribution_png", viz.plot_metatype_distribution)):
+        fig, _ = plot(df_sorted, encode=False, fig=fig)
+        view[name] = viz.figure_to_png(fig, dpi=dpi, bbox_inches='tight')
+    viz.close_figure(fig)
+
+    view["events_table"] = _build_events_table(df_sorted)
+
+    return view
+
+
+def _build_events_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Build the career events table shown below the charts."""
+    display_df = df.copy()
+    display_df["year"] = display_df["timeline_date"].astype(int)
+
+    # Span of each role as parsed, including roles whose end date could not be read;
+    # roles without a known end are labelled instead
+    is_open_ended = display_df["is_open_ended"].to_numpy(dtype=bool)
+    durations = display_df["numeric_end"] - display_df["numeric_start"]
+    display_df["duration"] = durations.map("{:.1f}".format).where(~is_open_ended, "Ongoing/No End Date")
+
+    # Add status column to indicate open-ended positions
+    display_df["status"] = np.where(is_open_ended, "Ongoing/No End Date", "Completed")
+
+    # Sort by year
+    display_df = display_df.sort_values("year")
+
+    # Display the table with better column names
+    display_columns = ["year", "metatype", "role", "organization", "duration", "status"]
+
+    return display_df[display_columns].rename(
+        columns={
+            "year": "Year",
+            "metatype": "Type",
+            "role": "Role",
+            "organization": "Organization",
+            "duration": "Duration (Years)",
+            "status": "Status"
+        }
+    )
+
+
+def cached_person_view(cache: DerivedDataCache, dataset_hash: str, data: Dict[str, Any],
+                       dpi: int = 200) -> Dict[str, Any]:
+    """Return the person view from the cache, computing it on a miss."""
+    key = cache.make_key(dataset_hash, data["person"]["name"], {"dpi": dpi})
+    return cache.get_or_compute(key, lambda: compute_person_view(data, dpi=dpi))
@@ -1,12 +1,35 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List, Any, Optional
+from typing import Dict, Tuple, List, Any, Optional, TYPE_CHECKING
 import io
-from matplotlib.figure import Figure
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import heapq
+
+import data_processing as dp
+import profiling
+
+# Rendering backends are imported on first use so importing this module stays cheap
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+def new_figure(figsize: Tuple[float, float], fig: Optional["Figure"] = None) -> "Figure":
+    """Return an empty Matplotlib figure drawn on a non-interactive Agg canvas.
+    
+    Figures are created through the object-oriented API rather than pyplot,
+    so nothing keeps them alive after the caller drops them. Passing an
+    existing `fig` clears and resizes it instead of allocating a new one.
+    """
+    if fig is not None:
+        fig.clear()
+        fig.set_size_inches(figsize)
+        return fig
+    
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
 
 
 def create_color_mapping(metatypes: List[str]) -> Dict[str, str]:
@@ -33,8 +56,16 @@ def create_color_mapping(metatypes: List[str]) -> Dict[str, str]:
     return color_map
 
 
-def prepare_visualization_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Prepare dataframe for visualization by adding sub-indices for overlapping events."""
+@profiling.profiled()
+def prepare_visualization_data(df: pd.DataFrame, layout: str = "year") -> pd.DataFrame:
+    """Prepare dataframe for visualization by adding sub-indices for overlapping events.
+    
+    With layout "year" events sharing a metatype and start year are spread out
+    in order of appearance; with layout "lanes" the spans of each metatype are
+    packed into lanes so overlapping positions never share a row. Frames with a
+    `person_id` column (e.g. from `prepare_timeline_table`) are laid out per
+    person in a single pass.
+    """
     df_sorted = df.copy()
     
     # Create a mapping of metatypes to colors
@@ -42,93 +73,157 @@ def prepare_visualization_data(df: pd.DataFrame) -> pd.DataFrame:
     color_map = create_color_mapping(metatypes)
     df_sorted["color"] = df_sorted["metatype"].map(color_map)
     
-    # Initialize sub_index column
-    df_sorted["sub_index"] = 0
+    person_keys = [df_sorted["person_id"]] if "person_id" in df_sorted.columns else []
     
-    # For each metatype-year combo, assign a sub-index to spread them out slightly
-    year_precision = 0.2  # Controls vertical spread within same metatype
-    
-    meta_year_tracker = {}
-    for idx, row in df_sorted.iterrows():
-        year_key = (row["metatype"], int(row["timeline_date"]))
-        if year_key not in meta_year_tracker:
-            meta_year_tracker[year_key] = 0
-        else:
-            meta_year_tracker[year_key] += 1
-        df_sorted.at[idx, "sub_index"] = meta_year_tracker[year_key]
+    if layout == "year":
+        # For each metatype-year combo, number events in order of appearance
+        year_keys = person_keys + [df_sorted["metatype"], np.trunc(df_sorted["timeline_date"])]
+        df_sorted["sub_index"] = df_sorted.groupby(year_keys, sort=False, dropna=False).cumcount()
+    elif layout == "lanes":
+        df_sorted["sub_index"] = assign_lanes(df_sorted, person_keys + [df_sorted["metatype"]])
+    else:
+        raise ValueError(f"Unknown layout: {layout}")
     
     # Adjust y position by sub_index offset
+    year_precision = 0.2  # Controls vertical spread within same metatype
     df_sorted["y_adjusted"] = df_sorted["y_pos"] + df_sorted["sub_index"] * year_precision
     
     return df_sorted
 
 
-def plot_career_timeline_plotly(df: pd.DataFrame, metatype_to_y: Dict[str, float], person_data: Dict[str, Any] = None):
-    """Create an interactive career timeline visualization with hover information using Plotly."""
+def assign_lanes(df: pd.DataFrame, group_keys: List[pd.Series]) -> np.ndarray:
+    """Pack event spans into the lowest free lane within each group.
+    
+    Uses greedy interval partitioning over spans sorted by start, so the number
+    of lanes in a group equals its maximum number of simultaneous positions.
+    Spans that only touch at an endpoint may share a lane.
+    """
+    n = len(df)
+    lanes = np.zeros(n, dtype="int64")
+    if n == 0:
+        return lanes
+    
+    group_ids = df.groupby(group_keys, sort=False, dropna=False).ngroup().to_numpy() if group_keys else np.zeros(n, dtype="int64")
+    starts = df["numeric_start"].to_numpy(dtype="float64")
+    ends = df["numeric_end"].to_numpy(dtype="float64")
+    order = np.lexsort((ends, starts, group_ids))
+    
+    active: List[Tuple[float, int]] = []  # (end, lane) of spans still open
+    free: List[int] = []  # lanes released by spans that have ended
+    next_lane = 0
+    current_group = None
+    
+    for i in order.tolist():
+        if group_ids[i] != current_group:
+            current_group = group_ids[i]
+            active, free, next_lane = [], [], 0
+        
+        while active and active[0][0] <= starts[i]:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = next_lane
+            next_lane += 1
+        heapq.heappush(active, (ends[i], lane))
+        lanes[i] = lane
+    
+    return lanes
+
+
+@profiling.profiled()
+def plot_career_timeline_plotly(df: pd.DataFrame, metatype_to_y: Dict[str, float], person_data: Dict[str, Any] = None,
+                                use_webgl: bool = False):
+    """Create an interactive career timeline visualization with hover information using Plotly.
+    
+    Events are drawn with one line trace per (metatype, open/closed) group and
+    one marker trace per metatype, so the number of traces does not grow with
+    the number of events. Set `use_webgl` to render them with `Scattergl`.
+    """
+    import plotly.graph_objects as go
+    
     # Prepare data with adjusted positions for overlapping events
     df_sorted = prepare_visualization_data(df)
     
     # Create figure
     fig = go.Figure()
+    scatter = go.Scattergl if use_webgl else go.Scatter
     
     # Get a color map for all metatypes
     unique_metatypes = df_sorted["metatype"].unique()
     color_map = create_color_mapping(unique_metatypes)
     
-    # Create a mapping of metatypes to their index (for y-axis positioning)
-    metatype_indices = {mt: i for i, mt in enumerate(sorted(unique_metatypes))}
-    
-    # Add position duration lines
-    for i, row in df_sorted.iterrows():
-        if 'numeric_start' in row and 'numeric_end' in row:
-            # Determine line style based on whether position is open-ended
-            is_open_ended = 'is_open_ended' in row and row['is_open_ended']
-            dash = 'dash' if is_open_ended else None
-            
-            # Create hover text
-            hover_text = f"<b>{row['role']}</b><br>" + \
-                         f"<b>Organization:</b> {row['organization']}<br>" + \
-                         f"<b>Type:</b> {row['metatype'].capitalize()}<br>"
-            
-            if is_open_ended:
-                hover_text += "<b>Duration:</b> Ongoing/No End Date"
-            else:
-                duration = row['numeric_end'] - row['numeric_start']
-                hover_text += f"<b>Duration:</b> {duration:.1f} years"
-            
-            # Add line for position duration
-            fig.add_trace(go.Scatter(
-                x=[row['numeric_start'], row['numeric_end']],
-                y=[row['y_adjusted'], row['y_adjusted']],
-                mode='lines',
-                line=dict(color=row['color'], width=4, dash=dash),
-                showlegend=False,
-                hoverinfo='none'
-            ))
-            
-            # Add marker for position start
-            fig.add_trace(go.Scatter(
-                x=[row['timeline_date']],
-                y=[row['y_adjusted']],
-                mode='markers',
-                marker=dict(
-                    color=row['color'],
-                    size=12,
-                    line=dict(color='black', width=1)
-                ),
-                name=row['metatype'].capitalize(),
-                text=hover_text,
-                hoverinfo='text',
-                hoverlabel=dict(bgcolor='white', font_size=12),
-                showlegend=False
-            ))
+    if "is_open_ended" in df_sorted.columns:
+        is_open_ended = df_sorted["is_open_ended"].fillna(False).astype(bool).to_numpy()
+    else:
+        is_open_ended = np.zeros(len(df_sorted), dtype=bool)
+    has_spans = "numeric_start" in df_sorted.columns and "numeric_end" in df_sorted.columns
+    
+    # Hover text fields for every event, passed to Plotly as customdata
+    if has_spans:
+        durations = (df_sorted["numeric_end"] - df_sorted["numeric_start"]).map("{:.1f} years".format)
+        duration_text = np.where(is_open_ended, "Ongoing/No End Date", durations)
+    else:
+        duration_text = np.full(len(df_sorted), "Ongoing/No End Date")
+    customdata = np.column_stack([
+        df_sorted["role"].astype(str),
+        df_sorted["organization"].astype(str),
+        df_sorted["metatype"].astype(str).str.capitalize(),
+        duration_text
+    ]).astype(object)
+    hovertemplate = ("<b>%{customdata[0]}</b><br>"
+                     "<b>Organization:</b> %{customdata[1]}<br>"
+                     "<b>Type:</b> %{customdata[2]}<br>"
+                     "<b>Duration:</b> %{customdata[3]}<extra></extra>")
+    
+    metatype_values = df_sorted["metatype"].to_numpy()
+    
+    # Add position duration lines, one trace per metatype and line style separated by None gaps
+    if has_spans:
+        starts = df_sorted["numeric_start"].to_numpy(dtype=object)
+        ends = df_sorted["numeric_end"].to_numpy(dtype=object)
+        ys = df_sorted["y_adjusted"].to_numpy(dtype=object)
+        for metatype in sorted(unique_metatypes):
+            for open_ended in (False, True):
+                mask = (metatype_values == metatype) & (is_open_ended == open_ended)
+                if not mask.any():
+                    continue
+                gaps = np.full(mask.sum(), None, dtype=object)
+                fig.add_trace(scatter(
+                    x=np.column_stack([starts[mask], ends[mask], gaps]).ravel(),
+                    y=np.column_stack([ys[mask], ys[mask], gaps]).ravel(),
+                    mode='lines',
+                    line=dict(color=color_map[metatype], width=4, dash='dash' if open_ended else None),
+                    showlegend=False,
+                    hoverinfo='none'
+                ))
+    
+    # Add markers for position starts, one trace per metatype with per-point hover data
+    for metatype in sorted(unique_metatypes):
+        mask = metatype_values == metatype
+        fig.add_trace(scatter(
+            x=df_sorted["timeline_date"].to_numpy()[mask],
+            y=df_sorted["y_adjusted"].to_numpy()[mask],
+            mode='markers',
+            marker=dict(
+                color=color_map[metatype],
+                size=12,
+                line=dict(color='black', width=1)
+            ),
+            name=metatype.capitalize(),
+            customdata=customdata[mask],
+            hovertemplate=hovertemplate,
+            hoverlabel=dict(bgcolor='white', font_size=12),
+            showlegend=False
+        ))
     
-    # Add HLP year vertical line if available
+    # Add a vertical line for each HLP appointment year, if available
     if person_data and 'person' in person_data and 'metadata' in person_data['person']:
-        hlp_year = person_data['person']['metadata'].get('hlp_year')
-        hlp_name = person_data['person']['metadata'].get('hlp', 'High-Level Panel')
-        
-        if hlp_year:
+        for membership in dp.hlp_memberships(person_data['person']['metadata']):
+            hlp_year = membership['hlp_year']
+            if not hlp_year:
+                continue
             try:
                 hlp_year_numeric = float(hlp_year)
                 
@@ -247,51 +342,313 @@ def plot_career_timeline_plotly(df: pd.DataFrame, metatype_to_y: Dict[str, float
     return fig
 
 
-def plot_career_timeline_matplotlib(df: pd.DataFrame, metatype_to_y: Dict[str, float]):
-    """Create a career timeline visualization showing trajectory between different roles."""
+@profiling.profiled()
+def plot_cohort_comparison_plotly(events: pd.DataFrame, people: pd.DataFrame, relative: bool = True,
+                                  use_webgl: bool = True):
+    """Overlay the careers of several people on a shared time axis, one row per person.
+    
+    With `relative` the x-axis is years relative to each person's HLP
+    appointment (the `rel_*` columns from `data_processing.align_to_hlp`),
+    otherwise calendar years. All events are drawn with one line trace per
+    (metatype, open/closed) group and one marker trace per metatype, so a whole
+    panel renders with a handful of WebGL traces.
+    """
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    scatter = go.Scattergl if use_webgl else go.Scatter
+    
+    if len(events) == 0:
+        return fig
+    
+    start_col, end_col, marker_col = (("rel_start", "rel_end", "rel_timeline") if relative
+                                      else ("numeric_start", "numeric_end", "timeline_date"))
+    
+    # One row per person, ordered by panel year, panel and name
+    cohort = people[people["person_id"].isin(events["person_id"].unique())]
+    cohort = cohort.sort_values(["hlp_year", "hlp", "name"], na_position="last").reset_index(drop=True)
+    row_of = pd.Series(np.arange(len(cohort)), index=cohort["person_id"])
+    
+    # Spread overlapping spans of a person over lanes within their row
+    lanes = assign_lanes(events.assign(numeric_start=events[start_col], numeric_end=events[end_col]),
+                         [events["person_id"]])
+    max_lane = pd.Series(lanes, index=events.index).groupby(events["person_id"]).transform("max").to_numpy()
+    offsets = np.where(max_lane > 0, (lanes / np.maximum(max_lane, 1) - 0.5) * 0.6, 0.0)
+    y = events["person_id"].map(row_of).to_numpy(dtype=float) - offsets
+    
+    unique_metatypes = events["metatype"].unique()
+    color_map = create_color_mapping(unique_metatypes)
+    metatype_values = events["metatype"].to_numpy()
+    
+    if "is_open_ended" in events.columns:
+        is_open_ended = events["is_open_ended"].fillna(False).astype(bool).to_numpy()
+    else:
+        is_open_ended = np.zeros(len(events), dtype=bool)
+    
+    starts = events[start_col].to_numpy(dtype=object)
+    ends = events[end_col].to_numpy(dtype=object)
+    ys = y.astype(object)
+    
+    years = (events["numeric_start"].map("{:.0f}".format) + "–" +
+             events["numeric_end"].map("{:.0f}".format).where(~is_open_ended, "ongoing"))
+    customdata = np.column_stack([
+        events["person_name"].astype(str),
+        events["role"].astype(str),
+        events["organization"].astype(str),
+        years
+    ]).astype(object)
+    hovertemplate = ("<b>%{customdata[0]}</b><br>"
+                     "%{customdata[1]}<br>"
+                     "<b>Organization:</b> %{customdata[2]}<br>"
+                     "<b>Years:</b> %{customdata[3]}<extra>%{fullData.name}</extra>")
+    
+    for metatype in sorted(unique_metatypes):
+        is_metatype = metatype_values == metatype
+        
+        for open_ended in (False, True):
+            mask = is_metatype & (is_open_ended == open_ended)
+            if not mask.any():
+                continue
+            gaps = np.full(mask.sum(), None, dtype=object)
+            fig.add_trace(scatter(
+                x=np.column_stack([starts[mask], ends[mask], gaps]).ravel(),
+                y=np.column_stack([ys[mask], ys[mask], gaps]).ravel(),
+                mode='lines',
+                line=dict(color=color_map[metatype], width=3, dash='dash' if open_ended else None),
+                legendgroup=metatype,
+                showlegend=False,
+                hoverinfo='none'
+            ))
+        
+        fig.add_trace(scatter(
+            x=events[marker_col].to_numpy()[is_metatype],
+            y=y[is_metatype],
+            mode='markers',
+            marker=dict(color=color_map[metatype], size=7, line=dict(color='black', width=1)),
+            name=metatype.capitalize(),
+            legendgroup=metatype,
+            customdata=customdata[is_metatype],
+            hovertemplate=hovertemplate
+        ))
+    
+    if relative:
+        fig.add_vline(
+            x=0,
+            line=dict(color='red', width=2, dash='dot'),
+            annotation_text="HLP appointment",
+            annotation_position="top"
+        )
+    
+    fig.update_layout(
+        title='Career Trajectories Compared' + (' (Aligned on HLP Year)' if relative else ''),
+        xaxis=dict(
+            title='Years Relative to HLP Appointment' if relative else 'Year',
+            gridcolor='lightgrey',
+            zeroline=False
+        ),
+        yaxis=dict(
+            tickvals=list(range(len(cohort))),
+            ticktext=cohort["name"].tolist(),
+            autorange='reversed',
+            gridcolor='#f0f0f0',
+            zeroline=False
+        ),
+        height=max(400, 30 * len(cohort) + 150),
+        plot_bgcolor='#f8f9fa',
+        hovermode='closest',
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='right',
+            x=1
+        ),
+        margin=dict(l=20, r=20, t=80, b=20)
+    )
+    
+    return fig
+
+
+@profiling.profiled()
+def plot_metatype_occupancy_heatmap(occupancy: pd.DataFrame, relative: bool = False, share: bool = False):
+    """Heatmap of how many people held each metatype of role in each year.
+
+    `occupancy` is a year-indexed frame with one column per metatype, as
+    returned by `OccupancyGrid.to_frame`. With `share` each cell shows its
+    fraction of that year's column total instead of the raw count.
+    """
+    import plotly.graph_objects as go
+
+    counts = occupancy.to_numpy().T
+    values = counts
+    if share:
+        totals = counts.sum(axis=0, keepdims=True)
+        values = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+    x_title = "Years relative to HLP appointment" if relative else "Year"
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=occupancy.index.to_numpy(),
+        y=[str(metatype).capitalize() for metatype in occupancy.columns],
+        customdata=counts,
+        colorscale="Blues",
+        colorbar=dict(title="Share" if share else "People"),
+        hovertemplate=f"{x_title}: %{{x}}<br>%{{y}}: %{{customdata}} people<extra></extra>"
+    ))
+
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis=dict(autorange="reversed"),
+        height=max(300, 40 * len(occupancy.columns) + 120),
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    if relative:
+        fig.add_vline(x=0, line_width=1, line_dash="dash", line_color="black")
+
+    return fig
+
+
+def _hex_to_rgba(color: str, alpha: float) -> str:
+    """Convert a '#rrggbb' color to an rgba() string with the given opacity."""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r},{g},{b},{alpha})"
+
+
+@profiling.profiled()
+def plot_transition_sankey(counts: np.ndarray, categories: List[str], include_self: bool = False):
+    """Sankey diagram of transitions between consecutive career events.
+
+    `counts[i, j]` is the number of moves from category i to category j, as
+    one group of `transitions.transition_counts`. Each category appears once
+    as a source on the left and once as a target on the right, so moves back
+    and forth do not form cycles.
+    """
+    import plotly.graph_objects as go
+
+    counts = np.array(counts)
+    if not include_self:
+        np.fill_diagonal(counts, 0)
+
+    k = len(categories)
+    color_map = create_color_mapping(categories)
+    node_colors = [color_map[c] for c in categories]
+    labels = [str(c).replace("_", " ").capitalize() for c in categories]
+
+    source, target = np.nonzero(counts)
+    fig = go.Figure(go.Sankey(
+        arrangement="snap",
+        node=dict(
+            label=labels + labels,
+            color=node_colors + node_colors,
+            pad=12,
+            thickness=14,
+            hovertemplate="%{label}: %{value} moves<extra></extra>"
+        ),
+        link=dict(
+            source=source,
+            target=target + k,
+            value=counts[source, target],
+            color=[_hex_to_rgba(node_colors[i], 0.35) for i in source],
+            hovertemplate="%{source.label} → %{target.label}: %{value}<extra></extra>"
+        )
+    ))
+
+    fig.update_layout(height=max(400, 28 * k + 120), margin=dict(l=20, r=20, t=40, b=20))
+    return fig
+
+
+@profiling.profiled()
+def plot_transition_heatmap(counts: np.ndarray, categories: List[str], normalize: bool = True):
+    """Heatmap of the transition matrix, optionally as row-normalized move probabilities."""
+    import plotly.graph_objects as go
+
+    counts = np.asarray(counts)
+    values = counts
+    if normalize:
+        totals = counts.sum(axis=1, keepdims=True)
+        values = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+    labels = [str(c).replace("_", " ").capitalize() for c in categories]
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=labels,
+        y=labels,
+        customdata=counts,
+        colorscale="Blues",
+        colorbar=dict(title="Probability" if normalize else "Moves"),
+        hovertemplate="%{y} → %{x}: %{customdata} moves<extra></extra>"
+    ))
+
+    fig.update_layout(
+        xaxis_title="Next event",
+        yaxis_title="Previous event",
+        yaxis=dict(autorange="reversed"),
+        height=max(400, 28 * len(categories) + 160),
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+
+@profiling.profiled()
+def plot_career_timeline_matplotlib(df: pd.DataFrame, metatype_to_y: Dict[str, float],
+                                    dpi: int = 300, encode: bool = True,
+                                    fig: Optional["Figure"] = None) -> Tuple["Figure", Optional[bytes]]:
+    """Create a career timeline visualization showing trajectory between different roles.
+    
+    Position spans are drawn as one `LineCollection` per line style. The PNG is
+    only rendered when `encode` is true; otherwise None is returned in its
+    place and the figure can be encoded later with `figure_to_png`. An
+    existing `fig` is cleared and reused.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+    
     # Prepare data with adjusted positions for overlapping events
     df_sorted = prepare_visualization_data(df)
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = new_figure((12, 6), fig)
+    ax = fig.add_subplot()
     
     # Create lists to populate the legend
     legend_elements = []
     
-    # Draw duration lines for each position
-    completed_added = False
-    ongoing_added = False
-    
-    for i, row in df_sorted.iterrows():
-        if 'numeric_start' in row and 'numeric_end' in row:
-            # Determine line style based on whether position is open-ended
-            is_open_ended = 'is_open_ended' in row and row['is_open_ended']
-            linestyle = 'dashed' if is_open_ended else 'solid'
-            
-            # Draw horizontal line indicating position duration
-            line = ax.plot(
-                [row['numeric_start'], row['numeric_end']], 
-                [row['y_adjusted'], row['y_adjusted']], 
-                color=row['color'], 
-                linewidth=3, 
+    # Draw duration lines for all positions, one collection per line style
+    if 'numeric_start' in df_sorted.columns and 'numeric_end' in df_sorted.columns:
+        if 'is_open_ended' in df_sorted.columns:
+            is_open_ended = df_sorted['is_open_ended'].fillna(False).astype(bool).to_numpy()
+        else:
+            is_open_ended = np.zeros(len(df_sorted), dtype=bool)
+        
+        y = df_sorted['y_adjusted'].to_numpy(dtype=float)
+        segments = np.stack([
+            np.column_stack([df_sorted['numeric_start'].to_numpy(dtype=float), y]),
+            np.column_stack([df_sorted['numeric_end'].to_numpy(dtype=float), y])
+        ], axis=1)
+        colors = df_sorted['color'].to_numpy()
+        
+        styles = {
+            False: ('solid', 'Completed Position'),
+            True: ('dashed', 'Ongoing/No End Date')
+        }
+        # Legend entries follow the order in which each style first appears
+        first_seen = sorted(styles, key=lambda style: np.argmax(is_open_ended == style))
+        for open_ended in first_seen:
+            mask = is_open_ended == open_ended
+            if not mask.any():
+                continue
+            linestyle, label = styles[open_ended]
+            ax.add_collection(LineCollection(
+                segments[mask],
+                colors=colors[mask],
+                linewidths=3,
                 alpha=0.8,
-                linestyle=linestyle,
+                linestyles=linestyle,
                 zorder=3
-            )[0]
-            
-            # Add to legend only once for each type
-            if is_open_ended and not ongoing_added:
-                legend_elements.append(
-                    plt.Line2D([0], [0], color='black', lw=2, linestyle='dashed', 
-                               label='Ongoing/No End Date')
-                )
-                ongoing_added = True
-            elif not is_open_ended and not completed_added:
-                legend_elements.append(
-                    plt.Line2D([0], [0], color='black', lw=2, 
-                               label='Completed Position')
-                )
-                completed_added = True
+            ))
+            legend_elements.append(
+                Line2D([0], [0], color='black', lw=2, linestyle=linestyle, label=label)
+            )
     
     # Plot dots for each event (after lines so they appear on top)
     scatter = ax.scatter(
@@ -313,7 +670,7 @@ def plot_career_timeline_matplotlib(df: pd.DataFrame, metatype_to_y: Dict[str, f
     for metatype in sorted(all_metatypes):
         color = color_map.get(metatype, color_map.get('other', '#7f7f7f'))
         legend_elements.append(
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=color,
+            Line2D([0], [0], marker='o', color='w', markerfacecolor=color,
                       markeredgecolor='black', markersize=8, label=metatype.capitalize())
         )
     
@@ -350,28 +707,53 @@ def plot_career_timeline_matplotlib(df: pd.DataFrame, metatype_to_y: Dict[str, f
     ax.legend(handles=legend_elements, loc='upper center', bbox_to_anchor=(0.5, 1.15),
               ncol=min(5, len(legend_elements)), frameon=True, fancybox=True, shadow=True)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Convert plot to image bytes
+    return fig, figure_to_png(fig, dpi=dpi, bbox_inches='tight') if encode else None
+
+
+@profiling.profiled()
+def figure_to_png(fig: "Figure", dpi: int = 300, **savefig_kwargs) -> bytes:
+    """Encode a Matplotlib figure as PNG bytes."""
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=300, bbox_inches='tight')
-    buf.seek(0)
+    fig.savefig(buf, format="png", dpi=dpi, **savefig_kwargs)
+    profiling.count("png_bytes", buf.tell())
+    return buf.getvalue()
+
+
+def close_figure(fig: "Figure") -> None:
+    """Release the artists of a figure created by one of the Matplotlib renderers.
     
-    return fig, buf.getvalue()
+    The renderers do not register figures with pyplot, so dropping the last
+    reference frees a figure too; this releases its memory right away.
+    """
+    fig.clear()
 
-def plot_metatype_distribution(df: pd.DataFrame) -> Tuple[Figure, bytes]:
-    """Create a visualization showing distribution of career events by metatype."""
+
+@profiling.profiled()
+def plot_metatype_distribution(df: pd.DataFrame, dpi: int = 300, encode: bool = True,
+                               fig: Optional["Figure"] = None) -> Tuple["Figure", Optional[bytes]]:
+    """Create a visualization showing distribution of career events by metatype.
+    
+    The PNG is only rendered when `encode` is true; otherwise None is returned
+    in its place. An existing `fig` is cleared and reused.
+    """
     metatype_counts = df["metatype"].value_counts()
     
     # Prepare color mapping
     color_map = create_color_mapping(metatype_counts.index)
     colors = [color_map[metatype] for metatype in metatype_counts.index]
     
-    fig, ax = plt.subplots(figsize=(8, 5))
-    bars = metatype_counts.plot(kind='bar', ax=ax, color=colors)
+    fig = new_figure((8, 5), fig)
+    ax = fig.add_subplot()
+    positions = np.arange(len(metatype_counts))
+    bars = ax.bar(positions, metatype_counts.to_numpy(), width=0.5, color=colors)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(metatype_counts.index, rotation=90)
+    ax.set_xlim(-0.5, len(metatype_counts) - 0.5)
     
     # Add data labels on top of bars
-    for bar in bars.patches:
+    for bar in bars:
         ax.annotate(
             f"{int(bar.get_height())}",
             (bar.get_x() + bar.get_width() / 2, bar.get_height()),
@@ -389,44 +771,29 @@ def plot_metatype_distribution(df: pd.DataFrame) -> Tuple[Figure, bytes]:
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     
-    plt.tight_layout()
-    
-    # Convert plot to image bytes
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=300)
-    buf.seek(0)
+    fig.tight_layout()
     
-    return fig, buf.getvalue()
+    return fig, figure_to_png(fig, dpi=dpi) if encode else None
 
 
-def plot_metatype_distribution_by_years(df: pd.DataFrame) -> Tuple[Figure, bytes]:
-    """Create a pie chart showing distribution of career events by metatype based on years spent."""
-    # Create a copy of the dataframe to work with
-    df_copy = df.copy()
-    
-    # Calculate duration of each event
-    def calculate_duration(row):
-        start = row["start_date"] if row["start_date"] else row["timeline_date"]
-        end = row["end_date"] if row["end_date"] else row["timeline_date"]
-        
-        try:
-            start = float(start)
-            end = float(end)
-            return max(end - start, 1)  # Minimum duration of 1 year for events with same start/end
-        except (ValueError, TypeError):
-            return 1  # Default to 1 year if calculation fails
-    
-    df_copy["duration"] = df_copy.apply(calculate_duration, axis=1)
+@profiling.profiled()
+def plot_metatype_distribution_by_years(df: pd.DataFrame, dpi: int = 300, encode: bool = True,
+                                        fig: Optional["Figure"] = None) -> Tuple["Figure", Optional[bytes]]:
+    """Create a pie chart showing distribution of career events by metatype based on years spent.
     
-    # Group by metatype and sum durations
-    years_by_metatype = df_copy.groupby("metatype")["duration"].sum()
+    The PNG is only rendered when `encode` is true; otherwise None is returned
+    in its place. An existing `fig` is cleared and reused.
+    """
+    # Sum the years spent in each metatype
+    years_by_metatype = dp.years_by_metatype(df)
     
     # Prepare color mapping
     color_map = create_color_mapping(years_by_metatype.index)
     colors = [color_map[metatype] for metatype in years_by_metatype.index]
     
     # Create pie chart
-    fig, ax = plt.subplots(figsize=(8, 8))
+    fig = new_figure((8, 8), fig)
+    ax = fig.add_subplot()
     
     # Plot pie chart with percentages
     wedges, texts, autotexts = ax.pie(
@@ -451,7 +818,7 @@ def plot_metatype_distribution_by_years(df: pd.DataFrame) -> Tuple[Figure, bytes
     # Add title and annotation
     ax.set_title("Distribution of Career by Years Spent in Each Type", fontsize=14, pad=20)
     total_years = years_by_metatype.sum()
-    plt.annotate(
+    ax.annotate(
         f"Total: {total_years:.1f} years",
         xy=(0, 0),
         xytext=(0, -30),
@@ -460,39 +827,20 @@ def plot_metatype_distribution_by_years(df: pd.DataFrame) -> Tuple[Figure, bytes
         fontsize=12
     )
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Convert plot to image bytes
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=300, bbox_inches='tight')
-    buf.seek(0)
-    
-    return fig, buf.getvalue()
+    return fig, figure_to_png(fig, dpi=dpi, bbox_inches='tight') if encode else None
 
 
+@profiling.profiled()
 def find_longest_role(df: pd.DataFrame) -> Tuple[Dict[str, Any], float]:
     """Find the longest role in the career data."""
-    # Create a copy of the dataframe to work with
-    df_copy = df.copy()
-    
-    # Calculate duration of each event
-    def calculate_duration(row):
-        start = row["start_date"] if row["start_date"] else row["timeline_date"]
-        end = row["end_date"] if row["end_date"] else row["timeline_date"]
-        
-        try:
-            start = float(start)
-            end = float(end)
-            return max(end - start, 1)  # Minimum duration of 1 year for events with same start/end
-        except (ValueError, TypeError):
-            return 1  # Default to 1 year if calculation fails
-    
-    df_copy["duration"] = df_copy.apply(calculate_duration, axis=1)
-    
-    # Find the role with maximum duration
-    if len(df_copy) > 0:
-        longest_idx = df_copy["duration"].idxmax()
-        longest_role = df_copy.loc[longest_idx]
-        return longest_role.to_dict(), longest_role["duration"]
-    
-    return {}, 0
\ No newline at end of file
+    if len(df) == 0:
+        return {}, 0
+    
+    # The first event with the maximum duration wins ties
+    durations = dp.event_durations(df)
+    longest_idx = int(np.argmax(durations))
+    longest_role = df.iloc[longest_idx].to_dict()
+    longest_role["duration"] = float(durations[longest_idx])
+    return longest_role, longest_role["duration"]